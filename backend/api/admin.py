@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Dataset, EquipmentData
+from .models import Dataset, DatasetSummary, EquipmentAnomaly, EquipmentData, IngestJob
 
 
 @admin.register(Dataset)
@@ -7,7 +7,10 @@ class DatasetAdmin(admin.ModelAdmin):
     list_display = ['name', 'uploaded_by', 'uploaded_at', 'total_equipment']
     list_filter = ['uploaded_at', 'uploaded_by']
     search_fields = ['name']
-    readonly_fields = ['uploaded_at', 'total_equipment', 'avg_flowrate', 'avg_pressure', 'avg_temperature']
+    readonly_fields = [
+        'uploaded_at', 'total_equipment', 'avg_flowrate', 'avg_pressure', 'avg_temperature',
+        'content_hash', 'data_source'
+    ]
 
 
 @admin.register(EquipmentData)
@@ -15,3 +18,23 @@ class EquipmentDataAdmin(admin.ModelAdmin):
     list_display = ['equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature', 'dataset']
     list_filter = ['equipment_type', 'dataset']
     search_fields = ['equipment_name', 'equipment_type']
+
+
+@admin.register(EquipmentAnomaly)
+class EquipmentAnomalyAdmin(admin.ModelAdmin):
+    list_display = ['equipment_name', 'equipment_type', 'row', 'flags', 'dataset']
+    list_filter = ['dataset']
+    search_fields = ['equipment_name', 'equipment_type']
+
+
+@admin.register(DatasetSummary)
+class DatasetSummaryAdmin(admin.ModelAdmin):
+    list_display = ['dataset', 'computed_at']
+    readonly_fields = ['computed_at']
+
+
+@admin.register(IngestJob)
+class IngestJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'dataset', 'state', 'rows_processed', 'rows_per_sec', 'created_at', 'finished_at']
+    list_filter = ['state']
+    readonly_fields = ['created_at', 'started_at', 'finished_at', 'rows_processed', 'rows_per_sec']
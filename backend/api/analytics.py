@@ -0,0 +1,299 @@
+"""
+Dataset analytics: counts, averages, extremes and type distribution, and
+per-type statistics.
+
+calculate_analytics works on a DataFrame and calculate_analytics_sql
+inside the database; RunningAnalytics folds chunks (or the partial
+results of parse workers) into the same result with constant memory.
+"""
+import numpy as np
+import pandas as pd
+from django.db.models import Avg, Count, Max, Min
+
+from .parsing import NUMERIC_COLUMNS
+
+
+def get_type_counts(df):
+    """
+    Count rows per equipment type, most common first (ties by name).
+    
+    Args:
+        df: pandas.DataFrame with a Type column (object or categorical)
+        
+    Returns:
+        pandas.Series: Counts indexed by type name; categories without
+        rows (e.g. only seen on rows dropped as invalid) are left out
+    """
+    counts = df['Type'].value_counts()
+    counts = counts[counts > 0]
+    counts.index = counts.index.astype(str)
+    return counts.sort_index().sort_values(ascending=False, kind='stable')
+
+
+def calculate_analytics(df):
+    """
+    Calculate analytics from DataFrame.
+    
+    Args:
+        df: pandas.DataFrame with equipment data
+        
+    Returns:
+        dict: Analytics data
+    """
+    analytics = {
+        'total_equipment': len(df),
+        'avg_flowrate': float(df['Flowrate'].mean()),
+        'avg_pressure': float(df['Pressure'].mean()),
+        'avg_temperature': float(df['Temperature'].mean()),
+        'min_flowrate': float(df['Flowrate'].min()),
+        'max_flowrate': float(df['Flowrate'].max()),
+        'min_pressure': float(df['Pressure'].min()),
+        'max_pressure': float(df['Pressure'].max()),
+        'min_temperature': float(df['Temperature'].min()),
+        'max_temperature': float(df['Temperature'].max()),
+        'equipment_types': get_type_counts(df).to_dict(),
+    }
+    
+    return analytics
+
+
+def calculate_analytics_sql(records):
+    """
+    Calculate analytics inside the database.
+    
+    Runs one aggregate() query for the count, averages and extremes and
+    one GROUP BY equipment_type query for the type counts, so no rows are
+    transferred. Same result as calculate_analytics on the same rows, up
+    to floating-point summation order in the averages.
+    
+    Args:
+        records: EquipmentData queryset
+        
+    Returns:
+        dict: Analytics data, or None if there are no rows
+    """
+    aggregates = {'total_equipment': Count('id')}
+    for col in NUMERIC_COLUMNS:
+        field = col.lower()
+        aggregates[f'avg_{field}'] = Avg(field)
+        aggregates[f'min_{field}'] = Min(field)
+        aggregates[f'max_{field}'] = Max(field)
+    
+    analytics = records.aggregate(**aggregates)
+    if not analytics['total_equipment']:
+        return None
+    
+    type_counts = records.values_list('equipment_type').annotate(
+        count=Count('id')
+    ).order_by('-count', 'equipment_type')
+    analytics['equipment_types'] = dict(type_counts)
+    
+    return analytics
+
+
+def group_type_moments(df):
+    """
+    Per-type count, mean, M2 (sum of squared deviations), min and max of
+    every numeric column, in one groupby().agg() pass.
+    
+    Args:
+        df: pandas.DataFrame of validated rows
+        
+    Returns:
+        pandas.DataFrame: Indexed by type name, with (column, statistic)
+        columns; mergeable with merge_type_moments
+    """
+    stats = df.groupby('Type', observed=True, sort=False)[NUMERIC_COLUMNS].agg(
+        ['count', 'mean', 'var', 'min', 'max']
+    )
+    stats.index = stats.index.astype(str)
+    
+    for col in NUMERIC_COLUMNS:
+        # var is NaN for single-row groups, whose M2 is 0
+        stats[(col, 'var')] = (stats[(col, 'var')] * (stats[(col, 'count')] - 1)).fillna(0.0)
+    return stats.rename(columns={'var': 'm2'}, level=1)
+
+
+def merge_type_moments(left, right):
+    """
+    Combine two group_type_moments results as if computed on both sets of rows.
+    
+    Means and M2 are combined per type with Chan et al.'s pairwise update,
+    vectorized over all types at once.
+    """
+    if left is None:
+        return right
+    
+    index = left.index.union(right.index)
+    left = left.reindex(index)
+    right = right.reindex(index)
+    
+    merged = {}
+    for col in NUMERIC_COLUMNS:
+        left_count = left[(col, 'count')].fillna(0)
+        right_count = right[(col, 'count')].fillna(0)
+        left_mean = left[(col, 'mean')].fillna(0.0)
+        right_mean = right[(col, 'mean')].fillna(0.0)
+        
+        count = left_count + right_count
+        delta = right_mean - left_mean
+        merged[(col, 'count')] = count
+        merged[(col, 'mean')] = left_mean + delta * right_count / count
+        merged[(col, 'm2')] = (
+            left[(col, 'm2')].fillna(0.0) + right[(col, 'm2')].fillna(0.0)
+            + delta * delta * left_count * right_count / count
+        )
+        merged[(col, 'min')] = np.fmin(left[(col, 'min')], right[(col, 'min')])
+        merged[(col, 'max')] = np.fmax(left[(col, 'max')], right[(col, 'max')])
+    
+    return pd.DataFrame(merged, index=index)
+
+
+def format_type_statistics(moments):
+    """
+    Convert group_type_moments output into the by-type API payload.
+    
+    Args:
+        moments: DataFrame from group_type_moments / merge_type_moments,
+            or None if no rows were seen
+        
+    Returns:
+        list: One dict per type, most common first (ties by name), with
+        the row count and mean, std (sample), min and max per parameter
+    """
+    if moments is None or len(moments) == 0:
+        return []
+    
+    counts = moments[(NUMERIC_COLUMNS[0], 'count')].astype('int64')
+    order = counts.sort_index().sort_values(ascending=False, kind='stable').index
+    moments = moments.loc[order]
+    
+    table = {'type': order.tolist(), 'count': counts[order].tolist()}
+    for col in NUMERIC_COLUMNS:
+        count = moments[(col, 'count')]
+        std = np.sqrt(moments[(col, 'm2')] / (count - 1)).where(count > 1, 0.0)
+        table[col.lower()] = [
+            {'mean': mean, 'std': std_value, 'min': min_value, 'max': max_value}
+            for mean, std_value, min_value, max_value in zip(
+                moments[(col, 'mean')].tolist(), std.tolist(),
+                moments[(col, 'min')].tolist(), moments[(col, 'max')].tolist()
+            )
+        ]
+    
+    keys = list(table)
+    return [dict(zip(keys, values)) for values in zip(*table.values())]
+
+
+def calculate_type_statistics(df):
+    """
+    Calculate per-type statistics from a DataFrame.
+    
+    Args:
+        df: pandas.DataFrame with Type and numeric columns
+        
+    Returns:
+        list: Same format as format_type_statistics
+    """
+    return format_type_statistics(group_type_moments(df) if len(df) else None)
+
+
+class RunningAnalytics:
+    """
+    Fold DataFrame chunks into the same result as calculate_analytics.
+    
+    Keeps only counts, sums, extremes and per-type counts and moments, so
+    memory use does not grow with the number of rows seen.
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.sums = {col: 0.0 for col in NUMERIC_COLUMNS}
+        self.mins = {}
+        self.maxs = {}
+        self.type_counts = pd.Series(dtype='int64')
+        self.type_moments = None
+    
+    def update(self, df):
+        """Add a chunk of validated rows."""
+        if len(df) == 0:
+            return
+        
+        self.count += len(df)
+        for col in NUMERIC_COLUMNS:
+            self.sums[col] += float(df[col].sum())
+            chunk_min = float(df[col].min())
+            chunk_max = float(df[col].max())
+            self.mins[col] = min(self.mins.get(col, chunk_min), chunk_min)
+            self.maxs[col] = max(self.maxs.get(col, chunk_max), chunk_max)
+        
+        self.type_counts = self.type_counts.add(
+            get_type_counts(df), fill_value=0
+        ).astype('int64')
+        self.type_moments = merge_type_moments(self.type_moments, group_type_moments(df))
+    
+    def merge(self, other):
+        """Add the rows seen by another accumulator, e.g. one built in a worker process."""
+        if other.count == 0:
+            return
+        
+        self.count += other.count
+        for col in NUMERIC_COLUMNS:
+            self.sums[col] += other.sums[col]
+            self.mins[col] = min(self.mins.get(col, other.mins[col]), other.mins[col])
+            self.maxs[col] = max(self.maxs.get(col, other.maxs[col]), other.maxs[col])
+        
+        self.type_counts = self.type_counts.add(other.type_counts, fill_value=0).astype('int64')
+        self.type_moments = merge_type_moments(self.type_moments, other.type_moments)
+    
+    def result(self):
+        """
+        Return analytics for all rows seen so far.
+        
+        Returns:
+            dict: Analytics data, same keys as calculate_analytics
+        """
+        analytics = {'total_equipment': self.count}
+        for col in NUMERIC_COLUMNS:
+            key = col.lower()
+            analytics[f'avg_{key}'] = self.sums[col] / self.count if self.count else 0.0
+            analytics[f'min_{key}'] = self.mins.get(col, 0.0)
+            analytics[f'max_{key}'] = self.maxs.get(col, 0.0)
+        
+        type_counts = self.type_counts.sort_index().sort_values(ascending=False, kind='stable')
+        analytics['equipment_types'] = {k: int(v) for k, v in type_counts.items()}
+        
+        return analytics
+    
+    def type_statistics(self):
+        """
+        Return per-type statistics for all rows seen so far.
+        
+        Returns:
+            list: Same format as calculate_type_statistics
+        """
+        return format_type_statistics(self.type_moments)
+
+
+def compare_analytics(baseline, other):
+    """
+    Return the differences of one dataset's analytics from a baseline's.
+    
+    Args:
+        baseline: Analytics data of the baseline dataset
+        other: Analytics data of the compared dataset
+        
+    Returns:
+        dict: other minus baseline for every numeric analytics key, and
+        per-type count differences (over the types of both) under
+        equipment_types
+    """
+    deltas = {
+        key: other[key] - baseline[key]
+        for key in baseline if key != 'equipment_types'
+    }
+    types = dict.fromkeys([*baseline['equipment_types'], *other['equipment_types']])
+    deltas['equipment_types'] = {
+        name: other['equipment_types'].get(name, 0) - baseline['equipment_types'].get(name, 0)
+        for name in types
+    }
+    return deltas
@@ -0,0 +1,95 @@
+"""
+Vectorized outlier detection over the numeric parameters of a dataset.
+
+Every row gets a bitmask with one bit per (method, parameter) pair:
+
+- zscore: |x - mean| / std above ANOMALY_ZSCORE_THRESHOLD
+- iqr: outside [Q1 - k * IQR, Q3 + k * IQR] with k = ANOMALY_IQR_MULTIPLIER
+- mad: modified z-score 0.6745 * |x - median| / MAD above
+  ANOMALY_MAD_THRESHOLD, with the median and MAD of the row's equipment
+  type (Iglewicz and Hoaglin)
+
+Only rows with at least one bit set are stored (EquipmentAnomaly).
+"""
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from .parsing import NUMERIC_COLUMNS
+
+
+ANOMALY_METHODS = ['zscore', 'iqr', 'mad']
+
+# Consistency constant relating the MAD to the standard deviation
+MAD_SCALE = 0.6745
+
+
+def anomaly_flag(method, column):
+    """Return the bit for a method (see ANOMALY_METHODS) and column."""
+    return 1 << (ANOMALY_METHODS.index(method) * len(NUMERIC_COLUMNS) + NUMERIC_COLUMNS.index(column))
+
+
+def describe_flags(flags):
+    """
+    Expand a bitmask into the methods that flagged each parameter.
+
+    Args:
+        flags: Bitmask from detect_anomalies
+
+    Returns:
+        dict: {parameter: [method, ...]} for the flagged parameters
+    """
+    described = {}
+    for column in NUMERIC_COLUMNS:
+        methods = [method for method in ANOMALY_METHODS if flags & anomaly_flag(method, column)]
+        if methods:
+            described[column.lower()] = methods
+    return described
+
+
+def _zscore_outliers(values):
+    std = values.std(ddof=1) if len(values) > 1 else 0.0
+    if not std > 0:
+        return np.zeros(len(values), dtype=bool)
+    return np.abs(values - values.mean()) > settings.ANOMALY_ZSCORE_THRESHOLD * std
+
+
+def _iqr_outliers(values):
+    q1, q3 = np.percentile(values, [25, 75])
+    margin = settings.ANOMALY_IQR_MULTIPLIER * (q3 - q1)
+    return (values < q1 - margin) | (values > q3 + margin)
+
+
+def _mad_outliers(values, codes):
+    # Per-type medians, broadcast back to the rows through the type codes
+    medians = pd.Series(values).groupby(codes).median()
+    deviations = np.abs(values - medians.to_numpy()[codes])
+    mads = pd.Series(deviations).groupby(codes).median().to_numpy()[codes]
+
+    # Types with MAD 0 (mostly identical values) flag nothing
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = MAD_SCALE * deviations / mads
+    return (mads > 0) & (scores > settings.ANOMALY_MAD_THRESHOLD)
+
+
+def detect_anomalies(df):
+    """
+    Flag outlying values of every row.
+
+    Args:
+        df: pandas.DataFrame with Type and the NUMERIC_COLUMNS
+
+    Returns:
+        numpy.ndarray: int32 bitmask per row (0 for rows without outliers)
+    """
+    flags = np.zeros(len(df), dtype='int32')
+    if len(df) == 0:
+        return flags
+
+    codes, _ = pd.factorize(df['Type'])
+    for column in NUMERIC_COLUMNS:
+        values = df[column].to_numpy(dtype='float64')
+        flags |= np.where(_zscore_outliers(values), anomaly_flag('zscore', column), 0).astype('int32')
+        flags |= np.where(_iqr_outliers(values), anomaly_flag('iqr', column), 0).astype('int32')
+        flags |= np.where(_mad_outliers(values, codes), anomaly_flag('mad', column), 0).astype('int32')
+    return flags
@@ -0,0 +1,107 @@
+"""
+Columnar bulk insert of equipment rows.
+
+DataFrame columns are fed straight to the database without creating an
+EquipmentData instance per row: PostgreSQL receives the rows through
+COPY FROM STDIN, other backends through batched executemany calls.
+"""
+import io
+import logging
+import time
+from itertools import repeat
+
+from django.conf import settings
+from django.db import connection
+
+from .models import EquipmentData
+
+
+logger = logging.getLogger(__name__)
+
+# (model field, DataFrame column) pairs written for every row
+FIELD_COLUMNS = [
+    ('equipment_name', 'Equipment Name'),
+    ('equipment_type', 'Type'),
+    ('flowrate', 'Flowrate'),
+    ('pressure', 'Pressure'),
+    ('temperature', 'Temperature'),
+]
+
+
+def get_column_arrays(df):
+    """
+    Return the DataFrame columns in FIELD_COLUMNS order as Python lists.
+
+    Args:
+        df: pandas.DataFrame with equipment data
+
+    Returns:
+        list: One list of values per field in FIELD_COLUMNS
+    """
+    arrays = []
+    for field_name, column in FIELD_COLUMNS:
+        series = df[column]
+        if EquipmentData._meta.get_field(field_name).get_internal_type() == 'CharField':
+            series = series.astype(str)
+        arrays.append(series.tolist())
+    return arrays
+
+
+def _copy_rows(cursor, table, columns, dataset_id, df):
+    """Stream the rows to PostgreSQL as CSV through COPY FROM STDIN."""
+    frame = df[[column for _, column in FIELD_COLUMNS]]
+    buffer = io.StringIO()
+    frame.insert(0, 'dataset_id', dataset_id)
+    frame.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+        buffer
+    )
+
+
+def _executemany_rows(cursor, table, columns, dataset_id, df):
+    """Insert the rows with executemany in BULK_INSERT_BATCH_SIZE batches."""
+    placeholders = ', '.join(['%s'] * len(columns))
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+    rows = zip(repeat(dataset_id), *get_column_arrays(df))
+
+    batch_size = settings.BULK_INSERT_BATCH_SIZE
+    while True:
+        batch = [row for _, row in zip(range(batch_size), rows)]
+        if not batch:
+            break
+        cursor.executemany(sql, batch)
+
+
+def insert_equipment_frame(dataset_id, df):
+    """
+    Insert a validated DataFrame as EquipmentData rows.
+
+    Args:
+        dataset_id: ID of the dataset the rows belong to
+        df: pandas.DataFrame with the columns returned by parse_csv_file
+
+    Returns:
+        dict: Insert statistics (rows, seconds, rows_per_sec)
+    """
+    opts = EquipmentData._meta
+    quote = connection.ops.quote_name
+    table = quote(opts.db_table)
+    columns = [quote(opts.get_field('dataset').column)] + [
+        quote(opts.get_field(field_name).column) for field_name, _ in FIELD_COLUMNS
+    ]
+
+    start = time.perf_counter()
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql' and hasattr(cursor.cursor, 'copy_expert'):
+            _copy_rows(cursor, table, columns, dataset_id, df)
+        else:
+            _executemany_rows(cursor, table, columns, dataset_id, df)
+    seconds = time.perf_counter() - start
+
+    return {
+        'rows': len(df),
+        'seconds': seconds,
+        'rows_per_sec': len(df) / seconds if seconds > 0 else 0.0,
+    }
@@ -0,0 +1,152 @@
+"""
+Process-local LRU cache of per-dataset column arrays.
+
+Analytics, chart data, PDF reports and exports of a dataset tend to be
+requested within seconds of each other, and each one used to reload the
+same rows. load_dataset_frame keeps the columns it loads here: numeric
+columns as read-only float64 NumPy arrays, Type as a pandas Categorical
+(integer codes plus the type names) and Equipment Name as loaded.
+
+Entries are keyed by dataset id and tagged with Dataset.version, so rows
+added by an ingest running in another process are never served stale.
+The cache is bounded by COLUMN_CACHE_MAX_BYTES, evicting the least
+recently used datasets first; deleting a dataset (see the post_delete
+receiver in api.models) invalidates its entry.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+
+def to_cached_array(series):
+    """
+    Convert a DataFrame column to the array kept in the cache.
+
+    Args:
+        series: pandas.Series of a dataset column
+
+    Returns:
+        numpy.ndarray (numeric columns, read-only), pandas.Categorical
+        (Type) or the column's pandas array (Equipment Name)
+    """
+    if series.name == 'Type':
+        return pd.Categorical(series)
+    if series.name == 'Equipment Name':
+        return series.array
+    values = np.array(series, dtype='float64')
+    values.flags.writeable = False
+    return values
+
+
+class ColumnCache:
+    """
+    Thread-safe LRU of {column: array} per dataset, bounded in bytes.
+
+    Args:
+        max_bytes: Memory budget; 0 disables the cache. A dataset whose
+            arrays exceed the budget on their own is not cached.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # dataset id -> [version, {column: array}, bytes]
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, dataset_id, version, columns):
+        """
+        Look up columns of a dataset.
+
+        Args:
+            dataset_id: Dataset primary key
+            version: Dataset.version the arrays must belong to
+            columns: List of column names
+
+        Returns:
+            dict: {column: array} for the cached columns (a hit only if
+            every column was found; others are left out)
+        """
+        with self._lock:
+            entry = self._entries.get(dataset_id)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return {}
+
+            self._entries.move_to_end(dataset_id)
+            found = {column: entry[1][column] for column in columns if column in entry[1]}
+            if len(found) == len(columns):
+                self.hits += 1
+            else:
+                self.misses += 1
+            return found
+
+    def put(self, dataset_id, version, arrays):
+        """
+        Store columns of a dataset, evicting older datasets over the budget.
+
+        Args:
+            dataset_id: Dataset primary key
+            version: Dataset.version the arrays were loaded at
+            arrays: {column: array}, e.g. from to_cached_array
+        """
+        if self.max_bytes <= 0:
+            return
+
+        with self._lock:
+            entry = self._entries.pop(dataset_id, None)
+            if entry is not None:
+                self._bytes -= entry[2]
+                if entry[0] != version:
+                    entry = None
+            columns = dict(entry[1]) if entry is not None else {}
+            columns.update(arrays)
+
+            size = sum(array.nbytes for array in columns.values())
+            if size > self.max_bytes:
+                return
+
+            self._entries[dataset_id] = [version, columns, size]
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def invalidate(self, dataset_id):
+        """Drop the cached columns of a dataset, if any."""
+        with self._lock:
+            entry = self._entries.pop(dataset_id, None)
+            if entry is not None:
+                self._bytes -= entry[2]
+
+    def clear(self):
+        """Drop all entries (the counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """
+        Report usage for monitoring.
+
+        Returns:
+            dict: hits, misses, evictions, entries, bytes and max_bytes
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+
+column_cache = ColumnCache(settings.COLUMN_CACHE_MAX_BYTES)
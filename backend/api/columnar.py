@@ -0,0 +1,171 @@
+"""
+Columnar copies of ingested datasets.
+
+Every ingested dataset file gets an Arrow IPC file next to it (data.csv ->
+data.csv.arrow) with the validated rows: Type is dictionary-encoded and
+the numeric columns use settings.COLUMNAR_FLOAT_DTYPE. The file is not
+compressed, so readers memory-map it and work on zero-copy Arrow buffers
+instead of loading EquipmentData rows through the ORM.
+
+Datasets deduplicated by content hash share the stored file and
+therefore its columnar copy.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from django.conf import settings
+
+from .parsing import NUMERIC_COLUMNS
+
+
+COLUMNAR_SUFFIX = '.arrow'
+
+
+def get_schema():
+    """Return the Arrow schema of columnar dataset files."""
+    float_type = pa.from_numpy_dtype(np.dtype(settings.COLUMNAR_FLOAT_DTYPE))
+    return pa.schema(
+        [
+            ('Equipment Name', pa.string()),
+            ('Type', pa.dictionary(pa.int32(), pa.string())),
+        ] + [(column, float_type) for column in NUMERIC_COLUMNS]
+    )
+
+
+def get_columnar_path(file_field):
+    """
+    Return the columnar file path for a stored dataset file.
+
+    Args:
+        file_field: Dataset.file
+
+    Returns:
+        str or None: Path, or None if columnar storage is disabled or the
+        file is not on the local filesystem
+    """
+    if not settings.COLUMNAR_STORAGE or not file_field:
+        return None
+    try:
+        return file_field.path + COLUMNAR_SUFFIX
+    except (NotImplementedError, ValueError):
+        return None
+
+
+def delete_columnar_file(file_field):
+    """Delete the columnar copy of a stored dataset file, if there is one."""
+    try:
+        path = file_field.path + COLUMNAR_SUFFIX
+    except (NotImplementedError, ValueError):
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class ColumnarWriter:
+    """
+    Write validated DataFrame chunks to a columnar file, one record batch each.
+
+    Type values are encoded against one growing dictionary, written as
+    dictionary deltas. Rows go to a temporary file that replaces the
+    target only when the writer closes without an error, so readers never
+    see a partial file.
+
+    Usage:
+        with ColumnarWriter(path) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.temp_path = f'{path}.tmp'
+        self.schema = get_schema()
+        self.float_dtype = np.dtype(settings.COLUMNAR_FLOAT_DTYPE)
+        self.types = []  # dictionary values, in index order
+
+        self.sink = pa.OSFile(self.temp_path, 'wb')
+        self.writer = pa.ipc.new_file(
+            self.sink, self.schema,
+            options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, df):
+        """Append a chunk with the columns returned by parse_csv_file."""
+        if len(df) == 0:
+            return
+
+        types = df['Type'].astype(str)
+        known = set(self.types)
+        self.types.extend(value for value in types.unique() if value not in known)
+        codes = pd.Categorical(types, categories=self.types).codes.astype(np.int32)
+
+        arrays = [
+            pa.array(df['Equipment Name'].astype(str).to_numpy(), type=pa.string()),
+            pa.DictionaryArray.from_arrays(codes, pa.array(self.types, type=pa.string())),
+        ] + [pa.array(df[column].to_numpy(dtype=self.float_dtype)) for column in NUMERIC_COLUMNS]
+
+        self.writer.write_batch(pa.record_batch(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+        self.sink.close()
+        os.replace(self.temp_path, self.path)
+
+    def abort(self):
+        try:
+            self.writer.close()
+        except pa.ArrowException:
+            pass
+        self.sink.close()
+        try:
+            os.remove(self.temp_path)
+        except FileNotFoundError:
+            pass
+
+
+def read_columnar_table(path, columns=None):
+    """
+    Memory-map a columnar dataset file.
+
+    The returned table's buffers point into the mapping, so nothing is
+    copied until the data is used; `table.column(name).chunks[i].to_numpy()`
+    gives zero-copy NumPy views of the numeric columns.
+
+    Args:
+        path: Path returned by get_columnar_path
+        columns: Optional list of columns to select
+
+    Returns:
+        pyarrow.Table: One chunk per record batch written at ingest
+    """
+    table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    if columns is not None:
+        table = table.select(columns)
+    return table
+
+
+def load_columnar_frame(path, columns=None):
+    """
+    Load a columnar dataset file as a DataFrame (Type as a categorical).
+
+    Args:
+        path: Path returned by get_columnar_path
+        columns: Optional list of columns to load
+
+    Returns:
+        pandas.DataFrame: Same column names as parse_csv_file
+    """
+    return read_columnar_table(path, columns).to_pandas()
@@ -0,0 +1,69 @@
+"""
+Conditional GET (ETag / Last-Modified) for read-only API endpoints.
+
+A dataset only changes when its rows are (re-)ingested or its anomalies
+re-detected, and every change bumps Dataset.version and modified_at, so
+most polls of the dataset endpoints can be answered with 304 Not
+Modified. The check runs in initial(), right after authentication and
+content negotiation and before the view method, so a 304 costs one small
+query for the validators instead of fetching and serializing rows.
+"""
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+class NotModified(Exception):
+    """Carries the 304 (or 412) response that answers a conditional request."""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin adding validators to GET and HEAD responses.
+
+    Subclasses implement get_validators(), returning (etag, last_modified)
+    for the current request, where etag is a quoted strong ETag and
+    last_modified a datetime or None, or None to skip conditional handling.
+    Successful responses get ETag, Last-Modified and
+    `Cache-Control: private, no-cache`, so clients revalidate every time.
+    """
+
+    def get_validators(self):
+        return None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        self.validators = None
+        if request.method not in ('GET', 'HEAD'):
+            return
+
+        self.validators = self.get_validators()
+        if self.validators is not None:
+            etag, last_modified = self.validators
+            response = get_conditional_response(
+                request, etag=etag,
+                last_modified=int(last_modified.timestamp()) if last_modified else None
+            )
+            if response is not None:
+                raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        validators = getattr(self, 'validators', None)
+        if validators is not None and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified.timestamp())
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
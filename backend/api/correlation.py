@@ -0,0 +1,176 @@
+"""
+Correlation matrices and least-squares line fits between the numeric
+parameters of a dataset.
+
+Everything is computed with vectorized NumPy over whole columns; the
+per-type fits come from one groupby sum over centred products, so the
+cost does not depend on the number of types beyond the size of the
+result.
+"""
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from .parsing import NUMERIC_COLUMNS
+
+PAIRS = list(combinations(NUMERIC_COLUMNS, 2))
+
+
+def _to_json(values):
+    """Convert an array to nested lists with NaN replaced by None."""
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+def pearson_matrix(values):
+    """
+    Pearson correlation matrix of the columns of a 2-D array.
+
+    Args:
+        values: numpy array of shape (rows, columns)
+
+    Returns:
+        numpy.ndarray: (columns, columns) matrix; NaN where a column is
+        constant or there are fewer than two rows
+    """
+    if len(values) < 2:
+        return np.full((values.shape[1], values.shape[1]), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        matrix = np.clip(np.corrcoef(values, rowvar=False), -1.0, 1.0)
+
+    # Rounding leaves the diagonal a few ULPs away from 1
+    diagonal = np.diag_indices_from(matrix)
+    matrix[diagonal] = np.where(np.isnan(matrix[diagonal]), np.nan, 1.0)
+    return matrix
+
+
+def spearman_matrix(df):
+    """
+    Spearman rank correlation matrix: Pearson on average ranks.
+
+    Args:
+        df: pandas.DataFrame of numeric columns
+
+    Returns:
+        numpy.ndarray: (columns, columns) matrix
+    """
+    return pearson_matrix(df.rank(method='average').to_numpy())
+
+
+def _fits(count, sxx, sxy, syy, mean_x, mean_y):
+    # Arrays of per-group sums of centred products -> slope, intercept, r^2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = np.where((count > 1) & (sxx > 0), sxy / sxx, np.nan)
+        intercept = mean_y - slope * mean_x
+        r_squared = np.where(syy > 0, slope * sxy / syy, np.nan)
+    return slope, intercept, r_squared
+
+
+def fit_lines(df):
+    """
+    Least-squares fits y = slope * x + intercept for every parameter pair.
+
+    Args:
+        df: pandas.DataFrame with the NUMERIC_COLUMNS
+
+    Returns:
+        list: One dict per pair with x, y, slope, intercept, r_squared
+        and count; slope etc. are None when x is constant
+    """
+    means = df[NUMERIC_COLUMNS].mean()
+    centred = df[NUMERIC_COLUMNS] - means
+    results = []
+    for x, y in PAIRS:
+        slope, intercept, r_squared = _fits(
+            len(df),
+            np.dot(centred[x], centred[x]), np.dot(centred[x], centred[y]), np.dot(centred[y], centred[y]),
+            means[x], means[y]
+        )
+        results.append(_fit_dict(x, y, slope, intercept, r_squared, len(df)))
+    return results
+
+
+def fit_lines_by_type(df):
+    """
+    Least-squares fits for every parameter pair, per equipment type.
+
+    Args:
+        df: pandas.DataFrame with Type and the NUMERIC_COLUMNS
+
+    Returns:
+        dict: Lists in the format of fit_lines, keyed by type name
+    """
+    if len(df) == 0:
+        return {}
+
+    # Centre on the global means to limit cancellation in the sums
+    centred = df[NUMERIC_COLUMNS] - df[NUMERIC_COLUMNS].mean()
+    products = {'count': 1.0}
+    for column in NUMERIC_COLUMNS:
+        products[column] = centred[column]
+    for x, y in PAIRS:
+        products[f'{x}*{y}'] = centred[x] * centred[y]
+    for column in NUMERIC_COLUMNS:
+        products[f'{column}*{column}'] = centred[column] * centred[column]
+
+    sums = pd.DataFrame(products, index=df.index).groupby(df['Type'], observed=True, sort=True).sum()
+    sums.index = sums.index.astype(str)
+    count = sums['count'].to_numpy()
+    means = {column: sums[column].to_numpy() / count for column in NUMERIC_COLUMNS}
+
+    def centred_sum(x, y):
+        # Sum of products about the group means
+        return sums[f'{x}*{y}'].to_numpy() - count * means[x] * means[y]
+
+    fits = {}
+    for x, y in PAIRS:
+        slope, intercept, r_squared = _fits(
+            count, centred_sum(x, x), centred_sum(x, y), centred_sum(y, y),
+            means[x] + df[x].mean(), means[y] + df[y].mean()
+        )
+        fits[(x, y)] = (slope, intercept, r_squared)
+
+    return {
+        name: [
+            _fit_dict(x, y, *(values[i] for values in fits[(x, y)]), int(count[i]))
+            for x, y in PAIRS
+        ]
+        for i, name in enumerate(sums.index)
+    }
+
+
+def _fit_dict(x, y, slope, intercept, r_squared, count):
+    def value(number):
+        number = float(number)
+        return None if np.isnan(number) else number
+
+    return {
+        'x': x.lower(),
+        'y': y.lower(),
+        'slope': value(slope),
+        'intercept': value(intercept),
+        'r_squared': value(r_squared),
+        'count': count,
+    }
+
+
+def calculate_correlation(df):
+    """
+    Calculate correlation matrices and line fits for a dataset.
+
+    Args:
+        df: pandas.DataFrame with Type and the NUMERIC_COLUMNS
+
+    Returns:
+        dict: parameters (matrix row/column order), pearson and spearman
+        matrices, fits per pair and fits_by_type
+    """
+    numeric = df[NUMERIC_COLUMNS].astype('float64')
+    return {
+        'parameters': [column.lower() for column in NUMERIC_COLUMNS],
+        'count': len(df),
+        'pearson': _to_json(pearson_matrix(numeric.to_numpy())),
+        'spearman': _to_json(spearman_matrix(numeric)),
+        'fits': fit_lines(numeric),
+        'fits_by_type': fit_lines_by_type(df),
+    }
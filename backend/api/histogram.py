@@ -0,0 +1,76 @@
+"""
+Histograms of a numeric column with selectable bin rules.
+
+- fixed: `bins` equal-width bins spanning the data
+- quantile: `bins` bins holding roughly equal numbers of rows
+- fd: equal-width bins of the Freedman-Diaconis width 2 * IQR / n^(1/3)
+
+Rows are assigned to bins once with searchsorted; per-type counts come
+from a single bincount over (type, bin) pairs.
+"""
+import numpy as np
+import pandas as pd
+
+
+BIN_RULES = ['fixed', 'quantile', 'fd']
+
+
+def bin_edges(values, bins, rule='fixed', max_bins=None):
+    """
+    Compute bin edges for a column.
+
+    Args:
+        values: numpy array of finite values
+        bins: Number of bins (ignored by 'fd')
+        rule: One of BIN_RULES
+        max_bins: Upper limit for 'fd', which can ask for very many bins
+            on long-tailed data; exceeding it falls back to max_bins fixed bins
+
+    Returns:
+        numpy.ndarray: Increasing edges (at least two)
+    """
+    if len(values) == 0:
+        return np.array([0.0, 1.0])
+
+    if rule == 'quantile':
+        # Repeated values can make quantiles coincide; merge those bins
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)))
+        return edges if len(edges) > 1 else np.histogram_bin_edges(values, bins=1)
+
+    if rule == 'fd':
+        # Count the bins before building their edges: one outlier can
+        # make the span billions of widths long
+        q75, q25 = np.percentile(values, [75, 25])
+        width = 2 * (q75 - q25) / len(values) ** (1 / 3)
+        fd_bins = np.ceil(np.ptp(values) / width) if width else 1
+        bins = int(max(fd_bins, 1)) if max_bins is None or fd_bins <= max_bins else max_bins
+
+    return np.histogram_bin_edges(values, bins=bins)
+
+
+def bin_counts(values, edges, groups=None):
+    """
+    Count values per bin, optionally per group.
+
+    Args:
+        values: numpy array of values
+        edges: Bin edges from bin_edges; the last bin includes its right edge
+        groups: Optional array of group labels (e.g. equipment types)
+
+    Returns:
+        tuple: (counts, counts_by_group), where counts is a list with one
+        count per bin and counts_by_group maps each group label to such a
+        list (None without groups)
+    """
+    nbins = len(edges) - 1
+    index = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, nbins - 1)
+    counts = np.bincount(index, minlength=nbins)
+
+    if groups is None:
+        return counts.tolist(), None
+
+    codes, labels = pd.factorize(groups, sort=True)
+    grouped = np.bincount(codes * nbins + index, minlength=len(labels) * nbins).reshape(len(labels), nbins)
+    return counts.tolist(), {
+        str(label): row.tolist() for label, row in zip(labels, grouped)
+    }
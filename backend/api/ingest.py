@@ -0,0 +1,279 @@
+"""
+Saving parsed rows and their analytics, and deduplicating uploads.
+
+save_dataset_to_db inserts rows chunk by chunk into EquipmentData and the
+dataset's columnar file while accumulating analytics and sketches, then
+stores the DatasetSummary and the flagged anomalies. Uploads identical
+to an ingested file share its rows instead (create_duplicate_dataset).
+"""
+import hashlib
+import logging
+from contextlib import nullcontext
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+
+from .models import Dataset, DatasetSummary, EquipmentAnomaly
+from .bulk_insert import insert_equipment_frame
+from .columnar import ColumnarWriter, get_columnar_path
+from .sketches import DatasetSketches
+from .anomalies import detect_anomalies
+from .analytics import RunningAnalytics
+from .loading import load_dataset_frame, load_equipment_names
+from .parsing import NUMERIC_COLUMNS, iter_csv_chunks, parse_csv_file, should_stream_csv
+
+
+logger = logging.getLogger(__name__)
+
+
+def save_dataset_to_db(dataset_obj, data, progress=None):
+    """
+    Save parsed data to database.
+    
+    Rows are inserted column-wise in batches of settings.CSV_CHUNK_SIZE
+    (see bulk_insert.insert_equipment_frame) and analytics are accumulated
+    as each batch is written, together with the statistics sketches (see
+    sketches.DatasetSketches). The same batches are written to the
+    dataset's columnar file (see columnar.ColumnarWriter). Once all rows
+    are in, outliers are flagged (see save_dataset_anomalies).
+    
+    Args:
+        dataset_obj: Dataset model instance
+        data: pandas.DataFrame, or an iterable of DataFrame chunks such as
+            the one returned by iter_csv_chunks
+        progress: Optional callable(rows, seconds) invoked after each chunk.
+            When given, every chunk is committed on its own so that other
+            connections can see the progress; otherwise the whole save is
+            a single transaction.
+    
+    Returns:
+        dict: Insert statistics (rows, seconds, rows_per_sec)
+    """
+    if isinstance(data, pd.DataFrame):
+        chunksize = settings.CSV_CHUNK_SIZE
+        chunks = (data.iloc[start:start + chunksize] for start in range(0, len(data), chunksize))
+    else:
+        chunks = data
+    
+    running = RunningAnalytics()
+    sketches = DatasetSketches()
+    rows = 0
+    seconds = 0.0
+    
+    columnar_path = get_columnar_path(dataset_obj.file)
+    columnar_writer = ColumnarWriter(columnar_path) if columnar_path else nullcontext()
+    
+    with transaction.atomic() if progress is None else nullcontext():
+        with columnar_writer as columnar:
+            for chunk in chunks:
+                # Insert the chunk column-wise, without per-row model instances
+                with transaction.atomic():
+                    stats = insert_equipment_frame(dataset_obj.id, chunk)
+                if columnar is not None:
+                    columnar.write(chunk)
+                rows += stats['rows']
+                seconds += stats['seconds']
+                
+                # Partitions from parallel_parse arrive with their analytics
+                # and sketches already computed
+                partial = chunk.attrs.get('analytics')
+                if partial is not None:
+                    running.merge(partial)
+                    sketches.merge(chunk.attrs['sketches'])
+                else:
+                    running.update(chunk)
+                    sketches.update(chunk)
+                
+                if progress is not None:
+                    progress(rows, seconds)
+        
+        # Calculate analytics
+        analytics = running.result()
+        
+        # Update dataset with analytics
+        dataset_obj.total_equipment = analytics['total_equipment']
+        dataset_obj.avg_flowrate = analytics['avg_flowrate']
+        dataset_obj.avg_pressure = analytics['avg_pressure']
+        dataset_obj.avg_temperature = analytics['avg_temperature']
+        dataset_obj.equipment_types = analytics['equipment_types']
+        dataset_obj.save(update_fields=[
+            'total_equipment', 'avg_flowrate', 'avg_pressure', 'avg_temperature', 'equipment_types'
+        ])
+        
+        # Store the full analytics payload, per-type statistics and sketches
+        DatasetSummary.objects.update_or_create(
+            dataset=dataset_obj,
+            defaults={
+                'analytics': analytics,
+                'type_statistics': running.type_statistics(),
+                'sketches': sketches.to_dict(),
+                # Computed again from the new rows on first request
+                'correlation': {},
+            }
+        )
+        
+        # Detection needs whole columns: read them back once every chunk is
+        # written (memory-mapped from the finished columnar file when there
+        # is one), without the equipment names
+        if settings.ANOMALY_DETECTION and rows:
+            save_dataset_anomalies(dataset_obj, load_dataset_frame(dataset_obj, ['Type'] + NUMERIC_COLUMNS))
+        
+        dataset_obj.bump_version()
+    
+    rows_per_sec = rows / seconds if seconds > 0 else 0.0
+    logger.info(
+        "Inserted %d equipment rows for dataset %s in %.2fs (%.0f rows/sec)",
+        rows, dataset_obj.id, seconds, rows_per_sec
+    )
+    
+    return {'rows': rows, 'seconds': seconds, 'rows_per_sec': rows_per_sec}
+
+
+def save_dataset_anomalies(dataset_obj, df):
+    """
+    Flag the outliers of a dataset and store them as EquipmentAnomaly rows.
+    
+    Replaces any flags stored before. Only the names of flagged rows are
+    read (see load_equipment_names).
+    
+    Args:
+        dataset_obj: Dataset model instance owning the rows
+        df: pandas.DataFrame with Type and the numeric columns of all of
+            the dataset's rows, in stored order
+        
+    Returns:
+        int: Number of flagged rows
+    """
+    flags = detect_anomalies(df)
+    positions = np.flatnonzero(flags)
+    flagged = df.iloc[positions]
+    names = load_equipment_names(dataset_obj, positions)
+    
+    columns = [flagged[column].tolist() for column in ['Type'] + NUMERIC_COLUMNS]
+    anomalies = [
+        EquipmentAnomaly(
+            dataset=dataset_obj, row=row, equipment_name=name, equipment_type=str(equipment_type),
+            flowrate=flowrate, pressure=pressure, temperature=temperature, flags=row_flags
+        )
+        for row, row_flags, name, equipment_type, flowrate, pressure, temperature in zip(
+            positions.tolist(), flags[positions].tolist(), names, *columns
+        )
+    ]
+    
+    with transaction.atomic():
+        EquipmentAnomaly.objects.filter(dataset=dataset_obj).delete()
+        EquipmentAnomaly.objects.bulk_create(anomalies, batch_size=settings.BULK_INSERT_BATCH_SIZE)
+    
+    return len(anomalies)
+
+
+def ingest_dataset_file(dataset_obj, progress=None):
+    """
+    Parse a dataset's stored file and save its rows and analytics.
+    
+    Files above settings.CSV_STREAMING_THRESHOLD are read in chunks.
+    
+    Args:
+        dataset_obj: Dataset model instance whose file is already stored
+        progress: Optional progress callback, see save_dataset_to_db
+        
+    Returns:
+        dict: Insert statistics (rows, seconds, rows_per_sec)
+        
+    Raises:
+        ValueError: If CSV format is invalid
+    """
+    with dataset_obj.file.open('rb') as stored_file:
+        if should_stream_csv(dataset_obj.file):
+            data = iter_csv_chunks(stored_file)
+        else:
+            data = parse_csv_file(stored_file)
+        return save_dataset_to_db(dataset_obj, data, progress=progress)
+
+
+def get_content_hash(file_obj):
+    """
+    Return the SHA-256 hex digest of a file's content.
+    
+    Uploads received through api.upload_handlers already carry the digest
+    computed while they streamed in; other files are read once.
+    
+    Args:
+        file_obj: Django UploadedFile or File object
+        
+    Returns:
+        str: Hex digest
+    """
+    content_hash = getattr(file_obj, 'content_hash', None)
+    if content_hash:
+        return content_hash
+    
+    digest = hashlib.sha256()
+    for block in file_obj.chunks():
+        digest.update(block)
+    file_obj.seek(0)
+    return digest.hexdigest()
+
+
+def find_duplicate_dataset(content_hash):
+    """
+    Find a fully ingested dataset stored from a file with the given hash.
+    
+    Args:
+        content_hash: SHA-256 hex digest of the uploaded file
+        
+    Returns:
+        Dataset or None: The dataset owning the file and rows
+    """
+    if not content_hash:
+        return None
+    
+    # Datasets still waiting for (or in the middle of) ingestion have no rows yet
+    return Dataset.objects.filter(
+        content_hash=content_hash,
+        data_source__isnull=True,
+        total_equipment__gt=0
+    ).order_by('-uploaded_at').first()
+
+
+def create_duplicate_dataset(source, name, user):
+    """
+    Create a dataset that shares the stored file and rows of an earlier
+    upload of the same file, with a copy of its analytics and sketches.
+    
+    Args:
+        source: Dataset returned by find_duplicate_dataset
+        name: Name of the new dataset
+        user: User who uploaded the file
+        
+    Returns:
+        Dataset: The new dataset
+    """
+    with transaction.atomic():
+        # Read before creating: retention in Dataset.save may delete the source
+        summary = DatasetSummary.objects.filter(dataset=source).values(
+            'analytics', 'type_statistics', 'sketches', 'correlation'
+        ).first()
+        
+        dataset = Dataset.objects.create(
+            name=name,
+            file=source.file.name,
+            uploaded_by=user,
+            content_hash=source.content_hash,
+            data_source=source,
+            total_equipment=source.total_equipment,
+            avg_flowrate=source.avg_flowrate,
+            avg_pressure=source.avg_pressure,
+            avg_temperature=source.avg_temperature,
+            equipment_types=source.equipment_types
+        )
+        
+        if summary is not None:
+            DatasetSummary.objects.create(dataset=dataset, **summary)
+    
+    # Retention in Dataset.save may have deleted the source and handed its
+    # rows to the new dataset
+    dataset.refresh_from_db()
+    return dataset
@@ -0,0 +1,239 @@
+"""
+Database-backed ingest job queue.
+
+Jobs live in the IngestJob table, so no external broker is needed. Worker
+processes started by `manage.py run_ingest_workers` claim queued jobs and
+run the same parse/save pipeline as synchronous uploads.
+
+While a job runs, a JobHeartbeat thread renews its heartbeat_at, so only
+jobs of workers that died (or were stopped) are requeued. Workers stopped
+with SIGTERM put their current job back in the queue themselves.
+"""
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import IngestJob
+from .ingest import ingest_dataset_file
+
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerShutdown(BaseException):
+    """
+    Raised in a worker by SIGTERM (see handle_sigterm). A BaseException, so
+    that run_job does not record the interrupted job as failed.
+    """
+
+
+def handle_sigterm(signum, frame):
+    """SIGTERM handler of worker processes: stop after the current statement."""
+    # A second SIGTERM (e.g. to the whole process group) must not interrupt the requeue
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    raise WorkerShutdown()
+
+
+class JobHeartbeat(threading.Thread):
+    """
+    Renew a running job's heartbeat_at every `interval` seconds until stopped.
+
+    Runs beside the ingest, so long phases (a large chunk, anomaly
+    detection) do not let the lease expire.
+
+    Args:
+        job_id: Primary key of the running IngestJob
+        interval: Seconds between renewals (settings.INGEST_HEARTBEAT_INTERVAL)
+    """
+
+    def __init__(self, job_id, interval=None):
+        super().__init__(name=f'ingest-heartbeat-{job_id}', daemon=True)
+        self.job_id = job_id
+        self.interval = interval or settings.INGEST_HEARTBEAT_INTERVAL
+        self._stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self._stopped.wait(self.interval):
+                try:
+                    IngestJob.objects.filter(pk=self.job_id, state=IngestJob.STATE_RUNNING).update(
+                        heartbeat_at=timezone.now()
+                    )
+                except Exception as e:
+                    logger.warning("Heartbeat of ingest job %s failed: %s", self.job_id, e)
+        finally:
+            # This thread's own connection
+            connection.close()
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+def enqueue_ingest(dataset, user):
+    """
+    Queue a background ingest of a stored dataset file.
+
+    Args:
+        dataset: Dataset model instance whose file is already stored
+        user: User who uploaded the file
+
+    Returns:
+        IngestJob: The queued job
+    """
+    return IngestJob.objects.create(dataset=dataset, created_by=user)
+
+
+def claim_next_job(worker_name):
+    """
+    Atomically move the oldest queued job to the running state.
+
+    Args:
+        worker_name: Identifier recorded on the claimed job
+
+    Returns:
+        IngestJob or None: The claimed job, or None if the queue is empty
+    """
+    with transaction.atomic():
+        queued = IngestJob.objects.filter(state=IngestJob.STATE_QUEUED).order_by('created_at')
+        if connection.features.has_select_for_update_skip_locked:
+            queued = queued.select_for_update(skip_locked=True)
+
+        job = queued.first()
+        if job is None:
+            return None
+
+        # The state filter makes the claim safe on backends without row locks
+        now = timezone.now()
+        claimed = IngestJob.objects.filter(pk=job.pk, state=IngestJob.STATE_QUEUED).update(
+            state=IngestJob.STATE_RUNNING,
+            worker=worker_name,
+            started_at=now,
+            heartbeat_at=now,
+        )
+        if not claimed:
+            return None
+
+    job.refresh_from_db()
+    return job
+
+
+def run_job(job):
+    """
+    Execute a claimed ingest job and record its outcome.
+
+    On failure the dataset (and with it its stored file) is deleted,
+    mirroring a rejected synchronous upload.
+
+    Args:
+        job: IngestJob in the running state
+    """
+    dataset = job.dataset
+    if dataset is None:
+        _finish(job, IngestJob.STATE_FAILED, error='Dataset was deleted before ingest')
+        return
+
+    start = time.perf_counter()
+
+    def progress(rows, seconds):
+        elapsed = time.perf_counter() - start
+        IngestJob.objects.filter(pk=job.pk).update(
+            rows_processed=rows,
+            rows_per_sec=rows / elapsed if elapsed > 0 else 0.0,
+        )
+
+    heartbeat = JobHeartbeat(job.pk)
+    heartbeat.start()
+    try:
+        # Drop rows left behind by an interrupted earlier attempt
+        dataset.equipment_records.all().delete()
+        stats = ingest_dataset_file(dataset, progress=progress)
+    except Exception as e:
+        logger.warning("Ingest job %s failed: %s", job.id, e)
+        dataset.delete()
+        _finish(job, IngestJob.STATE_FAILED, error=str(e))
+        return
+    finally:
+        heartbeat.stop()
+
+    elapsed = time.perf_counter() - start
+    _finish(
+        job, IngestJob.STATE_SUCCEEDED,
+        rows_processed=stats['rows'],
+        rows_per_sec=stats['rows'] / elapsed if elapsed > 0 else 0.0,
+    )
+
+
+def _finish(job, state, **fields):
+    IngestJob.objects.filter(pk=job.pk).update(
+        state=state, finished_at=timezone.now(), **fields
+    )
+
+
+def requeue_running_jobs():
+    """
+    Put jobs abandoned by a stopped or crashed worker back in the queue.
+
+    A running job counts as abandoned once its heartbeat is older than
+    settings.INGEST_JOB_LEASE; jobs that live workers (of this or another
+    pool) are still renewing are left alone.
+
+    Returns:
+        int: Number of jobs requeued
+    """
+    expired = timezone.now() - timedelta(seconds=settings.INGEST_JOB_LEASE)
+    return _requeue(IngestJob.objects.filter(
+        Q(heartbeat_at__lt=expired) | Q(heartbeat_at__isnull=True),
+        state=IngestJob.STATE_RUNNING,
+    ))
+
+
+def _requeue(jobs):
+    return jobs.update(state=IngestJob.STATE_QUEUED, worker='', started_at=None, heartbeat_at=None)
+
+
+def worker_loop(poll_interval, burst=False):
+    """
+    Claim and run jobs until stopped.
+
+    A WorkerShutdown (see handle_sigterm) ends the loop; the job it
+    interrupted is put back in the queue for another worker.
+
+    Args:
+        poll_interval: Seconds to sleep when the queue is empty
+        burst: Return as soon as the queue is empty instead of polling
+    """
+    worker_name = f'{socket.gethostname()}:{os.getpid()}'
+    logger.info("Ingest worker %s started", worker_name)
+
+    job = None
+    try:
+        while True:
+            # Like a request, each iteration gets a usable database connection
+            close_old_connections()
+
+            job = claim_next_job(worker_name)
+            if job is None:
+                if burst:
+                    return
+                # Pick up jobs of workers that died since
+                requeue_running_jobs()
+                time.sleep(poll_interval)
+                continue
+
+            logger.info("Worker %s running ingest job %s", worker_name, job.id)
+            run_job(job)
+            job = None
+    except WorkerShutdown:
+        logger.info("Ingest worker %s stopping", worker_name)
+        if job is not None:
+            _requeue(IngestJob.objects.filter(pk=job.pk, state=IngestJob.STATE_RUNNING))
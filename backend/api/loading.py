@@ -0,0 +1,96 @@
+"""
+Reading a dataset's stored rows back.
+
+Columns come from the process-local column cache, else from the
+memory-mapped columnar file written at ingest, else (datasets ingested
+before columnar storage) from EquipmentData in insertion order.
+"""
+import os
+
+import pandas as pd
+import pyarrow as pa
+from django.conf import settings
+
+from .columnar import get_columnar_path, load_columnar_frame, read_columnar_table
+from .column_cache import column_cache, to_cached_array
+from .parsing import NUMERIC_COLUMNS, REQUIRED_COLUMNS
+
+
+def load_dataset_frame(dataset, columns=None):
+    """
+    Load a dataset's rows as a DataFrame with the CSV column names.
+    
+    Columns are served from the process-local column cache when possible.
+    Otherwise they are read from the memory-mapped columnar file written
+    at ingest; datasets ingested before columnar storage existed fall back
+    to EquipmentData. Type is returned as a categorical.
+    
+    Args:
+        dataset: Dataset model instance
+        columns: Optional list of columns to load (default: all)
+        
+    Returns:
+        pandas.DataFrame: Dataset rows (empty if there are none)
+    """
+    columns = columns or REQUIRED_COLUMNS
+    arrays = column_cache.get(dataset.id, dataset.version, columns)
+    missing = [column for column in columns if column not in arrays]
+    if missing:
+        df = _read_dataset_columns(dataset, missing)
+        loaded = {column: to_cached_array(df[column]) for column in missing}
+        column_cache.put(dataset.id, dataset.version, loaded)
+        arrays.update(loaded)
+    return pd.DataFrame({column: arrays[column] for column in columns}, columns=columns)
+
+
+def _read_dataset_columns(dataset, columns):
+    columnar_path = get_columnar_path(dataset.file)
+    if columnar_path and os.path.exists(columnar_path):
+        return load_columnar_frame(columnar_path, columns)
+    
+    field_names = {
+        'Equipment Name': 'equipment_name',
+        'Type': 'equipment_type',
+        **{column: column.lower() for column in NUMERIC_COLUMNS}
+    }
+    # Insertion order, the same order as the columnar file
+    data = list(dataset.get_equipment_records().order_by('id').values_list(
+        *[field_names[column] for column in columns]
+    ))
+    return pd.DataFrame(data, columns=columns)
+
+
+def load_equipment_names(dataset, positions):
+    """
+    Read the equipment names of rows at the given positions.
+    
+    Takes them from the memory-mapped columnar file, or else streams the
+    names from EquipmentData in stored order, so only the requested names
+    are held in memory.
+    
+    Args:
+        dataset: Dataset model instance
+        positions: Increasing 0-based row positions (numpy array)
+        
+    Returns:
+        list: Names in the order of positions
+    """
+    if len(positions) == 0:
+        return []
+    
+    columnar_path = get_columnar_path(dataset.file)
+    if columnar_path and os.path.exists(columnar_path):
+        names = read_columnar_table(columnar_path, ['Equipment Name']).column(0)
+        return names.take(pa.array(positions)).to_pylist()
+    
+    wanted = iter(positions.tolist())
+    target = next(wanted)
+    names = []
+    records = dataset.get_equipment_records().order_by('id').values_list('equipment_name', flat=True)
+    for position, name in enumerate(records.iterator(chunk_size=settings.BULK_INSERT_BATCH_SIZE)):
+        if position == target:
+            names.append(name)
+            target = next(wanted, None)
+            if target is None:
+                break
+    return names
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from api.models import Dataset
+from api.summaries import store_dataset_summary
+
+
+class Command(BaseCommand):
+    help = 'Store the analytics summary, per-type statistics and sketches of datasets ingested before they existed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help='Recompute existing summaries too'
+        )
+
+    def handle(self, *args, **options):
+        datasets = Dataset.objects.filter(total_equipment__gt=0)
+        if not options['rebuild']:
+            datasets = datasets.filter(
+                Q(summary__isnull=True) | Q(summary__type_statistics=[]) | Q(summary__sketches={})
+            )
+
+        count = 0
+        for dataset in datasets.iterator():
+            if store_dataset_summary(dataset) is not None:
+                count += 1
+
+        self.stdout.write(f'Stored {count} dataset summar{"y" if count == 1 else "ies"}')
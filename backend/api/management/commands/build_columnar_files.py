@@ -0,0 +1,42 @@
+import os
+from itertools import islice
+
+import pandas as pd
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.columnar import ColumnarWriter, get_columnar_path
+from api.models import Dataset
+from api.parsing import REQUIRED_COLUMNS
+
+
+class Command(BaseCommand):
+    help = 'Write columnar (Arrow) files for datasets ingested before columnar storage existed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help='Rewrite existing columnar files too (e.g. after changing COLUMNAR_FLOAT_DTYPE)'
+        )
+
+    def handle(self, *args, **options):
+        # Duplicate uploads share their source's file, so only owners are written
+        for dataset in Dataset.objects.filter(data_source__isnull=True, total_equipment__gt=0):
+            path = get_columnar_path(dataset.file)
+            if path is None:
+                continue
+            if os.path.exists(path) and not options['rebuild']:
+                continue
+
+            rows = dataset.equipment_records.order_by('id').values_list(
+                'equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature'
+            ).iterator(chunk_size=settings.CSV_CHUNK_SIZE)
+
+            with ColumnarWriter(path) as writer:
+                while True:
+                    chunk = list(islice(rows, settings.CSV_CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    writer.write(pd.DataFrame(chunk, columns=REQUIRED_COLUMNS))
+
+            self.stdout.write(f'Wrote {path}')
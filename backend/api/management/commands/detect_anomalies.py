@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from api.models import Dataset
+from api.ingest import save_dataset_anomalies
+from api.loading import load_dataset_frame
+from api.parsing import NUMERIC_COLUMNS
+
+
+class Command(BaseCommand):
+    help = 'Flag outliers of datasets ingested before anomaly detection existed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help='Flag datasets that already have anomalies too (e.g. after changing the thresholds)'
+        )
+
+    def handle(self, *args, **options):
+        # Duplicate uploads share their source's rows and flags
+        datasets = Dataset.objects.filter(data_source__isnull=True, total_equipment__gt=0)
+        if not options['rebuild']:
+            datasets = datasets.filter(anomalies__isnull=True)
+
+        for dataset in datasets.distinct().iterator():
+            count = save_dataset_anomalies(dataset, load_dataset_frame(dataset, ['Type'] + NUMERIC_COLUMNS))
+            dataset.bump_version()
+            self.stdout.write(f'Flagged {count} rows of {dataset}')
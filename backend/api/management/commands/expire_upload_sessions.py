@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.resumable import delete_stale_sessions
+
+
+class Command(BaseCommand):
+    help = 'Delete unfinished resumable uploads older than UPLOAD_SESSION_EXPIRY and their spool files'
+
+    def handle(self, *args, **options):
+        count = delete_stale_sessions()
+        self.stdout.write(f'Deleted {count} stale upload session(s)')
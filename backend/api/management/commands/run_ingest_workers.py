@@ -0,0 +1,79 @@
+import multiprocessing
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+def _worker_main(poll_interval, burst, parse_workers):
+    """Process entry point; sets Django up again when started with spawn."""
+    import django
+    django.setup()
+    settings.CSV_PARSE_WORKERS = parse_workers
+
+    from api.jobs import handle_sigterm, worker_loop
+    # The parent stops the workers with SIGTERM, also on Ctrl+C
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    worker_loop(poll_interval, burst=burst)
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+class Command(BaseCommand):
+    help = 'Run a pool of local worker processes that execute queued ingest jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=settings.INGEST_WORKERS,
+            help='Number of worker processes (default: INGEST_WORKERS setting)'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=settings.INGEST_POLL_INTERVAL,
+            help='Seconds between queue polls when idle'
+        )
+        parser.add_argument(
+            '--parse-workers', type=int, default=settings.CSV_PARSE_WORKERS,
+            help='Processes each worker parses a large CSV file with (default: CSV_PARSE_WORKERS setting)'
+        )
+        parser.add_argument(
+            '--burst', action='store_true',
+            help='Exit once the queue is empty instead of polling forever'
+        )
+
+    def handle(self, *args, **options):
+        from api.jobs import requeue_running_jobs
+
+        requeued = requeue_running_jobs()
+        if requeued:
+            self.stdout.write(f'Requeued {requeued} abandoned job(s)')
+
+        # Children must open their own database connections
+        connections.close_all()
+
+        processes = [
+            multiprocessing.Process(
+                target=_worker_main,
+                args=(options['poll_interval'], options['burst'], options['parse_workers']),
+                name=f'ingest-worker-{i}',
+            )
+            for i in range(options['workers'])
+        ]
+        for process in processes:
+            process.start()
+        self.stdout.write(f"Started {len(processes)} ingest worker(s)")
+
+        # SIGTERM (e.g. from the process manager) stops the pool like Ctrl+C;
+        # terminated workers requeue the job they were running
+        signal.signal(signal.SIGTERM, _interrupt)
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:01
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_upload_sessions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dataset',
+            name='file',
+            field=models.FileField(upload_to='datasets/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['csv', 'gz', 'bz2', 'xz', 'zst'])]),
+        ),
+    ]
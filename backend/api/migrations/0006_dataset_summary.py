@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_dataset_deduplication'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatasetSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('analytics', models.JSONField(default=dict)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('dataset', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='summary', to='api.dataset')),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_dataset_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasetsummary',
+            name='sketches',
+            field=models.JSONField(default=dict),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_dataset_sketches'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasetsummary',
+            name='type_statistics',
+            field=models.JSONField(default=list),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_dataset_type_statistics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasetsummary',
+            name='correlation',
+            field=models.JSONField(default=dict),
+        ),
+    ]
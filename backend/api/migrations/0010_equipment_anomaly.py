@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_dataset_correlation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EquipmentAnomaly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('row', models.PositiveIntegerField()),
+                ('equipment_name', models.CharField(max_length=255)),
+                ('equipment_type', models.CharField(max_length=100)),
+                ('flowrate', models.FloatField()),
+                ('pressure', models.FloatField()),
+                ('temperature', models.FloatField()),
+                ('flags', models.PositiveIntegerField()),
+                ('dataset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='anomalies', to='api.dataset')),
+            ],
+            options={
+                'ordering': ['row'],
+                'indexes': [models.Index(fields=['dataset', 'row'], name='api_equipme_dataset_594f82_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_equipment_anomaly'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_dataset_version'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='equipmentdata',
+            options={'ordering': ['equipment_name', 'id']},
+        ),
+        migrations.AddIndex(
+            model_name='equipmentdata',
+            index=models.Index(fields=['dataset', 'equipment_name', 'id'], name='api_equipme_dataset_a9563c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentdata',
+            index=models.Index(fields=['dataset', 'equipment_type', 'equipment_name', 'id'], name='api_equipme_dataset_b8fe1c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentdata',
+            index=models.Index(fields=['dataset', 'flowrate', 'id'], name='api_equipme_dataset_700013_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentdata',
+            index=models.Index(fields=['dataset', 'pressure', 'id'], name='api_equipme_dataset_416aa6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentdata',
+            index=models.Index(fields=['dataset', 'temperature', 'id'], name='api_equipme_dataset_ab3bf2_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:13
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def copy_uploaded_at(apps, schema_editor):
+    Dataset = apps.get_model('api', 'Dataset')
+    Dataset.objects.update(modified_at=models.F('uploaded_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_ingestjob_heartbeat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='modified_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(copy_uploaded_at, migrations.RunPython.noop),
+    ]
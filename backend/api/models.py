@@ -1,17 +1,33 @@
-from django.db import models
+import uuid
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
 from django.contrib.auth.models import User
 from django.core.validators import FileExtensionValidator
+from django.utils import timezone
+
+from .columnar import delete_columnar_file
+from .column_cache import column_cache
+from .shared_cache import invalidate_dataset_cache
 
 
 class Dataset(models.Model):
     """
     Model to store uploaded CSV datasets.
     Only the last 5 datasets are kept in the database.
+    Compressed uploads (.csv.gz, .csv.bz2, .csv.xz, .csv.zst) are stored as uploaded.
+    
+    Re-uploads of an identical file (same content_hash) share the stored
+    file and equipment rows of the first upload, referenced by data_source.
+    Deleting a dataset, also in bulk or by cascade, hands shared rows on
+    (see hand_off_shared_rows and delete_unshared_files below).
     """
     name = models.CharField(max_length=255)
     file = models.FileField(
         upload_to='datasets/',
-        validators=[FileExtensionValidator(allowed_extensions=['csv'])]
+        validators=[FileExtensionValidator(allowed_extensions=['csv', 'gz', 'bz2', 'xz', 'zst'])]
     )
     uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE)
     uploaded_at = models.DateTimeField(auto_now_add=True)
@@ -23,12 +39,39 @@ class Dataset(models.Model):
     avg_temperature = models.FloatField(default=0.0)
     equipment_types = models.JSONField(default=dict)  # {type: count}
     
+    # Deduplication
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)  # SHA-256 of the stored file
+    data_source = models.ForeignKey(
+        'self', on_delete=models.SET_NULL, null=True, blank=True, related_name='shared_copies'
+    )  # Dataset owning the shared file and rows, if this is a duplicate upload
+    
+    # Changes whenever the dataset's API representations may change (see
+    # bump_version); part of the ETag of every dataset endpoint
+    version = models.PositiveIntegerField(default=1)
+    modified_at = models.DateTimeField(default=timezone.now)  # time of the last version bump; Last-Modified
+    
     class Meta:
         ordering = ['-uploaded_at']
         
     def __str__(self):
         return f"{self.name} - {self.uploaded_at.strftime('%Y-%m-%d %H:%M')}"
     
+    def get_equipment_records(self):
+        """Return the equipment rows of this dataset, which may be shared with its data_source"""
+        return EquipmentData.objects.filter(dataset_id=self.data_source_id or self.id)
+    
+    def get_anomalies(self):
+        """Return the outlier flags of this dataset's rows (shared like the rows)"""
+        return EquipmentAnomaly.objects.filter(dataset_id=self.data_source_id or self.id)
+    
+    def bump_version(self):
+        """Invalidate the ETags of this dataset and of the copies sharing its rows"""
+        Dataset.objects.filter(
+            models.Q(pk=self.pk) | models.Q(data_source=self.pk)
+        ).update(version=models.F('version') + 1, modified_at=timezone.now())
+        column_cache.invalidate(self.pk)
+        invalidate_dataset_cache(self.pk)
+    
     def save(self, *args, **kwargs):
         """Override save to maintain only last 5 datasets"""
         super().save(*args, **kwargs)
@@ -36,13 +79,15 @@ class Dataset(models.Model):
         # Keep only the last 5 datasets
         datasets = Dataset.objects.all()
         if datasets.count() > 5:
-            # Delete oldest datasets
+            # Delete oldest datasets, except those still waiting for or
+            # being ingested, which their jobs would fail on
+            ingesting = set(IngestJob.objects.filter(
+                state__in=IngestJob.ACTIVE_STATES, dataset__isnull=False
+            ).values_list('dataset_id', flat=True))
             datasets_to_delete = datasets[5:]
             for dataset in datasets_to_delete:
-                # Delete associated file
-                if dataset.file:
-                    dataset.file.delete(save=False)
-                dataset.delete()
+                if dataset.pk not in ingesting:
+                    dataset.delete()
 
 
 class EquipmentData(models.Model):
@@ -57,7 +102,189 @@ class EquipmentData(models.Model):
     temperature = models.FloatField()
     
     class Meta:
-        ordering = ['equipment_name']
+        ordering = ['equipment_name', 'id']
+        # Serve the equipment endpoint's filters and sort orders from index
+        # range scans; id breaks ties so that every order is total
+        indexes = [
+            models.Index(fields=['dataset', 'equipment_name', 'id']),
+            models.Index(fields=['dataset', 'equipment_type', 'equipment_name', 'id']),
+            models.Index(fields=['dataset', 'flowrate', 'id']),
+            models.Index(fields=['dataset', 'pressure', 'id']),
+            models.Index(fields=['dataset', 'temperature', 'id']),
+        ]
         
     def __str__(self):
         return f"{self.equipment_name} ({self.equipment_type})"
+
+
+class EquipmentAnomaly(models.Model):
+    """
+    An equipment row with at least one outlying parameter, flagged at ingest.
+    Only flagged rows are stored, with a copy of their values, so a
+    dataset's anomalies are read with one (dataset, row) index range scan.
+    """
+    dataset = models.ForeignKey(Dataset, on_delete=models.CASCADE, related_name='anomalies')
+    row = models.PositiveIntegerField()  # 0-based position among the dataset's stored rows
+    equipment_name = models.CharField(max_length=255)
+    equipment_type = models.CharField(max_length=100)
+    flowrate = models.FloatField()
+    pressure = models.FloatField()
+    temperature = models.FloatField()
+    flags = models.PositiveIntegerField()  # bitmask, see anomalies.anomaly_flag
+    
+    class Meta:
+        ordering = ['row']
+        indexes = [models.Index(fields=['dataset', 'row'])]
+    
+    def __str__(self):
+        return f"{self.equipment_name} (row {self.row})"
+
+
+class DatasetSummary(models.Model):
+    """
+    Complete analytics of a dataset, computed once at ingest.
+    Equipment rows never change after upload, so the analytics endpoint
+    serves this row instead of scanning EquipmentData.
+    """
+    dataset = models.OneToOneField(Dataset, on_delete=models.CASCADE, related_name='summary')
+    analytics = models.JSONField(default=dict)  # same keys as calculate_analytics
+    type_statistics = models.JSONField(default=list)  # same format as calculate_type_statistics
+    sketches = models.JSONField(default=dict)  # DatasetSketches.to_dict()
+    correlation = models.JSONField(default=dict)  # calculate_correlation, filled on first request
+    computed_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Summary of {self.dataset}"
+
+
+class IngestJob(models.Model):
+    """
+    Background parse/insert of an uploaded dataset file.
+    Queued by the upload endpoint and executed by `manage.py run_ingest_workers`.
+    """
+    STATE_QUEUED = 'queued'
+    STATE_RUNNING = 'running'
+    STATE_SUCCEEDED = 'succeeded'
+    STATE_FAILED = 'failed'
+    STATE_CHOICES = [
+        (STATE_QUEUED, 'Queued'),
+        (STATE_RUNNING, 'Running'),
+        (STATE_SUCCEEDED, 'Succeeded'),
+        (STATE_FAILED, 'Failed'),
+    ]
+    ACTIVE_STATES = [STATE_QUEUED, STATE_RUNNING]
+    
+    dataset = models.ForeignKey(Dataset, on_delete=models.SET_NULL, null=True, related_name='ingest_jobs')
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE)
+    state = models.CharField(max_length=20, choices=STATE_CHOICES, default=STATE_QUEUED, db_index=True)
+    worker = models.CharField(max_length=100, blank=True)
+    error = models.TextField(blank=True)
+    
+    # Progress (updated after every inserted chunk)
+    rows_processed = models.IntegerField(default=0)
+    rows_per_sec = models.FloatField(default=0.0)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Renewed by the running worker; a running job whose heartbeat is older
+    # than INGEST_JOB_LEASE seconds is considered abandoned
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        
+    def __str__(self):
+        return f"Ingest job {self.id} ({self.state})"
+
+
+class UploadSession(models.Model):
+    """
+    Resumable upload of a CSV file sent as byte-range chunks.
+    Chunks are written into a spool file under settings.UPLOAD_SPOOL_DIR
+    until the session is finalized into a Dataset.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=255)
+    filename = models.CharField(max_length=255)
+    total_size = models.BigIntegerField()
+    checksum = models.CharField(max_length=64, blank=True)  # SHA-256 hex digest
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    dataset = models.ForeignKey(Dataset, on_delete=models.SET_NULL, null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        
+    def __str__(self):
+        return f"Upload {self.id} ({self.filename})"
+    
+    @property
+    def spool_path(self):
+        return settings.UPLOAD_SPOOL_DIR / f'{self.id}.part'
+    
+    def received_ranges(self):
+        """Return the received byte ranges as sorted, merged [start, end) pairs"""
+        ranges = []
+        for start, end in self.chunks.order_by('start').values_list('start', 'end'):
+            if ranges and start <= ranges[-1][1]:
+                ranges[-1][1] = max(ranges[-1][1], end)
+            else:
+                ranges.append([start, end])
+        return ranges
+    
+    def received_offset(self):
+        """Return the length of the contiguous prefix received so far"""
+        ranges = self.received_ranges()
+        if ranges and ranges[0][0] == 0:
+            return ranges[0][1]
+        return 0
+
+
+class UploadChunk(models.Model):
+    """
+    A byte range [start, end) written to an UploadSession's spool file.
+    One row per PUT, so parallel chunk uploads never update the same row.
+    """
+    session = models.ForeignKey(UploadSession, on_delete=models.CASCADE, related_name='chunks')
+    start = models.BigIntegerField()
+    end = models.BigIntegerField()
+
+
+@receiver(pre_delete, sender=Dataset)
+def hand_off_shared_rows(sender, instance, **kwargs):
+    """
+    Give a deleted dataset's rows to the newest duplicate upload using them.
+
+    A signal rather than Dataset.delete, so that queryset deletes (admin
+    bulk actions) and cascades from a deleted user do it too. The rows are
+    moved before the cascade deletes them; when several datasets are
+    deleted together, they are signalled in pk order, so a copy that is
+    deleted as well passes the rows on in turn.
+    """
+    heir = instance.shared_copies.order_by('-uploaded_at', '-id').first()
+    if heir is not None:
+        instance.equipment_records.update(dataset=heir)
+        instance.anomalies.update(dataset=heir)
+        instance.shared_copies.exclude(pk=heir.pk).update(data_source=heir)
+        Dataset.objects.filter(pk=heir.pk).update(data_source=None)
+
+
+@receiver(post_delete, sender=Dataset)
+def delete_unshared_files(sender, instance, **kwargs):
+    """
+    Drop a deleted dataset's cached data, and its stored file (with the
+    columnar copy) once no dataset refers to the file any more.
+    """
+    column_cache.invalidate(instance.pk)
+    invalidate_dataset_cache(instance.pk)
+    
+    if instance.file and not Dataset.objects.filter(file=instance.file.name).exists():
+        file = instance.file
+        
+        def delete_files():
+            delete_columnar_file(file)
+            file.delete(save=False)
+        
+        transaction.on_commit(delete_files)
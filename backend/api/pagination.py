@@ -0,0 +1,116 @@
+"""
+Keyset (cursor) pagination for equipment records.
+
+A page is fetched with `WHERE (sort, id) > (last sort value, last id)
+ORDER BY sort, id LIMIT n`, which the (dataset, <sort field>, id) indexes
+answer with a range scan, so deep pages cost the same as the first one
+(OFFSET would scan and discard every earlier row). The cursor is the
+opaque, URL-safe encoding of the sort field and the last row's key.
+"""
+import base64
+import binascii
+import json
+
+from django.db import models
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginate a queryset ordered by (field, id) or (-field, -id).
+
+    The page size is ?page_size= (clamped to 1..max_page_size), PAGE_SIZE
+    by default. Responses hold `next` (None on the last page) and `results`;
+    there is no total count, which would need a full scan.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return api_settings.PAGE_SIZE
+        return min(max(page_size, 1), self.max_page_size)
+
+    def encode_cursor(self, ordering, value, pk):
+        payload = json.dumps([ordering, value, pk], separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+    def decode_cursor(self, cursor, ordering, model):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            cursor_ordering, value, pk = json.loads(base64.urlsafe_b64decode(padded))
+        except (binascii.Error, TypeError, ValueError):
+            raise NotFound('Invalid cursor')
+        if cursor_ordering != ordering:
+            raise NotFound('Cursor does not match the ordering')
+        # Values of the wrong type would otherwise reach the database
+        field = model._meta.get_field(ordering.lstrip('-'))
+        if isinstance(field, (models.FloatField, models.IntegerField)):
+            value_types = (int, float)
+        else:
+            value_types = str
+        if (
+            not isinstance(value, value_types) or isinstance(value, bool)
+            or not isinstance(pk, int) or isinstance(pk, bool)
+        ):
+            raise NotFound('Invalid cursor')
+        return value, pk
+
+    def paginate_queryset(self, queryset, request, view=None, fields=None):
+        """
+        Return one page of rows as dicts.
+
+        Args:
+            queryset: Queryset ordered by a field and then id (same direction)
+            request: The current request, for the cursor and page size
+            view: The calling view
+            fields: Fields to fetch with values(); the sort field and id are
+                always included
+
+        Returns:
+            list: Rows of the page
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        ordering = queryset.query.order_by[0]
+        field = ordering.lstrip('-')
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            value, pk = self.decode_cursor(cursor, ordering, queryset.model)
+            lookup = 'lt' if ordering.startswith('-') else 'gt'
+            # (field, id) > (value, pk), written so that the leading
+            # condition bounds an index range scan
+            queryset = queryset.filter(
+                Q(**{f'{field}__{lookup}e': value}),
+                Q(**{f'{field}__{lookup}': value}) | Q(**{f'id__{lookup}': pk})
+            )
+
+        fields = list(dict.fromkeys([*(fields or []), 'id', field]))
+        rows = list(queryset.values(*fields)[:page_size + 1])
+
+        self.next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            self.next_cursor = self.encode_cursor(ordering, rows[-1][field], rows[-1]['id'])
+        return rows
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
@@ -0,0 +1,190 @@
+"""
+Multi-core CSV parsing by byte-range partitioning.
+
+The file is split at line boundaries into byte ranges, and each range is
+parsed and validated in a ProcessPoolExecutor worker together with its
+partial analytics and sketches. Results are merged back in file order, so
+the output matches parse_csv_file exactly, including the DataFrame index.
+
+Quoted fields may contain newlines, which line-boundary splitting cannot
+handle; files containing a double quote make the caller fall back to the
+serial parser.
+
+This module imports api.parsing (which imports it) and api.analytics
+lazily, so that worker processes started with the 'spawn' method can set
+Django up first.
+"""
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from django.conf import settings
+
+
+class QuotedFieldsError(Exception):
+    """The file contains quotes, so line-boundary splitting is unsafe."""
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def split_byte_ranges(path, partition_size):
+    """
+    Split a CSV file into byte ranges that start and end on line boundaries.
+
+    Args:
+        path: Path to an uncompressed CSV file
+        partition_size: Approximate number of bytes per range
+
+    Returns:
+        tuple: (header bytes, list of (start, end) byte ranges after the header)
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header = f.readline()
+        boundaries = [f.tell()]
+
+        while boundaries[-1] < size:
+            f.seek(min(boundaries[-1] + partition_size, size))
+            f.readline()  # advance to the start of the next line
+            boundaries.append(min(f.tell(), size))
+
+    return header, list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def parse_byte_range(path, header, start, end):
+    """
+    Parse and validate one partition (runs in a worker process).
+
+    Returns:
+        tuple: (rows before validation, cleaned DataFrame, RunningAnalytics,
+        DatasetSketches)
+    """
+    from .sketches import DatasetSketches
+    from .analytics import RunningAnalytics
+    from .parsing import clean_dataframe, read_csv
+
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    raw = read_csv(io.BytesIO(header + data))
+    df = clean_dataframe(raw)
+
+    analytics = RunningAnalytics()
+    analytics.update(df)
+    sketches = DatasetSketches()
+    sketches.update(df)
+    return len(raw), df, analytics, sketches
+
+
+def file_has_quotes(path, block_size=16 * 1024 * 1024):
+    """Return True if the file contains a double quote anywhere."""
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            if b'"' in block:
+                return True
+    return False
+
+
+def iter_partitions(path, workers=None, partition_size=None):
+    """
+    Parse a CSV file in parallel, yielding validated partitions in file order.
+
+    At most two partitions per worker are in flight, so memory use is
+    bounded by the partition size rather than the file size. Each yielded
+    DataFrame carries its partial analytics and statistics sketches in
+    df.attrs['analytics'] and df.attrs['sketches'].
+
+    The file is checked before any work starts, so QuotedFieldsError and
+    missing-column errors are raised by this call rather than by the
+    returned iterator.
+
+    Args:
+        path: Path to an uncompressed CSV file
+        workers: Worker processes (defaults to settings.CSV_PARSE_WORKERS)
+        partition_size: Bytes per partition (defaults to settings.CSV_PARTITION_SIZE)
+
+    Returns:
+        iterator: Validated DataFrames, indexed like the serial parse
+
+    Raises:
+        QuotedFieldsError: If the file contains quoted fields
+        ValueError: If required columns are missing
+    """
+    from .parsing import clean_dataframe, read_csv
+
+    workers = workers or settings.CSV_PARSE_WORKERS
+    partition_size = partition_size or settings.CSV_PARTITION_SIZE
+
+    if file_has_quotes(path):
+        raise QuotedFieldsError()
+
+    header, ranges = split_byte_ranges(path, partition_size)
+    if not header.strip():
+        raise pd.errors.EmptyDataError("No columns to parse from file")
+
+    # Validate the header row once, before starting the pool
+    clean_dataframe(read_csv(io.BytesIO(header)))
+
+    return _generate_partitions(path, header, ranges, workers)
+
+
+def _generate_partitions(path, header, ranges, workers):
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        pending = deque()
+        ranges = iter(ranges)
+        row_offset = 0
+
+        while True:
+            while len(pending) < workers * 2:
+                byte_range = next(ranges, None)
+                if byte_range is None:
+                    break
+                pending.append(executor.submit(parse_byte_range, path, header, *byte_range))
+
+            if not pending:
+                break
+
+            raw_rows, df, analytics, sketches = pending.popleft().result()
+
+            # Continue the row numbering of the serial parser
+            df.index = df.index + row_offset
+            row_offset += raw_rows
+
+            df.attrs['analytics'] = analytics
+            df.attrs['sketches'] = sketches
+            yield df
+
+
+def parse_csv_path_parallel(path, workers=None, partition_size=None):
+    """
+    Parse a whole CSV file in parallel into one DataFrame.
+
+    Args:
+        path: Path to an uncompressed CSV file
+        workers: Worker processes (defaults to settings.CSV_PARSE_WORKERS)
+        partition_size: Bytes per partition; defaults to an even split
+            across the workers
+
+    Returns:
+        pandas.DataFrame: Same result as parse_csv_file on the same file
+    """
+    workers = workers or settings.CSV_PARSE_WORKERS
+    if partition_size is None:
+        partition_size = max(os.path.getsize(path) // workers + 1, 1)
+
+    frames = list(iter_partitions(path, workers, partition_size))
+    if not frames:
+        return pd.DataFrame()
+
+    df = pd.concat(frames)
+    df.attrs = {}
+    
+    # Partitions have their own Type categories; concat falls back to strings
+    df['Type'] = df['Type'].astype('category')
+    return df
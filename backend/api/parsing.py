@@ -0,0 +1,390 @@
+"""
+Reading and validating uploaded CSV files.
+
+read_csv reads the required columns in one typed pass (C or pyarrow
+engine, compressed files as a stream); parse_csv_file and iter_csv_chunks
+validate the result, whole or in chunks, and hand large uncompressed
+local files to parallel_parse.
+"""
+from itertools import islice
+
+import pandas as pd
+import pyarrow as pa
+from pandas._libs.parsers import STR_NA_VALUES
+from pyarrow import csv as pa_csv
+from django.conf import settings
+
+from .parallel_parse import QuotedFieldsError, iter_partitions, parse_csv_path_parallel
+
+
+# Expected columns
+REQUIRED_COLUMNS = ['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']
+NUMERIC_COLUMNS = ['Flowrate', 'Pressure', 'Temperature']
+
+# Compressed uploads (e.g. data.csv.gz), keyed by the final file extension.
+# Storage may insert a random suffix before that extension when renaming
+# (data.csv_a1b2c3d.gz), so detection only looks at the last one.
+CSV_COMPRESSION_EXTENSIONS = {'gz': 'gzip', 'bz2': 'bz2', 'xz': 'xz', 'zst': 'zstd'}
+
+# Column types for the single-pass parse (see read_csv). Text columns never
+# depend on which other rows were parsed alongside them (chunks, parallel
+# partitions), so results do not depend on how a file was split.
+CSV_PARSE_ENGINES = ('c', 'pyarrow')
+TEXT_DTYPES = {'Equipment Name': str, 'Type': 'category'}
+CSV_DTYPES = {**TEXT_DTYPES, **{col: 'float64' for col in NUMERIC_COLUMNS}}
+ARROW_COLUMN_TYPES = {
+    'Equipment Name': pa.string(),
+    'Type': pa.dictionary(pa.int32(), pa.string()),
+    **{col: pa.float64() for col in NUMERIC_COLUMNS}
+}
+# pandas' default missing-value strings. pyarrow's own list lacks 'None'
+# and '<NA>', which would keep rows that the C engine drops.
+CSV_NA_VALUES = sorted(STR_NA_VALUES)
+
+
+def is_csv_filename(filename):
+    """Return True for .csv names and their compressed .csv.<ext> variants"""
+    return filename.endswith('.csv') or any(
+        filename.endswith(f'.csv.{ext}') for ext in CSV_COMPRESSION_EXTENSIONS
+    )
+
+
+def get_csv_compression(file_obj):
+    """
+    Return the pandas compression codec for a file, based on its name.
+    
+    Args:
+        file_obj: File-like object, optionally with a name attribute
+        
+    Returns:
+        str or None: 'gzip', 'bz2', 'xz', 'zstd' or None for plain CSV
+    """
+    name = str(getattr(file_obj, 'name', '') or '')
+    if '.' not in name:
+        return None
+    return CSV_COMPRESSION_EXTENSIONS.get(name.rsplit('.', 1)[1].lower())
+
+
+def is_required_column(column):
+    """usecols filter: read only the required columns, whatever else the file has"""
+    return column in REQUIRED_COLUMNS
+
+
+def coerce_float_column(series, exact=False):
+    """
+    Convert a column read as text to floats, with NaN for invalid values.
+    
+    Args:
+        series: pandas.Series of strings
+        exact: Convert valid values with Arrow, which rounds correctly like
+            the pyarrow engine, instead of pandas' faster parser that the C
+            engine also uses
+        
+    Returns:
+        pandas.Series: float64 values
+    """
+    values = pd.to_numeric(series, errors='coerce').astype('float64')
+    if exact:
+        valid = values.notna()
+        try:
+            strings = pa.array(series[valid].str.strip().tolist(), type=pa.string())
+            values[valid] = strings.cast(pa.float64()).to_numpy()
+        except pa.ArrowInvalid:
+            pass  # a format only pandas understands; keep its values
+    return values
+
+
+def _read_csv_pyarrow(file_obj):
+    """Read a whole uncompressed CSV file with pyarrow.csv, typed like CSV_DTYPES."""
+    table = pa_csv.read_csv(
+        file_obj,
+        convert_options=pa_csv.ConvertOptions(
+            column_types=ARROW_COLUMN_TYPES,
+            null_values=CSV_NA_VALUES,
+            strings_can_be_null=True
+        )
+    )
+    table = table.select([column for column in table.column_names if column in REQUIRED_COLUMNS])
+    df = table.to_pandas()
+    
+    if 'Type' in df:
+        # Categories in sorted order, as the C engine produces them
+        df['Type'] = df['Type'].cat.set_categories(sorted(df['Type'].cat.categories))
+    return df
+
+
+def _read_csv_text_numbers(file_obj, compression, exact, chunksize=None):
+    """Read with the numeric columns as text and coerce them afterwards."""
+    dtype = {**TEXT_DTYPES, **{col: str for col in NUMERIC_COLUMNS}}
+    
+    def coerce(df):
+        for col in NUMERIC_COLUMNS:
+            if col in df:
+                df[col] = coerce_float_column(df[col], exact)
+        return df
+    
+    data = pd.read_csv(
+        file_obj, compression=compression, usecols=is_required_column,
+        dtype=dtype, chunksize=chunksize
+    )
+    if chunksize:
+        return (coerce(chunk) for chunk in data)
+    return coerce(data)
+
+
+def _iter_csv_chunks_c(file_obj, compression, chunksize):
+    """Chunked C-engine read with float columns, falling back to text numbers."""
+    start = file_obj.tell()
+    yielded = 0
+    
+    try:
+        for chunk in pd.read_csv(
+            file_obj, compression=compression, usecols=is_required_column,
+            dtype=CSV_DTYPES, chunksize=chunksize
+        ):
+            yield chunk
+            yielded += 1
+        return
+    except (pd.errors.EmptyDataError, pd.errors.ParserError):
+        raise
+    except ValueError:
+        pass  # a numeric column contains something else
+    
+    # Chunk boundaries only depend on the row count, so skipping the chunks
+    # already yielded continues exactly where the typed read stopped
+    file_obj.seek(start)
+    chunks = _read_csv_text_numbers(file_obj, compression, False, chunksize=chunksize)
+    yield from islice(chunks, yielded, None)
+
+
+def read_csv(file_obj, chunksize=None, engine=None):
+    """
+    Read the required columns of a CSV file in one typed pass.
+    
+    Equipment Name is read as a string, Type as a categorical and the
+    numeric columns directly as float64, so clean_dataframe only has to
+    drop incomplete rows. If a numeric column holds something other than
+    a number, the file is read again with the numeric columns as text,
+    and those values become NaN (see coerce_float_column).
+    
+    The engine comes from settings.CSV_PARSE_ENGINE. The pyarrow engine
+    reads whole uncompressed files only; chunked reads and compressed
+    files always use the C engine, which decompresses as a stream.
+    
+    Args:
+        file_obj: File-like object (Django File wrappers are accepted)
+        chunksize: Rows per chunk; returns an iterator of DataFrames if given
+        engine: 'c' or 'pyarrow' (defaults to settings.CSV_PARSE_ENGINE)
+        
+    Returns:
+        pandas.DataFrame or iterator of DataFrames (when chunksize is given)
+    """
+    engine = engine or settings.CSV_PARSE_ENGINE
+    if engine not in CSV_PARSE_ENGINES:
+        raise ValueError(f"Unknown CSV parse engine: {engine}")
+    
+    compression = get_csv_compression(file_obj)
+    if compression:
+        # pandas only decompresses handles it recognises as binary, so
+        # unwrap Django File objects to the underlying file
+        file_obj = getattr(file_obj, 'file', file_obj)
+    
+    if chunksize:
+        return _iter_csv_chunks_c(file_obj, compression, chunksize)
+    
+    start = file_obj.tell()
+    exact = engine == 'pyarrow'
+    try:
+        if engine == 'pyarrow' and not compression:
+            return _read_csv_pyarrow(file_obj)
+        return pd.read_csv(
+            file_obj, compression=compression, usecols=is_required_column, dtype=CSV_DTYPES
+        )
+    except (pd.errors.EmptyDataError, pd.errors.ParserError):
+        raise
+    except (ValueError, TypeError, pa.ArrowException):
+        # Non-numeric values, or input pyarrow rejects (including text-mode
+        # handles): the text read below reports empty and malformed files
+        # the same way as the C engine
+        file_obj.seek(start)
+    
+    return _read_csv_text_numbers(file_obj, compression, exact)
+
+
+def get_local_path(file_obj):
+    """
+    Return the local filesystem path of an uploaded or stored file.
+    
+    Args:
+        file_obj: TemporaryUploadedFile, FieldFile or similar
+        
+    Returns:
+        str or None: Path, or None for in-memory or remote files
+    """
+    if hasattr(file_obj, 'temporary_file_path'):
+        return file_obj.temporary_file_path()
+    try:
+        return file_obj.path
+    except (AttributeError, NotImplementedError, ValueError):
+        return None
+
+
+def should_parse_parallel(file_obj):
+    """
+    Decide whether a file should be parsed with parallel_parse.
+    
+    Args:
+        file_obj: Django UploadedFile or File object
+        
+    Returns:
+        bool: True for uncompressed local files of at least
+        settings.CSV_PARALLEL_THRESHOLD bytes when more than one parse
+        worker is configured
+    """
+    size = getattr(file_obj, 'size', None)
+    return (
+        settings.CSV_PARSE_WORKERS > 1
+        and size is not None
+        and size >= settings.CSV_PARALLEL_THRESHOLD
+        and not get_csv_compression(file_obj)
+        and get_local_path(file_obj) is not None
+    )
+
+
+def clean_dataframe(df):
+    """
+    Validate a parsed CSV DataFrame (or chunk of one).
+    
+    Args:
+        df: pandas.DataFrame as returned by read_csv, whose numeric
+            columns are already floats (NaN where a value was invalid)
+        
+    Returns:
+        pandas.DataFrame: Rows with all required values and valid numbers
+        
+    Raises:
+        ValueError: If required columns are missing
+    """
+    # Check if all required columns exist
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
+    
+    # Remove rows with missing or invalid values
+    df = df.dropna(subset=REQUIRED_COLUMNS)
+    
+    # Forget types that only occurred on removed rows
+    if isinstance(df['Type'].dtype, pd.CategoricalDtype):
+        df['Type'] = df['Type'].cat.remove_unused_categories()
+    return df
+
+
+def parse_csv_file(file_obj):
+    """
+    Parse CSV file and return a pandas DataFrame.
+    
+    Large uncompressed local files are parsed on several cores (see
+    should_parse_parallel); the result is the same as the serial parse.
+    
+    Args:
+        file_obj: Django UploadedFile object
+        
+    Returns:
+        pandas.DataFrame: Parsed data
+        
+    Raises:
+        ValueError: If CSV format is invalid
+    """
+    try:
+        df = None
+        if should_parse_parallel(file_obj):
+            try:
+                df = parse_csv_path_parallel(get_local_path(file_obj))
+            except QuotedFieldsError:
+                pass  # fall back to the serial parser
+        
+        if df is None:
+            # Read CSV file, decompressing on the fly if needed
+            df = clean_dataframe(read_csv(file_obj))
+        
+        if len(df) == 0:
+            raise ValueError("No valid data rows found in CSV file")
+        
+        return df
+        
+    except pd.errors.EmptyDataError:
+        raise ValueError("CSV file is empty")
+    except pd.errors.ParserError:
+        raise ValueError("Invalid CSV format")
+    except Exception as e:
+        raise ValueError(f"Error parsing CSV: {str(e)}")
+
+
+def iter_csv_chunks(file_obj, chunksize=None):
+    """
+    Parse a CSV file in fixed-size chunks of rows.
+    
+    Only a bounded number of chunks is held in memory at a time, so peak
+    memory depends on the chunk size rather than on the size of the file.
+    Compressed files are decompressed as a stream; large uncompressed
+    local files are split into byte ranges and parsed on several cores
+    (see should_parse_parallel).
+    
+    Args:
+        file_obj: File-like object opened in binary or text mode
+        chunksize: Rows per chunk (defaults to settings.CSV_CHUNK_SIZE)
+        
+    Yields:
+        pandas.DataFrame: Validated chunk, same columns as parse_csv_file
+        
+    Raises:
+        ValueError: If CSV format is invalid or contains no valid rows
+    """
+    chunksize = chunksize or settings.CSV_CHUNK_SIZE
+    
+    try:
+        chunks = None
+        if should_parse_parallel(file_obj):
+            try:
+                chunks = iter_partitions(get_local_path(file_obj))
+            except QuotedFieldsError:
+                pass  # fall back to the serial parser
+        
+        if chunks is None:
+            chunks = (clean_dataframe(chunk) for chunk in read_csv(file_obj, chunksize=chunksize))
+        
+        total_rows = 0
+        for chunk in chunks:
+            total_rows += len(chunk)
+            if len(chunk):
+                yield chunk
+        
+        if total_rows == 0:
+            raise ValueError("No valid data rows found in CSV file")
+        
+    except pd.errors.EmptyDataError:
+        raise ValueError("CSV file is empty")
+    except pd.errors.ParserError:
+        raise ValueError("Invalid CSV format")
+    except Exception as e:
+        raise ValueError(f"Error parsing CSV: {str(e)}")
+
+
+def should_stream_csv(file_obj):
+    """
+    Decide whether an upload is large enough for chunked ingestion.
+    
+    Compressed files are always streamed, since their decompressed size
+    is unknown until they have been read.
+    
+    Args:
+        file_obj: Django UploadedFile or File object
+        
+    Returns:
+        bool: True if the file is compressed or exceeds
+        settings.CSV_STREAMING_THRESHOLD
+    """
+    if get_csv_compression(file_obj):
+        return True
+    size = getattr(file_obj, 'size', None)
+    return size is not None and size > settings.CSV_STREAMING_THRESHOLD
@@ -8,6 +8,7 @@ from datetime import datetime
 import os
 from django.conf import settings
 from .models import Dataset
+from .loading import load_dataset_frame
 
 
 def generate_pdf_report(dataset_id):
@@ -145,16 +146,18 @@ def generate_pdf_report(dataset_id):
     details_heading = Paragraph("Equipment Details", heading_style)
     story.append(details_heading)
     
-    equipment_records = dataset.equipment_records.all()[:50]  # Limit to first 50
+    # First 50 records by name, read from the dataset's columnar file
+    df = load_dataset_frame(dataset)
+    equipment_records = df.sort_values('Equipment Name', kind='stable').head(50)
     
     details_data = [['Name', 'Type', 'Flowrate', 'Pressure', 'Temp']]
-    for record in equipment_records:
+    for name, eq_type, flowrate, pressure, temperature in equipment_records.itertuples(index=False):
         details_data.append([
-            record.equipment_name[:20],  # Truncate long names
-            record.equipment_type[:15],
-            f"{record.flowrate:.1f}",
-            f"{record.pressure:.1f}",
-            f"{record.temperature:.1f}"
+            name[:20],  # Truncate long names
+            eq_type[:15],
+            f"{flowrate:.1f}",
+            f"{pressure:.1f}",
+            f"{temperature:.1f}"
         ])
     
     details_table = Table(details_data, colWidths=[1.8*inch, 1.5*inch, 1*inch, 1*inch, 1*inch])
@@ -0,0 +1,204 @@
+"""
+Renderers for exporting equipment records.
+
+Besides render(), used for ordinary (e.g. error) responses, the export
+renderers have stream(), which encodes rows lazily in batches so that a
+StreamingHttpResponse can send a whole dataset with flat memory use.
+
+- NDJSON and CSV: row-oriented text
+- Arrow IPC stream and MessagePack: column-oriented binary, whose numeric
+  columns load into NumPy/pandas without parsing
+"""
+import csv
+import io
+import json
+from itertools import islice
+
+import msgpack
+import numpy as np
+import pyarrow as pa
+from rest_framework.renderers import BaseRenderer
+
+
+# Rows encoded per chunk of a streamed body (text / columnar formats)
+STREAM_BATCH_SIZE = 1000
+COLUMNAR_BATCH_SIZE = 10000
+
+# Column types of the binary formats, by EquipmentData field
+ARROW_TYPES = {
+    'id': pa.int64(),
+    'equipment_name': pa.string(),
+    'equipment_type': pa.dictionary(pa.int32(), pa.string()),
+    'flowrate': pa.float64(),
+    'pressure': pa.float64(),
+    'temperature': pa.float64(),
+}
+NUMPY_DTYPES = {'id': '<i8', 'flowrate': '<f8', 'pressure': '<f8', 'temperature': '<f8'}
+
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Newline-delimited JSON: one object per record and line."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(json.dumps(row) + '\n' for row in rows).encode()
+
+    def stream(self, columns, rows):
+        """
+        Encode rows as NDJSON.
+
+        Args:
+            columns: Field names, the keys of each object
+            rows: Iterable of value tuples in the order of columns
+
+        Yields:
+            bytes: Chunks of the body
+        """
+        for batch in _batches(rows, STREAM_BATCH_SIZE):
+            yield ''.join(json.dumps(dict(zip(columns, row))) + '\n' for row in batch).encode()
+
+
+class CSVRenderer(BaseRenderer):
+    """CSV with a header row."""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        if not rows:
+            return b''
+        columns = list(rows[0])
+        return b''.join(self.stream(columns, ([row.get(column) for column in columns] for row in rows)))
+
+    def stream(self, columns, rows):
+        """
+        Encode rows as CSV, header first.
+
+        Args:
+            columns: Field names for the header row
+            rows: Iterable of value tuples in the order of columns
+
+        Yields:
+            bytes: Chunks of the body
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        yield buffer.getvalue().encode()
+
+        for batch in _batches(rows, STREAM_BATCH_SIZE):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(batch)
+            yield buffer.getvalue().encode()
+
+
+class ArrowStreamRenderer(BaseRenderer):
+    """
+    Arrow IPC stream: a schema, then one record batch per COLUMNAR_BATCH_SIZE rows.
+
+    Read with pyarrow.ipc.open_stream(body).read_pandas(); equipment_type
+    is dictionary-encoded and becomes a pandas Categorical.
+    """
+    media_type = 'application/vnd.apache.arrow.stream'
+    format = 'arrow'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        table = pa.Table.from_pylist(data if isinstance(data, list) else [data])
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    def stream(self, columns, rows):
+        """
+        Encode rows as an Arrow IPC stream.
+
+        Args:
+            columns: Field names (keys of ARROW_TYPES)
+            rows: Iterable of value tuples in the order of columns
+
+        Yields:
+            bytes: The schema message, then the messages of each record batch
+        """
+        schema = pa.schema([(column, ARROW_TYPES[column]) for column in columns])
+        buffer = io.BytesIO()
+
+        def drain():
+            chunk = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return chunk
+
+        writer = pa.ipc.new_stream(buffer, schema)
+        yield drain()
+        for batch in _batches(rows, COLUMNAR_BATCH_SIZE):
+            arrays = [
+                pa.array(values, type=ARROW_TYPES[column].value_type).dictionary_encode()
+                if pa.types.is_dictionary(ARROW_TYPES[column])
+                else pa.array(values, type=ARROW_TYPES[column])
+                for column, values in zip(columns, zip(*batch))
+            ]
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+            yield drain()
+        writer.close()
+        yield drain()
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack stream of column-oriented objects.
+
+    The first object is a header, {"columns": [...], "dtypes": {...}},
+    where dtypes gives the NumPy dtype of each binary column. Each
+    following object maps column names to the values of up to
+    COLUMNAR_BATCH_SIZE rows: numeric columns as raw little-endian bytes
+    (np.frombuffer(value, dtype) reads them without copying), text columns
+    as arrays of strings. Read with msgpack.Unpacker.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return msgpack.packb(data)
+
+    def stream(self, columns, rows):
+        """
+        Encode rows as a header object followed by one object per batch.
+
+        Args:
+            columns: Field names
+            rows: Iterable of value tuples in the order of columns
+
+        Yields:
+            bytes: One packed object per chunk
+        """
+        dtypes = {column: NUMPY_DTYPES[column] for column in columns if column in NUMPY_DTYPES}
+        yield msgpack.packb({'columns': list(columns), 'dtypes': dtypes})
+
+        for batch in _batches(rows, COLUMNAR_BATCH_SIZE):
+            yield msgpack.packb({
+                column: np.array(values, dtype=dtypes[column]).tobytes() if column in dtypes else list(values)
+                for column, values in zip(columns, zip(*batch))
+            })
+
+
+# Formats the equipment endpoint streams instead of paginating
+EXPORT_RENDERER_CLASSES = [NDJSONRenderer, CSVRenderer, ArrowStreamRenderer, MessagePackRenderer]
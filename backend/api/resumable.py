@@ -0,0 +1,141 @@
+"""
+Helpers for the resumable chunked upload protocol.
+
+A client initiates an UploadSession, PUTs byte ranges (in any order, in
+parallel if it likes), can ask for the received offset at any time to
+resume, and finally asks the server to verify the SHA-256 checksum and
+hand the assembled file to the normal ingest pipeline.
+"""
+import hashlib
+import os
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+
+from .models import UploadSession
+
+
+CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+SHA256_HEX_RE = re.compile(r'^[0-9a-fA-F]{64}$')
+
+# Read/write block size when streaming request bodies and hashing files
+BLOCK_SIZE = 1024 * 1024
+
+
+def parse_content_range(header, total_size):
+    """
+    Parse a `Content-Range: bytes start-end/total` request header.
+
+    Args:
+        header: Header value
+        total_size: Size declared when the session was initiated
+
+    Returns:
+        tuple: (start, end) as a half-open byte range
+
+    Raises:
+        ValueError: If the header is missing, malformed or out of bounds
+    """
+    match = CONTENT_RANGE_RE.match(header or '')
+    if not match:
+        raise ValueError("Content-Range header must look like 'bytes start-end/total'")
+
+    start, last, total = (int(group) for group in match.groups())
+    if total != total_size:
+        raise ValueError(f"Content-Range total {total} does not match upload size {total_size}")
+    if start > last or last >= total_size:
+        raise ValueError("Content-Range is outside the upload")
+    if last - start + 1 > settings.UPLOAD_CHUNK_MAX_SIZE:
+        raise ValueError(f"Chunks may not exceed {settings.UPLOAD_CHUNK_MAX_SIZE} bytes")
+
+    return start, last + 1
+
+
+def create_spool_file(session):
+    """Create the session's spool file, pre-sized so chunks can land in any order."""
+    os.makedirs(settings.UPLOAD_SPOOL_DIR, exist_ok=True)
+    with open(session.spool_path, 'wb') as spool:
+        spool.truncate(session.total_size)
+
+
+def write_chunk(session, stream, start, end):
+    """
+    Copy a request body into the spool file at [start, end).
+
+    Args:
+        session: UploadSession instance
+        stream: File-like request body
+        start: First byte offset
+        end: End offset (exclusive)
+
+    Raises:
+        ValueError: If the body length does not match the range
+    """
+    remaining = end - start
+    with open(session.spool_path, 'r+b') as spool:
+        spool.seek(start)
+        while remaining > 0:
+            block = stream.read(min(BLOCK_SIZE, remaining))
+            if not block:
+                break
+            spool.write(block)
+            remaining -= len(block)
+
+    if remaining != 0 or stream.read(1):
+        raise ValueError("Request body length does not match Content-Range")
+
+
+def file_sha256(path):
+    """Return the hex SHA-256 digest of a file, read in BLOCK_SIZE blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def is_sha256_hex(value):
+    """Return True if value is a string holding a SHA-256 hex digest."""
+    return isinstance(value, str) and SHA256_HEX_RE.match(value) is not None
+
+
+def delete_spool_file(session):
+    try:
+        os.remove(session.spool_path)
+    except FileNotFoundError:
+        pass
+
+
+def delete_stale_sessions():
+    """
+    Delete unfinished upload sessions older than settings.UPLOAD_SESSION_EXPIRY
+    together with their spool files.
+
+    Returns:
+        int: Number of sessions deleted
+    """
+    expired = timezone.now() - timedelta(seconds=settings.UPLOAD_SESSION_EXPIRY)
+    sessions = list(UploadSession.objects.filter(completed_at__isnull=True, created_at__lt=expired))
+    for session in sessions:
+        delete_spool_file(session)
+    UploadSession.objects.filter(pk__in=[session.pk for session in sessions]).delete()
+    return len(sessions)
+
+
+class SpooledUpload(File):
+    """
+    File wrapper for a finished spool file.
+
+    It exposes the spool's path (so the parser can read it in parallel) but
+    not temporary_file_path(): FileSystemStorage then copies the spool file
+    into MEDIA_ROOT instead of moving it, and the spool survives a failed
+    ingest for finalize to be retried.
+    """
+
+    @property
+    def path(self):
+        return self.file.name
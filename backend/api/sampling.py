@@ -0,0 +1,89 @@
+"""
+Constant-size scatter data for large datasets.
+
+sample_points picks at most max_points rows: the rows holding the
+minimum and maximum of each axis are always kept, and the rest of the
+budget is spread over a grid of cells in proportion to their row counts,
+with at least one row from every non-empty cell so that sparse regions
+and outliers stay visible. density_grid counts rows in 2-D bins instead.
+
+Both are vectorized with NumPy and deterministic (seeded), so results
+can be cached.
+"""
+import numpy as np
+
+
+def _cell_ids(x, y, grid):
+    def bin_index(values):
+        low, high = values.min(), values.max()
+        if high == low:
+            return np.zeros(len(values), dtype='int64')
+        index = ((values - low) / (high - low) * grid).astype('int64')
+        return np.minimum(index, grid - 1)
+
+    return bin_index(x) * grid + bin_index(y)
+
+
+def sample_points(x, y, max_points, grid=32, seed=0):
+    """
+    Choose a stratified, extreme-preserving sample of points.
+
+    Args:
+        x: numpy array of x values
+        y: numpy array of y values (same length)
+        max_points: Maximum number of points to return
+        grid: Cells per axis used for stratification
+        seed: Random seed, for reproducible samples
+
+    Returns:
+        numpy.ndarray: Sorted positions of the chosen points
+    """
+    n = len(x)
+    if n <= max_points:
+        return np.arange(n)
+
+    rng = np.random.default_rng(seed)
+    extremes = np.unique([x.argmin(), x.argmax(), y.argmin(), y.argmax()])[:max_points]
+    budget = max_points - len(extremes)
+
+    # Shuffle within cells: sort by cell, then by a random key
+    cells = _cell_ids(x, y, grid)
+    order = np.lexsort((rng.random(n), cells))
+    sorted_cells = cells[order]
+    starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+    counts = np.diff(np.r_[starts, n])
+    rank = np.arange(n) - np.repeat(starts, counts)
+
+    # Proportional quota per cell, at least one point each
+    quota = np.maximum(1, counts * budget // n)
+    chosen = rank < np.repeat(quota, counts)
+    keep = order[chosen]
+
+    if len(keep) > budget:
+        # Over budget by the minimum quotas: drop the highest ranks first,
+        # so every cell keeps a point for as long as possible
+        kept_rank = rank[chosen]
+        keep = keep[np.lexsort((rng.random(len(keep)), kept_rank))[:budget]]
+
+    return np.union1d(extremes, keep)
+
+
+def density_grid(x, y, bins):
+    """
+    Count points in a bins x bins grid spanning the data.
+
+    Args:
+        x: numpy array of x values
+        y: numpy array of y values
+        bins: Bins per axis
+
+    Returns:
+        dict: x_edges and y_edges (bins + 1 values each) and counts, a
+        list of bins rows (one per x bin) of bins counts (one per y bin)
+    """
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    return {
+        'x_edges': x_edges.tolist(),
+        'y_edges': y_edges.tolist(),
+        'counts': counts.astype('int64').tolist(),
+    }
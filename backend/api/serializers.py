@@ -1,5 +1,10 @@
+from django.conf import settings
 from rest_framework import serializers
-from .models import Dataset, EquipmentData
+from rest_framework.reverse import reverse
+from .models import Dataset, EquipmentAnomaly, EquipmentData, IngestJob, UploadSession
+from .anomalies import describe_flags
+from .parsing import is_csv_filename
+from .resumable import is_sha256_hex
 
 
 class EquipmentDataSerializer(serializers.ModelSerializer):
@@ -10,6 +15,21 @@ class EquipmentDataSerializer(serializers.ModelSerializer):
         fields = ['id', 'equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature']
 
 
+class EquipmentAnomalySerializer(serializers.ModelSerializer):
+    """
+    Serializer for flagged equipment rows, read with values(); flags lists
+    the methods per parameter
+    """
+    flags = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = EquipmentAnomaly
+        fields = ['row', 'equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature', 'flags']
+    
+    def get_flags(self, obj):
+        return describe_flags(obj['flags'])
+
+
 class DatasetSerializer(serializers.ModelSerializer):
     """Serializer for dataset with basic information"""
     uploaded_by = serializers.StringRelatedField(read_only=True)
@@ -32,17 +52,33 @@ class DatasetSerializer(serializers.ModelSerializer):
 
 
 class DatasetDetailSerializer(serializers.ModelSerializer):
-    """Detailed serializer including all equipment records"""
+    """
+    Detailed serializer for a single dataset.
+    
+    Records are not inlined; `equipment` links to the first page of the
+    paginated /api/datasets/{id}/equipment/ endpoint.
+    """
     uploaded_by = serializers.StringRelatedField(read_only=True)
-    equipment_records = EquipmentDataSerializer(many=True, read_only=True)
+    equipment = serializers.SerializerMethodField()
     
     class Meta:
         model = Dataset
         fields = [
             'id', 'name', 'file', 'uploaded_by', 'uploaded_at',
             'total_equipment', 'avg_flowrate', 'avg_pressure',
-            'avg_temperature', 'equipment_types', 'equipment_records'
+            'avg_temperature', 'equipment_types', 'equipment'
         ]
+    
+    def get_equipment(self, obj):
+        return reverse('dataset-equipment', args=[obj.id], request=self.context.get('request'))
+
+
+def validate_csv_filename(filename):
+    """Raise a ValidationError unless the file name looks like a (compressed) CSV file"""
+    if not is_csv_filename(filename):
+        raise serializers.ValidationError(
+            "Only CSV files are allowed (optionally compressed as .csv.gz, .csv.bz2, .csv.xz or .csv.zst)."
+        )
 
 
 class DatasetUploadSerializer(serializers.Serializer):
@@ -52,8 +88,7 @@ class DatasetUploadSerializer(serializers.Serializer):
     
     def validate_file(self, value):
         """Validate that the uploaded file is a CSV"""
-        if not value.name.endswith('.csv'):
-            raise serializers.ValidationError("Only CSV files are allowed.")
+        validate_csv_filename(value.name)
         return value
 
 
@@ -70,3 +105,50 @@ class AnalyticsSerializer(serializers.Serializer):
     max_pressure = serializers.FloatField()
     min_temperature = serializers.FloatField()
     max_temperature = serializers.FloatField()
+
+
+class IngestJobSerializer(serializers.ModelSerializer):
+    """Serializer for background ingest job status"""
+    
+    class Meta:
+        model = IngestJob
+        fields = [
+            'id', 'dataset', 'state', 'rows_processed', 'rows_per_sec',
+            'error', 'created_at', 'started_at', 'finished_at'
+        ]
+        read_only_fields = fields
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """Serializer for resumable upload sessions"""
+    size = serializers.IntegerField(source='total_size', min_value=1)
+    offset = serializers.SerializerMethodField()
+    received = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = UploadSession
+        fields = [
+            'id', 'name', 'filename', 'size', 'checksum', 'offset',
+            'received', 'dataset', 'created_at', 'completed_at'
+        ]
+        read_only_fields = ['id', 'dataset', 'created_at', 'completed_at']
+    
+    def validate_filename(self, value):
+        validate_csv_filename(value)
+        return value
+    
+    def validate_size(self, value):
+        if value > settings.UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f"Uploads may not exceed {settings.UPLOAD_MAX_SIZE} bytes.")
+        return value
+    
+    def validate_checksum(self, value):
+        if value and not is_sha256_hex(value):
+            raise serializers.ValidationError("Checksum must be a SHA-256 hex digest.")
+        return value.lower()
+    
+    def get_offset(self, obj):
+        return obj.received_offset()
+    
+    def get_received(self, obj):
+        return obj.received_ranges()
@@ -0,0 +1,72 @@
+"""
+Cache of computed dataset payloads shared by all worker processes.
+
+gunicorn runs several workers, each with its own memory, so results are
+kept in Django's default cache (a FileBasedCache directory unless CACHES
+is configured otherwise). Keys contain the dataset ID and version, so
+nothing stale is served after a dataset changes. Each dataset also has an
+index entry listing its keys, which deleting the dataset (see the
+post_delete receiver in api.models) uses to drop them; entries of other
+versions would only expire.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+
+def dataset_cache_key(dataset, name, *parts):
+    """
+    Build the cache key of a payload of one dataset version.
+
+    Args:
+        dataset: Dataset model instance
+        name: Kind of payload, e.g. 'scatter'
+        *parts: Parameters the payload depends on
+
+    Returns:
+        str: e.g. 'dataset:3:2:scatter:Flowrate:Pressure'
+    """
+    return ':'.join(str(part) for part in ('dataset', dataset.id, dataset.version, name, *parts))
+
+
+def _index_key(dataset_id):
+    return f'dataset:{dataset_id}:keys'
+
+
+def get_or_compute(dataset, name, parts, compute):
+    """
+    Return a cached payload of a dataset, computing and storing it if needed.
+
+    Args:
+        dataset: Dataset model instance
+        name: Kind of payload, e.g. 'scatter'
+        parts: Tuple of parameters the payload depends on
+        compute: Function returning the payload; None results are not cached
+
+    Returns:
+        The cached or computed payload
+    """
+    key = dataset_cache_key(dataset, name, *parts)
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    value = compute()
+    if value is None:
+        return None
+
+    timeout = settings.ANALYTICS_CACHE_TIMEOUT
+    cache.set(key, value, timeout)
+    # Not atomic across workers: a lost update only leaves a key to expire
+    index = _index_key(dataset.id)
+    keys = cache.get(index, [])
+    if key not in keys:
+        cache.set(index, keys + [key], timeout)
+    return value
+
+
+def invalidate_dataset_cache(dataset_id):
+    """Delete every cached payload of a dataset (all versions)."""
+    index = _index_key(dataset_id)
+    keys = cache.get(index)
+    if keys:
+        cache.delete_many(keys + [index])
@@ -0,0 +1,331 @@
+"""
+Mergeable streaming statistics sketches.
+
+Each numeric parameter of a dataset gets three small summaries, built in
+one pass over the rows at ingest and stored in DatasetSummary.sketches:
+
+- Moments: count, mean and variance (Welford/Chan update), min and max
+- TDigest: quantile estimates (p50, p95, p99, ...) from a few hundred
+  weighted centroids, most accurate in the tails
+- Histogram: counts in fixed-width bins
+
+Every sketch can absorb a chunk of values (update) or another sketch of
+the same kind (merge). Chunks parsed by different processes, or whole
+datasets, can therefore be combined without touching their rows.
+"""
+import math
+
+import numpy as np
+from django.conf import settings
+
+from .parsing import NUMERIC_COLUMNS
+
+
+def _finite(values):
+    values = np.asarray(values, dtype='float64')
+    return values[np.isfinite(values)]
+
+
+class Moments:
+    """Count, mean, sum of squared deviations (M2), min and max."""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0, min=None, max=None):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.min = min
+        self.max = max
+
+    def update(self, values):
+        values = _finite(values)
+        if len(values) == 0:
+            return
+        mean = float(values.mean())
+        self._combine(
+            len(values), mean, float(((values - mean) ** 2).sum()),
+            float(values.min()), float(values.max())
+        )
+
+    def merge(self, other):
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    def _combine(self, count, mean, m2, min_value, max_value):
+        # Chan et al.'s pairwise form of Welford's update
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min_value if self.min is None else min(self.min, min_value)
+        self.max = max_value if self.max is None else max(self.max, max_value)
+
+    @property
+    def variance(self):
+        """Sample variance (ddof=1, like pandas)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def to_dict(self):
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2, 'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+class TDigest:
+    """
+    Merging t-digest for quantile estimates.
+
+    Values and centroids are kept as weighted points, sorted, and grouped
+    so that no group spans more than one unit of the k1 scale function
+    k(q) = compression / (2 pi) * asin(2q - 1). The scale is steep near
+    q = 0 and q = 1, so tail centroids stay small and p99 stays accurate,
+    and the digest never holds more than about compression / 2 centroids.
+    """
+
+    def __init__(self, compression=None, means=None, weights=None):
+        self.compression = compression or settings.SKETCH_TDIGEST_COMPRESSION
+        self.means = np.asarray(means if means is not None else [], dtype='float64')
+        self.weights = np.asarray(weights if weights is not None else [], dtype='float64')
+
+    @property
+    def total_weight(self):
+        return float(self.weights.sum())
+
+    def update(self, values):
+        values = _finite(values)
+        if len(values):
+            self._compress(
+                np.concatenate([self.means, values]),
+                np.concatenate([self.weights, np.ones(len(values))])
+            )
+
+    def merge(self, other):
+        if len(other.means):
+            self._compress(
+                np.concatenate([self.means, other.means]),
+                np.concatenate([self.weights, other.weights])
+            )
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind='stable')
+        means = means[order]
+        weights = weights[order]
+
+        total = weights.sum()
+        q_mid = (np.cumsum(weights) - weights / 2) / total
+        k = self.compression / (2 * math.pi) * np.arcsin(2 * q_mid - 1)
+        groups = np.floor(k - k[0]).astype('int64')
+
+        # Groups are contiguous because k is monotonic in q
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        group_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / group_weights
+        self.weights = group_weights
+
+    def quantile(self, q, min_value, max_value):
+        """
+        Estimate the q-quantile (0 <= q <= 1).
+
+        Args:
+            q: Quantile
+            min_value: Exact minimum of the data (from Moments)
+            max_value: Exact maximum of the data
+
+        Returns:
+            float or None: Estimate, or None if the digest is empty
+        """
+        total = self.total_weight
+        if total == 0:
+            return None
+        centers = np.cumsum(self.weights) - self.weights / 2
+        return float(np.interp(
+            q * total,
+            np.r_[0.0, centers, total],
+            np.r_[min_value, self.means, max_value]
+        ))
+
+    def to_dict(self):
+        return {
+            'compression': self.compression,
+            'means': self.means.tolist(),
+            'weights': self.weights.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['compression'], data['means'], data['weights'])
+
+
+class Histogram:
+    """
+    Counts of values in fixed-width bins [i * width, (i + 1) * width).
+
+    Only non-empty bins are stored. When the data spans more than
+    max_bins bins, the width doubles until it fits; merging re-bins the
+    finer histogram into the coarser one, which is exact when both widths
+    derive from the same base width by doubling.
+    """
+
+    def __init__(self, width, counts=None, max_bins=None):
+        self.width = float(width)
+        self.counts = dict(counts or {})
+        self.max_bins = max_bins or settings.SKETCH_HISTOGRAM_MAX_BINS
+
+    def update(self, values):
+        values = _finite(values)
+        if len(values) == 0:
+            return
+        bins, counts = np.unique(np.floor(values / self.width).astype('int64'), return_counts=True)
+        for index, count in zip(bins.tolist(), counts.tolist()):
+            self.counts[index] = self.counts.get(index, 0) + count
+        self._fit()
+
+    def merge(self, other):
+        if self.width < other.width:
+            self._rebin(other.width)
+        other_counts = other.counts
+        if other.width != self.width:
+            other = Histogram(other.width, other.counts, self.max_bins)
+            other._rebin(self.width)
+            other_counts = other.counts
+        for index, count in other_counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self._fit()
+
+    def _rebin(self, width):
+        counts = {}
+        for index, count in self.counts.items():
+            # Place each bin by its centre
+            new_index = math.floor((index + 0.5) * self.width / width)
+            counts[new_index] = counts.get(new_index, 0) + count
+        self.width = float(width)
+        self.counts = counts
+
+    def _fit(self):
+        while self.counts and max(self.counts) - min(self.counts) + 1 > self.max_bins:
+            self._rebin(self.width * 2)
+
+    def bins(self):
+        """Return every bin between the lowest and highest non-empty one as (start, end, count)."""
+        if not self.counts:
+            return []
+        return [
+            (index * self.width, (index + 1) * self.width, self.counts.get(index, 0))
+            for index in range(min(self.counts), max(self.counts) + 1)
+        ]
+
+    def to_dict(self):
+        # JSON object keys are strings
+        return {'width': self.width, 'counts': {str(index): count for index, count in self.counts.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['width'], {int(index): count for index, count in data['counts'].items()})
+
+
+class ColumnSketch:
+    """Moments, t-digest and histogram of one numeric column."""
+
+    def __init__(self, moments, tdigest, histogram):
+        self.moments = moments
+        self.tdigest = tdigest
+        self.histogram = histogram
+
+    @classmethod
+    def empty(cls, column):
+        return cls(Moments(), TDigest(), Histogram(settings.SKETCH_HISTOGRAM_WIDTHS[column]))
+
+    def update(self, values):
+        self.moments.update(values)
+        self.tdigest.update(values)
+        self.histogram.update(values)
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.tdigest.merge(other.tdigest)
+        self.histogram.merge(other.histogram)
+
+    def statistics(self, quantiles):
+        """
+        Return summary statistics for the column.
+
+        Args:
+            quantiles: Quantiles to estimate, e.g. [0.5, 0.95, 0.99]
+
+        Returns:
+            dict: count, mean, std, min, max, p<N> per quantile and histogram
+        """
+        moments = self.moments
+        stats = {
+            'count': moments.count,
+            'mean': moments.mean if moments.count else None,
+            'std': math.sqrt(moments.variance) if moments.count else None,
+            'min': moments.min,
+            'max': moments.max,
+        }
+        for q in quantiles:
+            stats[f'p{q * 100:g}'] = self.tdigest.quantile(q, moments.min, moments.max)
+        stats['histogram'] = {
+            'bin_width': self.histogram.width,
+            'bins': [
+                {'start': start, 'end': end, 'count': count}
+                for start, end, count in self.histogram.bins()
+            ],
+        }
+        return stats
+
+    def to_dict(self):
+        return {
+            'moments': self.moments.to_dict(),
+            'tdigest': self.tdigest.to_dict(),
+            'histogram': self.histogram.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            Moments.from_dict(data['moments']),
+            TDigest.from_dict(data['tdigest']),
+            Histogram.from_dict(data['histogram'])
+        )
+
+
+class DatasetSketches:
+    """
+    Sketches of every numeric column of a dataset.
+
+    Usage:
+        sketches = DatasetSketches()
+        for chunk in chunks:
+            sketches.update(chunk)
+        summary.sketches = sketches.to_dict()
+    """
+
+    def __init__(self, columns=None):
+        self.columns = columns or {column: ColumnSketch.empty(column) for column in NUMERIC_COLUMNS}
+
+    def update(self, df):
+        """Add a chunk of validated rows."""
+        for column, sketch in self.columns.items():
+            sketch.update(df[column].to_numpy())
+
+    def merge(self, other):
+        """Add the rows summarised by another DatasetSketches."""
+        for column, sketch in self.columns.items():
+            sketch.merge(other.columns[column])
+
+    def statistics(self, quantiles=(0.5, 0.95, 0.99)):
+        """Return ColumnSketch.statistics for every column, keyed by lower-case name."""
+        return {
+            column.lower(): sketch.statistics(quantiles)
+            for column, sketch in self.columns.items()
+        }
+
+    def to_dict(self):
+        return {column: sketch.to_dict() for column, sketch in self.columns.items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls({column: ColumnSketch.from_dict(data[column]) for column in NUMERIC_COLUMNS})
@@ -0,0 +1,341 @@
+"""
+Per-dataset results served by the dataset endpoints.
+
+Analytics, per-type statistics and sketches are stored in DatasetSummary
+at ingest (and correlations on first request); datasets ingested before
+a part existed are computed from their rows. Chart data (scatter,
+histograms) is kept in the shared cache per dataset version.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+
+from .models import Dataset, DatasetSummary
+from .shared_cache import get_or_compute
+from .sketches import DatasetSketches
+from .correlation import calculate_correlation
+from .sampling import density_grid, sample_points
+from .histogram import bin_counts, bin_edges
+from .parallel_parse import _init_worker
+from .analytics import calculate_analytics, calculate_analytics_sql, calculate_type_statistics
+from .loading import load_dataset_frame
+from .parsing import NUMERIC_COLUMNS
+
+
+def compute_dataset_analytics(dataset):
+    """
+    Compute analytics from a dataset's rows.
+    
+    settings.ANALYTICS_BACKEND selects 'pandas' (load the rows with
+    load_dataset_frame and run calculate_analytics) or 'sql' (aggregate
+    in the database with calculate_analytics_sql).
+    
+    Args:
+        dataset: Dataset model instance
+        
+    Returns:
+        dict: Analytics data, or None if the dataset has no rows
+    """
+    if settings.ANALYTICS_BACKEND == 'sql':
+        return calculate_analytics_sql(dataset.get_equipment_records())
+    
+    df = load_dataset_frame(dataset, ['Type'] + NUMERIC_COLUMNS)
+    if len(df) == 0:
+        return None
+    
+    return calculate_analytics(df)
+
+
+def get_dataset_analytics(dataset_id):
+    """
+    Get analytics for a specific dataset.
+    
+    Served from the DatasetSummary stored at ingest, without reading any
+    rows. Datasets ingested before summaries existed are computed from
+    their rows (`manage.py backfill_dataset_summaries` stores them).
+    
+    Args:
+        dataset_id: ID of the dataset
+        
+    Returns:
+        dict: Analytics data
+    """
+    analytics = DatasetSummary.objects.filter(
+        dataset_id=dataset_id
+    ).values_list('analytics', flat=True).first()
+    if analytics is not None:
+        return analytics
+    
+    try:
+        dataset = Dataset.objects.get(id=dataset_id)
+    except Dataset.DoesNotExist:
+        return None
+    
+    return compute_dataset_analytics(dataset)
+
+
+def get_dataset_type_statistics(dataset):
+    """
+    Get a dataset's per-type statistics.
+    
+    Served from the DatasetSummary stored at ingest; datasets ingested
+    before per-type statistics existed are computed from their rows.
+    
+    Args:
+        dataset: Dataset model instance
+        
+    Returns:
+        list: Same format as calculate_type_statistics
+    """
+    stored = DatasetSummary.objects.filter(
+        dataset=dataset
+    ).values_list('type_statistics', flat=True).first()
+    if stored:
+        return stored
+    
+    return calculate_type_statistics(load_dataset_frame(dataset, ['Type'] + NUMERIC_COLUMNS))
+
+
+def get_dataset_correlation(dataset):
+    """
+    Get a dataset's correlation matrices and line fits.
+    
+    Rank correlations need every row at once, so they are not built at
+    ingest: the first request computes them from the columnar file (or
+    EquipmentData) and caches them in the dataset's summary.
+    
+    Args:
+        dataset: Dataset model instance
+        
+    Returns:
+        dict: Same format as correlation.calculate_correlation
+    """
+    summaries = DatasetSummary.objects.filter(dataset=dataset)
+    stored = summaries.values_list('correlation', flat=True).first()
+    if stored:
+        return stored
+    
+    correlation = calculate_correlation(load_dataset_frame(dataset, ['Type'] + NUMERIC_COLUMNS))
+    if not summaries.update(correlation=correlation):
+        # No summary yet (ingested before summaries existed): store a
+        # complete one, as readers of the other fields expect
+        summary = compute_dataset_summary(dataset)
+        if summary is not None:
+            DatasetSummary.objects.update_or_create(
+                dataset=dataset, defaults={**summary, 'correlation': correlation}
+            )
+    return correlation
+
+
+def get_dataset_scatter(dataset, x, y, mode='sample', size=2000):
+    """
+    Get constant-size scatter data for two numeric columns of a dataset.
+    
+    Results are kept in the shared cache per dataset version, column
+    pair, mode and size.
+    
+    Args:
+        dataset: Dataset model instance
+        x: Column on the x axis, e.g. 'Flowrate'
+        y: Column on the y axis
+        mode: 'sample' for at most `size` points (see sampling.sample_points)
+            or 'density' for counts in a size x size grid
+        size: max_points for 'sample', bins per axis for 'density'
+        
+    Returns:
+        dict: total rows and either points (x, y and type lists) or the
+        density_grid result
+    """
+    return get_or_compute(
+        dataset, 'scatter', (x, y, mode, size),
+        lambda: _compute_dataset_scatter(dataset, x, y, mode, size)
+    )
+
+
+def _compute_dataset_scatter(dataset, x, y, mode, size):
+    df = load_dataset_frame(dataset, list(dict.fromkeys(['Type', x, y])))
+    x_values = df[x].to_numpy(dtype='float64')
+    y_values = df[y].to_numpy(dtype='float64')
+    result = {'total': len(df)}
+    
+    if mode == 'density':
+        result.update(density_grid(x_values, y_values, size) if len(df) else {
+            'x_edges': [], 'y_edges': [], 'counts': []
+        })
+    else:
+        positions = sample_points(x_values, y_values, size) if len(df) else []
+        result['points'] = {
+            'x': x_values[positions].tolist(),
+            'y': y_values[positions].tolist(),
+            'type': df['Type'].iloc[positions].astype(str).tolist(),
+        }
+    return result
+
+
+def get_dataset_histogram(dataset, column, bins=50, rule='fixed', by_type=False, max_bins=None):
+    """
+    Get the histogram of a numeric column of a dataset.
+    
+    Kept in the shared cache per dataset version, column, bins (except
+    for 'fd', which ignores it), rule, by_type and max_bins.
+    
+    Args:
+        dataset: Dataset model instance
+        column: Numeric column, e.g. 'Temperature'
+        bins: Number of bins (the 'fd' rule chooses its own)
+        rule: Bin rule, see histogram.BIN_RULES
+        by_type: Also count per equipment type
+        max_bins: Upper limit on the number of bins for the 'fd' rule
+        
+    Returns:
+        dict: total, edges and counts, plus by_type counts when requested
+    """
+    if rule == 'fd':
+        bins = None
+    return get_or_compute(
+        dataset, 'histogram', (column, bins, rule, by_type, max_bins),
+        lambda: _compute_dataset_histogram(dataset, column, bins, rule, by_type, max_bins)
+    )
+
+
+def _compute_dataset_histogram(dataset, column, bins, rule, by_type, max_bins):
+    df = load_dataset_frame(dataset, ['Type', column] if by_type else [column])
+    values = df[column].to_numpy(dtype='float64')
+    edges = bin_edges(values, bins, rule, max_bins)
+    counts, counts_by_type = bin_counts(values, edges, df['Type'].to_numpy() if by_type else None)
+    
+    result = {'total': len(values), 'edges': edges.tolist(), 'counts': counts}
+    if by_type:
+        result['by_type'] = counts_by_type
+    return result
+
+
+def compute_dataset_sketches(dataset):
+    """
+    Build statistics sketches from a dataset's rows.
+    
+    Args:
+        dataset: Dataset model instance
+        
+    Returns:
+        DatasetSketches: Sketches of every numeric column
+    """
+    sketches = DatasetSketches()
+    df = load_dataset_frame(dataset, NUMERIC_COLUMNS)
+    if len(df):
+        sketches.update(df)
+    return sketches
+
+
+def get_dataset_sketches(dataset):
+    """
+    Get a dataset's statistics sketches.
+    
+    Served from the DatasetSummary stored at ingest; datasets ingested
+    before sketches existed are sketched from their rows.
+    
+    Args:
+        dataset: Dataset model instance
+        
+    Returns:
+        DatasetSketches: Sketches of every numeric column
+    """
+    stored = DatasetSummary.objects.filter(
+        dataset=dataset
+    ).values_list('sketches', flat=True).first()
+    if stored:
+        return DatasetSketches.from_dict(stored)
+    
+    return compute_dataset_sketches(dataset)
+
+
+def compute_dataset_summary(dataset):
+    """
+    Compute a dataset's summary fields from its rows.
+    
+    Args:
+        dataset: Dataset model instance
+        
+    Returns:
+        dict: DatasetSummary field values (analytics, type_statistics,
+        sketches), or None if the dataset has no rows
+    """
+    analytics = compute_dataset_analytics(dataset)
+    if analytics is None:
+        return None
+    
+    df = load_dataset_frame(dataset, ['Type'] + NUMERIC_COLUMNS)
+    sketches = DatasetSketches()
+    sketches.update(df)
+    
+    return {
+        'analytics': analytics,
+        'type_statistics': calculate_type_statistics(df),
+        'sketches': sketches.to_dict(),
+    }
+
+
+def _compute_dataset_summary_by_id(dataset_id):
+    # Runs in a worker process; only the parent writes, so SQLite
+    # databases see no concurrent writers
+    return compute_dataset_summary(Dataset.objects.get(id=dataset_id))
+
+
+def store_dataset_summary(dataset, summary=None):
+    """
+    Store a dataset's summary, computing it from its rows unless given.
+    
+    Used for datasets ingested before summaries (or some of their parts)
+    existed.
+    
+    Args:
+        dataset: Dataset model instance
+        summary: Optional result of compute_dataset_summary
+        
+    Returns:
+        dict: Analytics data, or None if the dataset has no rows
+    """
+    if summary is None:
+        summary = compute_dataset_summary(dataset)
+    if summary is None:
+        return None
+    
+    DatasetSummary.objects.update_or_create(dataset=dataset, defaults=summary)
+    return summary['analytics']
+
+
+def get_datasets_analytics(datasets):
+    """
+    Get analytics for several datasets at once.
+    
+    Stored summaries are fetched with a single query. Datasets without
+    one are summarised from their rows, in a pool of
+    settings.ANALYTICS_WORKERS processes when there are several, and the
+    summaries are stored for next time.
+    
+    Args:
+        datasets: List of Dataset model instances
+        
+    Returns:
+        dict: Analytics data (or None for a dataset without rows) keyed by
+        dataset ID
+    """
+    analytics = dict(DatasetSummary.objects.filter(
+        dataset__in=datasets
+    ).values_list('dataset_id', 'analytics'))
+    
+    missing = [dataset for dataset in datasets if dataset.id not in analytics]
+    workers = min(settings.ANALYTICS_WORKERS, len(missing))
+    if workers > 1:
+        # Forked workers must open their own database connections
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            summaries = executor.map(_compute_dataset_summary_by_id, [dataset.id for dataset in missing])
+            for dataset, summary in zip(missing, summaries):
+                analytics[dataset.id] = store_dataset_summary(dataset, summary)
+    else:
+        for dataset in missing:
+            analytics[dataset.id] = store_dataset_summary(dataset)
+    
+    return analytics
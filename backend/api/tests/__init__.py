@@ -0,0 +1,3 @@
+"""
+Tests for the api app (run with `python manage.py test api`).
+"""
@@ -0,0 +1,76 @@
+"""
+Fixtures shared by the api tests.
+"""
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api.column_cache import column_cache
+
+
+TYPES = ['Pump', 'Valve', 'Compressor', 'HeatExchanger', 'Reactor', 'Condenser']
+
+
+def make_frame(rows, seed=0):
+    """Random equipment rows with the CSV column names."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Equipment Name': [f'Equipment-{i}' for i in range(rows)],
+        'Type': np.array(TYPES)[rng.integers(0, len(TYPES), rows)],
+        'Flowrate': np.round(rng.uniform(50, 300, rows), 1),
+        'Pressure': np.round(rng.uniform(1, 20, rows), 2),
+        'Temperature': np.round(rng.uniform(50, 500, rows), 1),
+    })
+
+
+def make_csv(rows, seed=0):
+    """CSV bytes of make_frame(rows, seed)."""
+    return make_frame(rows, seed).to_csv(index=False).encode()
+
+
+class DatasetTestCase(TestCase):
+    """
+    TestCase with an authenticated API client, uploads stored in a
+    temporary MEDIA_ROOT and an empty in-memory cache in every test.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp()
+        cls.settings_override = override_settings(
+            MEDIA_ROOT=cls.media_root,
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+            INGEST_ASYNC=False,
+        )
+        cls.settings_override.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.settings_override.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+
+    def setUp(self):
+        # Rolled-back tests reuse dataset IDs (and versions)
+        cache.clear()
+        column_cache.clear()
+
+        self.user = User.objects.create_user('tester')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, content, filename='data.csv', name='data', client=None):
+        """POST a CSV file to /api/upload/ (as self.user by default) and return the response."""
+        return (client or self.client).post(
+            '/api/upload/',
+            {'name': name, 'file': SimpleUploadedFile(filename, content, content_type='text/csv')},
+            format='multipart'
+        )
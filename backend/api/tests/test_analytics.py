@@ -0,0 +1,50 @@
+from django.test import override_settings
+
+from api.analytics import calculate_analytics, calculate_analytics_sql
+from api.models import Dataset, EquipmentData
+from api.summaries import compute_dataset_analytics
+
+from .helpers import DatasetTestCase, make_csv, make_frame
+
+
+class SQLAnalyticsTests(DatasetTestCase):
+    """The SQL aggregate backend returns the payload of calculate_analytics."""
+
+    def setUp(self):
+        super().setUp()
+        response = self.upload(make_csv(3000))
+        self.dataset = Dataset.objects.get(id=response.json()['id'])
+
+    def assert_same_analytics(self, analytics, expected):
+        self.assertEqual(analytics.keys(), expected.keys())
+        for key, value in expected.items():
+            if key.startswith('avg_'):
+                self.assertAlmostEqual(analytics[key], value, places=9)
+            else:
+                self.assertEqual(analytics[key], value, key)
+        # Most frequent type first, ties by name
+        self.assertEqual(list(analytics['equipment_types']), list(expected['equipment_types']))
+
+    def test_sql_matches_pandas(self):
+        analytics = calculate_analytics_sql(self.dataset.get_equipment_records())
+
+        self.assert_same_analytics(analytics, calculate_analytics(make_frame(3000)))
+
+    def test_backends_agree_on_a_filtered_queryset(self):
+        records = self.dataset.get_equipment_records().filter(pressure__gte=10)
+        df = make_frame(3000)
+
+        analytics = calculate_analytics_sql(records)
+
+        self.assert_same_analytics(analytics, calculate_analytics(df[df['Pressure'] >= 10]))
+
+    def test_compute_dataset_analytics_with_each_backend(self):
+        with override_settings(ANALYTICS_BACKEND='sql'):
+            sql = compute_dataset_analytics(self.dataset)
+        with override_settings(ANALYTICS_BACKEND='pandas'):
+            pandas = compute_dataset_analytics(self.dataset)
+
+        self.assert_same_analytics(sql, pandas)
+
+    def test_no_rows(self):
+        self.assertIsNone(calculate_analytics_sql(EquipmentData.objects.none()))
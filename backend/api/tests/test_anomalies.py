@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+
+from api.anomalies import ANOMALY_METHODS, anomaly_flag, describe_flags, detect_anomalies
+from api.models import Dataset
+from api.parsing import NUMERIC_COLUMNS
+
+from .helpers import DatasetTestCase, make_frame
+
+
+def flagged(flags, method, column):
+    """Row positions whose flags have the bit of (method, column)."""
+    return np.flatnonzero(flags & anomaly_flag(method, column)).tolist()
+
+
+class DetectorTests(SimpleTestCase):
+    """Each detector flags the planted outliers of its own kind, per parameter."""
+
+    def test_flags_are_distinct_bits(self):
+        bits = [anomaly_flag(method, column) for method in ANOMALY_METHODS for column in NUMERIC_COLUMNS]
+
+        self.assertEqual(len(set(bits)), 9)
+        self.assertTrue(all(bit & (bit - 1) == 0 for bit in bits))
+        self.assertEqual(
+            describe_flags(anomaly_flag('iqr', 'Pressure') | anomaly_flag('mad', 'Pressure') | anomaly_flag('zscore', 'Flowrate')),
+            {'flowrate': ['zscore'], 'pressure': ['iqr', 'mad']}
+        )
+
+    def test_global_outlier(self):
+        df = make_frame(1000)
+        df.loc[42, 'Flowrate'] = 5000.0
+
+        flags = detect_anomalies(df)
+
+        for method in ANOMALY_METHODS:
+            self.assertEqual(flagged(flags, method, 'Flowrate'), [42], method)
+        self.assertEqual(flagged(flags, 'zscore', 'Pressure'), [])
+
+    def test_outlier_within_its_type_only(self):
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            'Type': ['Pump'] * 500 + ['Valve'] * 500,
+            'Flowrate': np.concatenate([rng.normal(10, 1, 500), rng.normal(100, 1, 500)]),
+            'Pressure': 1.0,
+            'Temperature': 1.0,
+        })
+        # Typical of the whole column, far from the other pumps
+        df.loc[7, 'Flowrate'] = 55.0
+
+        flags = detect_anomalies(df)
+
+        self.assertIn(7, flagged(flags, 'mad', 'Flowrate'))
+        self.assertNotIn(7, flagged(flags, 'zscore', 'Flowrate'))
+        self.assertNotIn(7, flagged(flags, 'iqr', 'Flowrate'))
+
+    def test_constant_columns_flag_nothing(self):
+        df = pd.DataFrame({'Type': ['Pump'] * 20, 'Flowrate': 5.0, 'Pressure': 5.0, 'Temperature': 5.0})
+
+        self.assertEqual(detect_anomalies(df).tolist(), [0] * 20)
+        self.assertEqual(len(detect_anomalies(df.iloc[:0])), 0)
+
+
+class AnomalyEndpointTests(DatasetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        df = make_frame(600)
+        # Extremes for every detector, and pumps far from the other pumps
+        df.loc[[10, 200, 450], 'Flowrate'] = [2000.0, -900.0, 1500.0]
+        df.loc[[30, 300], 'Temperature'] = [5000.0, 4000.0]
+        df.loc[df['Type'] == 'Pump', 'Pressure'] = 10.0 + np.arange((df['Type'] == 'Pump').sum()) * 1e-3
+        df.loc[df.index[df['Type'] == 'Pump'][:3], 'Pressure'] = 15.0
+        self.flags = detect_anomalies(df)
+
+        response = self.upload(df.to_csv(index=False).encode())
+        self.dataset = Dataset.objects.get(id=response.json()['id'])
+        self.url = f'/api/datasets/{self.dataset.id}/anomalies/'
+
+    def fetch_all(self, **params):
+        rows = []
+        response = self.client.get(self.url, {'page_size': 4, **params})
+        while True:
+            self.assertEqual(response.status_code, 200, response.content)
+            page = response.json()
+            self.assertLessEqual(len(page['anomalies']), 4)
+            rows.extend(page['anomalies'])
+            if page['next'] is None:
+                return rows
+            response = self.client.get(page['next'])
+
+    def test_pages_hold_every_flagged_row_in_order(self):
+        rows = self.fetch_all()
+
+        self.assertGreater(len(rows), 4)
+        self.assertEqual([row['row'] for row in rows], np.flatnonzero(self.flags).tolist())
+        self.assertEqual(rows[0]['flags'], describe_flags(int(self.flags[rows[0]['row']])))
+        self.assertEqual(
+            set(rows[0]), {'row', 'equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature', 'flags'}
+        )
+
+    def test_method_and_parameter_filters(self):
+        for params, mask in (
+            ({'method': 'mad'}, sum(anomaly_flag('mad', column) for column in NUMERIC_COLUMNS)),
+            ({'parameter': 'temperature'}, sum(anomaly_flag(method, 'Temperature') for method in ANOMALY_METHODS)),
+            ({'method': 'zscore,iqr', 'parameter': 'flowrate'}, anomaly_flag('zscore', 'Flowrate') | anomaly_flag('iqr', 'Flowrate')),
+            # A value given twice must not set the next bit
+            ({'method': 'mad,mad', 'parameter': 'pressure'}, anomaly_flag('mad', 'Pressure')),
+        ):
+            with self.subTest(params=params):
+                rows = self.fetch_all(**params)
+                expected = np.flatnonzero(self.flags & mask).tolist()
+                self.assertTrue(expected)
+                self.assertEqual([row['row'] for row in rows], expected)
+
+    def test_unknown_method_or_parameter(self):
+        for params in ({'method': 'grubbs'}, {'parameter': 'name'}, {'method': 'mad', 'parameter': 'Pressure'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(self.url, params).status_code, 400)
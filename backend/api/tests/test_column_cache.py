@@ -0,0 +1,112 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from api.column_cache import ColumnCache, column_cache
+from api.loading import load_dataset_frame
+from api.models import Dataset
+
+from .helpers import DatasetTestCase, make_csv
+
+
+def column(size):
+    """A float64 array of `size` bytes."""
+    return np.zeros(size // 8)
+
+
+class ColumnCacheTests(SimpleTestCase):
+    """The LRU keeps the most recently used datasets within its byte budget."""
+
+    def test_evicts_least_recently_used_dataset(self):
+        cache = ColumnCache(max_bytes=2400)
+        cache.put(1, 1, {'Flowrate': column(800)})
+        cache.put(2, 1, {'Flowrate': column(800)})
+        cache.get(1, 1, ['Flowrate'])
+
+        cache.put(3, 1, {'Flowrate': column(800), 'Pressure': column(800)})
+
+        self.assertEqual(cache.get(2, 1, ['Flowrate']), {})
+        self.assertIn('Flowrate', cache.get(1, 1, ['Flowrate']))
+        self.assertEqual(len(cache.get(3, 1, ['Flowrate', 'Pressure'])), 2)
+        stats = cache.stats()
+        self.assertEqual((stats['entries'], stats['bytes'], stats['evictions']), (2, 2400, 1))
+
+    def test_columns_of_a_dataset_accumulate(self):
+        cache = ColumnCache(max_bytes=10000)
+        cache.put(1, 1, {'Flowrate': column(800)})
+        cache.put(1, 1, {'Pressure': column(800)})
+
+        self.assertEqual(set(cache.get(1, 1, ['Flowrate', 'Pressure'])), {'Flowrate', 'Pressure'})
+        self.assertEqual(cache.stats()['bytes'], 1600)
+
+    def test_partial_lookup_is_a_miss(self):
+        cache = ColumnCache(max_bytes=10000)
+        cache.put(1, 1, {'Flowrate': column(800)})
+
+        found = cache.get(1, 1, ['Flowrate', 'Pressure'])
+
+        self.assertEqual(list(found), ['Flowrate'])
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_other_version_is_replaced(self):
+        cache = ColumnCache(max_bytes=10000)
+        cache.put(1, 1, {'Flowrate': column(800)})
+
+        self.assertEqual(cache.get(1, 2, ['Flowrate']), {})
+        cache.put(1, 2, {'Pressure': column(800)})
+
+        self.assertEqual(cache.get(1, 2, ['Flowrate', 'Pressure']).keys(), {'Pressure'})
+        self.assertEqual(cache.stats()['bytes'], 800)
+
+    def test_invalidate(self):
+        cache = ColumnCache(max_bytes=10000)
+        cache.put(1, 1, {'Flowrate': column(800)})
+        cache.put(2, 1, {'Flowrate': column(800)})
+
+        cache.invalidate(1)
+
+        self.assertEqual(cache.get(1, 1, ['Flowrate']), {})
+        self.assertEqual((cache.stats()['entries'], cache.stats()['bytes']), (1, 800))
+
+    def test_oversized_and_disabled(self):
+        cache = ColumnCache(max_bytes=1000)
+        cache.put(1, 1, {'Flowrate': column(1600)})
+        disabled = ColumnCache(max_bytes=0)
+        disabled.put(1, 1, {'Flowrate': column(8)})
+
+        self.assertEqual(cache.stats()['entries'], 0)
+        self.assertEqual(disabled.stats()['entries'], 0)
+
+
+class DatasetColumnCacheTests(DatasetTestCase):
+    """load_dataset_frame fills the cache; new versions and deletes bypass it."""
+
+    def setUp(self):
+        super().setUp()
+        response = self.upload(make_csv(300))
+        self.dataset = Dataset.objects.get(id=response.json()['id'])
+        column_cache.clear()
+
+    def test_second_load_is_served_from_the_cache(self):
+        first = load_dataset_frame(self.dataset, ['Type', 'Flowrate'])
+        hits = column_cache.hits
+
+        second = load_dataset_frame(self.dataset, ['Type', 'Flowrate'])
+
+        self.assertEqual(column_cache.hits, hits + 1)
+        np.testing.assert_array_equal(second['Flowrate'], first['Flowrate'])
+
+    def test_new_version_is_reloaded(self):
+        load_dataset_frame(self.dataset, ['Flowrate'])
+
+        self.dataset.bump_version()
+        self.dataset.refresh_from_db()
+
+        self.assertEqual(column_cache.get(self.dataset.id, self.dataset.version, ['Flowrate']), {})
+
+    def test_delete_invalidates(self):
+        load_dataset_frame(self.dataset, ['Flowrate'])
+        dataset_id, version = self.dataset.id, self.dataset.version
+
+        self.dataset.delete()
+
+        self.assertEqual(column_cache.get(dataset_id, version, ['Flowrate']), {})
@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from api.models import Dataset
+
+from .helpers import DatasetTestCase, make_csv
+
+
+class ConditionalGetTests(DatasetTestCase):
+    """Dataset endpoints answer revalidation requests with 304 until the dataset changes."""
+
+    def setUp(self):
+        super().setUp()
+        response = self.upload(make_csv(100))
+        self.dataset = Dataset.objects.get(id=response.json()['id'])
+        self.url = f'/api/datasets/{self.dataset.id}/'
+
+    def test_if_none_match_gives_304(self):
+        for url in (self.url, f'{self.url}analytics/', f'{self.url}statistics/'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertIn('no-cache', response['Cache-Control'])
+
+            revalidated = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(revalidated.status_code, 304, url)
+            self.assertEqual(revalidated['ETag'], response['ETag'])
+            self.assertEqual(revalidated.content, b'')
+
+    def test_version_bump_changes_the_etag(self):
+        etag = self.client.get(self.url)['ETag']
+
+        self.dataset.bump_version()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_version_bump_advances_last_modified(self):
+        Dataset.objects.filter(pk=self.dataset.pk).update(modified_at=timezone.now() - timedelta(hours=1))
+        last_modified = self.client.get(self.url)['Last-Modified']
+        self.assertEqual(
+            self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304
+        )
+
+        self.dataset.bump_version()
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['Last-Modified'], last_modified)
+
+    def test_list_etag_changes_with_a_new_dataset(self):
+        etag = self.client.get('/api/datasets/')['ETag']
+        self.assertEqual(self.client.get('/api/datasets/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.upload(make_csv(100, seed=1), name='second')
+
+        self.assertEqual(self.client.get('/api/datasets/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
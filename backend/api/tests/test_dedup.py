@@ -0,0 +1,102 @@
+import os
+
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+
+from api.models import Dataset, DatasetSummary, EquipmentData
+
+from .helpers import DatasetTestCase, make_csv
+
+
+class DeduplicationTests(DatasetTestCase):
+    """Identical uploads share rows, which outlive the dataset that owned them."""
+
+    def setUp(self):
+        super().setUp()
+        self.content = make_csv(200)
+        self.rows = 200
+
+    def upload_dataset(self, name, client=None):
+        response = self.upload(self.content, name=name, client=client)
+        self.assertEqual(response.status_code, 201, response.content)
+        return Dataset.objects.get(id=response.json()['id'])
+
+    def assert_owns_rows(self, dataset):
+        dataset.refresh_from_db()
+        self.assertIsNone(dataset.data_source_id)
+        self.assertEqual(EquipmentData.objects.filter(dataset=dataset).count(), self.rows)
+
+    def test_duplicate_shares_file_and_rows(self):
+        source = self.upload_dataset('first')
+        copy = self.upload_dataset('second')
+
+        self.assertEqual(copy.data_source_id, source.id)
+        self.assertEqual(copy.file.name, source.file.name)
+        self.assertEqual(EquipmentData.objects.count(), self.rows)
+        self.assertEqual(
+            self.client.get(f'/api/datasets/{copy.id}/analytics/').json(),
+            self.client.get(f'/api/datasets/{source.id}/analytics/').json()
+        )
+
+    def test_deleting_the_source_hands_rows_to_the_newest_copy(self):
+        source = self.upload_dataset('first')
+        older = self.upload_dataset('second')
+        newest = self.upload_dataset('third')
+
+        response = self.client.delete(f'/api/datasets/{source.id}/')
+        self.assertEqual(response.status_code, 204)
+
+        self.assert_owns_rows(newest)
+        older.refresh_from_db()
+        self.assertEqual(older.data_source_id, newest.id)
+        self.assertEqual(older.get_equipment_records().count(), self.rows)
+
+    def test_queryset_delete_hands_rows_on(self):
+        source = self.upload_dataset('first')
+        copy = self.upload_dataset('second')
+
+        Dataset.objects.filter(pk=source.pk).delete()
+
+        self.assert_owns_rows(copy)
+
+    def test_user_cascade_hands_rows_to_another_users_copy(self):
+        other = User.objects.create_user('other')
+        other_client = APIClient()
+        other_client.force_authenticate(other)
+
+        self.upload_dataset('source')
+        kept = self.upload_dataset('kept', client=other_client)
+        self.upload_dataset('own copy')
+
+        # Deletes the source and the copy in one batch
+        self.user.delete()
+
+        self.assertEqual(Dataset.objects.count(), 1)
+        self.assert_owns_rows(kept)
+
+    def test_file_is_deleted_with_the_last_dataset_using_it(self):
+        source = self.upload_dataset('first')
+        copy = self.upload_dataset('second')
+        path = source.file.path
+
+        with self.captureOnCommitCallbacks(execute=True):
+            source.delete()
+        self.assertTrue(os.path.exists(path))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Dataset.objects.get(pk=copy.pk).delete()
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(EquipmentData.objects.count(), 0)
+
+    def test_duplicate_keeps_summary_when_retention_prunes_the_source(self):
+        source = self.upload_dataset('source')
+        for i in range(4):
+            self.upload(make_csv(10, seed=i + 1), name=f'other {i}')
+        summary = DatasetSummary.objects.get(dataset=source)
+
+        # The sixth dataset makes Dataset.save prune the source
+        copy = self.upload_dataset('copy')
+
+        self.assertFalse(Dataset.objects.filter(pk=source.pk).exists())
+        self.assert_owns_rows(copy)
+        self.assertEqual(DatasetSummary.objects.get(dataset=copy).analytics, summary.analytics)
@@ -0,0 +1,53 @@
+from api.models import Dataset
+
+from .helpers import DatasetTestCase, make_csv
+
+
+class EquipmentFilterTests(DatasetTestCase):
+    """The equipment endpoint's filters select the same rows as the ORM."""
+
+    def setUp(self):
+        super().setUp()
+        response = self.upload(make_csv(400))
+        self.dataset = Dataset.objects.get(id=response.json()['id'])
+        self.records = self.dataset.get_equipment_records()
+        self.url = f'/api/datasets/{self.dataset.id}/equipment/'
+
+    def get_ids(self, **params):
+        response = self.client.get(self.url, {'page_size': 1000, **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertIsNone(response.json()['next'])
+        return [row['id'] for row in response.json()['results']]
+
+    def expected_ids(self, *ordering, **filters):
+        return list(self.records.filter(**filters).order_by(*ordering).values_list('id', flat=True))
+
+    def test_default_is_every_row_by_name(self):
+        self.assertEqual(self.get_ids(), self.expected_ids('equipment_name', 'id'))
+
+    def test_type_filter(self):
+        self.assertEqual(
+            self.get_ids(type='Pump,Valve'),
+            self.expected_ids('equipment_name', 'id', equipment_type__in=['Pump', 'Valve'])
+        )
+
+    def test_name_prefix(self):
+        self.assertEqual(
+            self.get_ids(name='Equipment-1'),
+            self.expected_ids('equipment_name', 'id', equipment_name__startswith='Equipment-1')
+        )
+
+    def test_inclusive_bounds_and_ordering(self):
+        ids = self.get_ids(flowrate_min='100', flowrate_max='200.5', temperature_min='300', ordering='-pressure')
+
+        self.assertTrue(ids)
+        self.assertEqual(ids, self.expected_ids(
+            '-pressure', '-id', flowrate__gte=100, flowrate__lte=200.5, temperature__gte=300
+        ))
+
+    def test_malformed_parameters(self):
+        for params in ({'pressure_min': 'high'}, {'temperature_max': ''}, {'ordering': 'id'}, {'ordering': '-size'}):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
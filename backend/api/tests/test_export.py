@@ -0,0 +1,86 @@
+import io
+import json
+
+import msgpack
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from api.models import Dataset
+
+from .helpers import DatasetTestCase, make_csv
+
+
+FIELDS = ['id', 'equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature']
+
+
+class ExportTests(DatasetTestCase):
+    """Streamed exports hold exactly the filtered, ordered rows of the database."""
+
+    def setUp(self):
+        super().setUp()
+        # More rows than one STREAM_BATCH_SIZE chunk
+        response = self.upload(make_csv(2500))
+        self.dataset = Dataset.objects.get(id=response.json()['id'])
+        self.url = f'/api/datasets/{self.dataset.id}/equipment/'
+
+    def expected_rows(self, **filters):
+        records = self.dataset.get_equipment_records().filter(**filters).order_by('-pressure', '-id')
+        return [dict(zip(FIELDS, row)) for row in records.values_list(*FIELDS)]
+
+    def export(self, export_format, **params):
+        response = self.client.get(self.url, {'format': export_format, 'ordering': '-pressure', **params})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            response['Content-Disposition'], f'attachment; filename="equipment_data.{export_format}"'
+        )
+        return response, b''.join(response.streaming_content)
+
+    def test_ndjson_round_trip(self):
+        response, body = self.export('ndjson')
+
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        rows = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual(rows, self.expected_rows())
+
+    def test_csv_round_trip(self):
+        response, body = self.export('csv')
+
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        frame = pd.read_csv(io.BytesIO(body))
+        self.assertEqual(list(frame.columns), FIELDS)
+        self.assertEqual(frame.to_dict('records'), self.expected_rows())
+
+    def test_arrow_round_trip(self):
+        response, body = self.export('arrow')
+
+        self.assertEqual(response['Content-Type'], 'application/vnd.apache.arrow.stream')
+        frame = pa.ipc.open_stream(body).read_pandas()
+        self.assertEqual(list(frame.columns), FIELDS)
+        self.assertIsInstance(frame['equipment_type'].dtype, pd.CategoricalDtype)
+        frame['equipment_type'] = frame['equipment_type'].astype(str)
+        self.assertEqual(frame.to_dict('records'), self.expected_rows())
+
+    def test_msgpack_round_trip(self):
+        response, body = self.export('msgpack')
+
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        header, *batches = msgpack.Unpacker(io.BytesIO(body))
+        self.assertEqual(header['columns'], FIELDS)
+        columns = {column: [] for column in FIELDS}
+        for batch in batches:
+            for column in FIELDS:
+                if column in header['dtypes']:
+                    columns[column].extend(np.frombuffer(batch[column], header['dtypes'][column]).tolist())
+                else:
+                    columns[column].extend(batch[column])
+        rows = [dict(zip(FIELDS, values)) for values in zip(*columns.values())]
+        self.assertEqual(rows, self.expected_rows())
+
+    def test_export_applies_the_filters(self):
+        _, body = self.export('ndjson', type='Pump', flowrate_min=100)
+
+        rows = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertTrue(rows)
+        self.assertEqual(rows, self.expected_rows(equipment_type='Pump', flowrate__gte=100))
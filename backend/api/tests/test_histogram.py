@@ -0,0 +1,104 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from api.histogram import bin_counts, bin_edges
+from api.models import Dataset
+
+from .helpers import DatasetTestCase, make_csv, make_frame
+
+
+class BinRuleTests(SimpleTestCase):
+    """Bin edges of each rule and counts that agree with numpy.histogram."""
+
+    def setUp(self):
+        self.values = np.random.default_rng(0).normal(100, 15, 10000)
+
+    def test_fixed_bins(self):
+        edges = bin_edges(self.values, 40)
+
+        np.testing.assert_array_equal(edges, np.histogram_bin_edges(self.values, bins=40))
+        counts, _ = bin_counts(self.values, edges)
+        self.assertEqual(counts, np.histogram(self.values, edges)[0].tolist())
+
+    def test_quantile_bins_hold_equal_counts(self):
+        edges = bin_edges(self.values, 10, rule='quantile')
+
+        counts, _ = bin_counts(self.values, edges)
+        self.assertEqual(len(counts), 10)
+        self.assertEqual(sum(counts), len(self.values))
+        self.assertLessEqual(max(counts) - min(counts), 2)
+
+    def test_quantile_bins_merge_repeated_values(self):
+        values = np.array([1.0] * 90 + [2.0] * 10)
+
+        edges = bin_edges(values, 10, rule='quantile')
+
+        self.assertLess(len(edges), 11)
+        self.assertTrue(np.all(np.diff(edges) > 0))
+        self.assertEqual((edges[0], edges[-1]), (1.0, 2.0))
+
+    def test_fd_bins_use_the_freedman_diaconis_width(self):
+        edges = bin_edges(self.values, 10, rule='fd')
+
+        np.testing.assert_array_equal(edges, np.histogram_bin_edges(self.values, bins='fd'))
+
+    def test_fd_bins_are_capped(self):
+        # One outlier stretches the range to thousands of FD-wide bins
+        values = np.append(self.values, 2000.0)
+
+        edges = bin_edges(values, 10, rule='fd', max_bins=100)
+
+        np.testing.assert_array_equal(edges, np.histogram_bin_edges(values, bins=100))
+
+    def test_fd_cap_is_checked_before_building_edges(self):
+        # Would need ~10^11 edges if they were built first
+        values = np.append(self.values, 1e12)
+
+        edges = bin_edges(values, 10, rule='fd', max_bins=500)
+
+        self.assertEqual(len(edges), 501)
+
+    def test_counts_per_group(self):
+        groups = np.random.default_rng(1).choice(['Pump', 'Valve', 'Reactor'], len(self.values))
+        edges = bin_edges(self.values, 20)
+
+        counts, by_group = bin_counts(self.values, edges, groups)
+
+        self.assertEqual(sorted(by_group), ['Pump', 'Reactor', 'Valve'])
+        self.assertEqual(np.sum(list(by_group.values()), axis=0).tolist(), counts)
+        for group, group_counts in by_group.items():
+            self.assertEqual(group_counts, np.histogram(self.values[groups == group], edges)[0].tolist())
+
+    def test_empty_column(self):
+        edges = bin_edges(np.array([]), 10)
+
+        self.assertEqual(bin_counts(np.array([]), edges)[0], [0])
+
+
+class HistogramEndpointTests(DatasetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        response = self.upload(make_csv(1000))
+        self.url = f"/api/datasets/{response.json()['id']}/histogram/"
+        self.df = make_frame(1000)
+
+    def test_histogram_by_type(self):
+        response = self.client.get(self.url, {'param': 'pressure', 'bins': 25, 'by': 'type'})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        counts, by_type = np.histogram(self.df['Pressure'], bins=25)[0].tolist(), {}
+        for name, group in self.df.groupby('Type'):
+            by_type[name] = np.histogram(group['Pressure'], data['edges'])[0].tolist()
+        self.assertEqual(data['bins'], 25)
+        self.assertEqual(data['total'], 1000)
+        self.assertEqual(data['counts'], counts)
+        self.assertEqual(data['by_type'], by_type)
+
+    def test_invalid_parameters(self):
+        for params in ({'param': 'name'}, {'rule': 'sturges'}, {'by': 'name'}, {'bins': 0}, {'bins': 501}):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
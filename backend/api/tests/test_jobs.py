@@ -0,0 +1,110 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+
+from api.jobs import (
+    JobHeartbeat, WorkerShutdown, claim_next_job, enqueue_ingest, requeue_running_jobs, worker_loop
+)
+from api.models import Dataset, IngestJob
+
+from .helpers import DatasetTestCase, make_csv
+
+
+@override_settings(INGEST_ASYNC=True, CSV_CHUNK_SIZE=100, CSV_STREAMING_THRESHOLD=0)
+class IngestJobTests(DatasetTestCase):
+    """Queued uploads are claimed, run and requeued by the database-backed queue."""
+
+    def queue_upload(self, content, name='data'):
+        response = self.upload(content, name=name)
+        self.assertEqual(response.status_code, 202, response.content)
+        return IngestJob.objects.get(id=response.json()['id'])
+
+    def test_claim_takes_the_oldest_queued_job(self):
+        first = self.queue_upload(make_csv(10), name='first')
+        second = self.queue_upload(make_csv(10, seed=1), name='second')
+
+        claimed = claim_next_job('worker-a')
+
+        self.assertEqual(claimed.id, first.id)
+        self.assertEqual((claimed.state, claimed.worker), (IngestJob.STATE_RUNNING, 'worker-a'))
+        self.assertIsNotNone(claimed.heartbeat_at)
+        self.assertEqual(claim_next_job('worker-b').id, second.id)
+        self.assertIsNone(claim_next_job('worker-c'))
+
+    def test_only_jobs_past_their_lease_are_requeued(self):
+        for seed in range(3):
+            self.queue_upload(make_csv(10, seed=seed), name=f'data {seed}')
+        live, expired, unknown = (claim_next_job(f'worker-{i}') for i in range(3))
+        IngestJob.objects.filter(pk=expired.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+        IngestJob.objects.filter(pk=unknown.pk).update(heartbeat_at=None)
+
+        self.assertEqual(requeue_running_jobs(), 2)
+
+        states = dict(IngestJob.objects.values_list('id', 'state'))
+        self.assertEqual(states[live.id], IngestJob.STATE_RUNNING)
+        self.assertEqual(states[expired.id], IngestJob.STATE_QUEUED)
+        self.assertEqual(states[unknown.id], IngestJob.STATE_QUEUED)
+        self.assertEqual(claim_next_job('worker-d').id, expired.id)
+
+    def test_worker_ingests_queued_upload(self):
+        job = self.queue_upload(make_csv(1000))
+        version = job.dataset.version
+
+        worker_loop(poll_interval=0, burst=True)
+
+        job.refresh_from_db()
+        self.assertEqual(job.state, IngestJob.STATE_SUCCEEDED)
+        self.assertEqual(job.rows_processed, 1000)
+        self.assertIsNotNone(job.finished_at)
+        dataset = Dataset.objects.get(pk=job.dataset_id)
+        self.assertEqual(dataset.get_equipment_records().count(), 1000)
+        # Bumped once when the rows are in, not after every chunk
+        self.assertEqual(dataset.version, version + 1)
+
+    def test_failed_job_records_the_error_and_drops_the_dataset(self):
+        job = self.queue_upload(b'Equipment Name,Type,Flowrate,Pressure,Temperature\nP-1,Pump,fast,1,2\n')
+
+        worker_loop(poll_interval=0, burst=True)
+
+        job.refresh_from_db()
+        self.assertEqual(job.state, IngestJob.STATE_FAILED)
+        self.assertIn('No valid data rows', job.error)
+        self.assertIsNone(job.dataset_id)
+        self.assertEqual(Dataset.objects.count(), 0)
+
+    def test_shutdown_requeues_the_running_job(self):
+        job = self.queue_upload(make_csv(100))
+
+        with mock.patch('api.jobs.ingest_dataset_file', side_effect=WorkerShutdown):
+            worker_loop(poll_interval=0, burst=True)
+
+        job.refresh_from_db()
+        self.assertEqual((job.state, job.worker), (IngestJob.STATE_QUEUED, ''))
+        self.assertTrue(Dataset.objects.filter(pk=job.dataset_id).exists())
+
+        worker_loop(poll_interval=0, burst=True)
+
+        job.refresh_from_db()
+        self.assertEqual(job.state, IngestJob.STATE_SUCCEEDED)
+
+
+class JobHeartbeatTests(TransactionTestCase):
+    """The heartbeat thread renews the lease while the job runs."""
+
+    def test_heartbeat_is_renewed_until_stopped(self):
+        user = User.objects.create_user('tester')
+        job = enqueue_ingest(Dataset.objects.create(name='data', file='data.csv', uploaded_by=user), user)
+        started = timezone.now() - timedelta(hours=1)
+        IngestJob.objects.filter(pk=job.pk).update(state=IngestJob.STATE_RUNNING, heartbeat_at=started)
+
+        heartbeat = JobHeartbeat(job.pk, interval=0.01)
+        heartbeat.start()
+        heartbeat._stopped.wait(0.2)
+        heartbeat.stop()
+
+        job.refresh_from_db()
+        self.assertGreater(job.heartbeat_at, started)
+        self.assertFalse(heartbeat.is_alive())
@@ -0,0 +1,85 @@
+import base64
+import json
+
+from api.models import Dataset
+
+from .helpers import DatasetTestCase, make_csv
+
+
+def encode_cursor(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+class KeysetPaginationTests(DatasetTestCase):
+    """Following `next` visits every matching record exactly once, in order."""
+
+    ORDER_FIELDS = {
+        'name': 'equipment_name',
+        'type': 'equipment_type',
+        'flowrate': 'flowrate',
+        'pressure': 'pressure',
+        'temperature': 'temperature',
+    }
+
+    def setUp(self):
+        super().setUp()
+        # Rounded values, so every sort field has ties for id to break
+        response = self.upload(make_csv(500))
+        self.dataset = Dataset.objects.get(id=response.json()['id'])
+        self.url = f'/api/datasets/{self.dataset.id}/equipment/'
+
+    def fetch_all(self, query):
+        rows = []
+        url = f'{self.url}?{query}&page_size=37'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            page = response.json()
+            self.assertLessEqual(len(page['results']), 37)
+            rows.extend(page['results'])
+            url = page['next']
+        return rows
+
+    def test_pages_cover_every_row_in_each_ordering(self):
+        records = self.dataset.get_equipment_records()
+        for ordering, field in self.ORDER_FIELDS.items():
+            for prefix in ('', '-'):
+                with self.subTest(ordering=prefix + ordering):
+                    ids = [row['id'] for row in self.fetch_all(f'ordering={prefix}{ordering}')]
+                    expected = list(records.order_by(f'{prefix}{field}', f'{prefix}id').values_list('id', flat=True))
+                    self.assertEqual(ids, expected)
+
+    def test_pages_of_a_filtered_query(self):
+        rows = self.fetch_all('type=Pump,Valve&flowrate_min=100&ordering=-flowrate')
+
+        expected = self.dataset.get_equipment_records().filter(
+            equipment_type__in=['Pump', 'Valve'], flowrate__gte=100
+        ).order_by('-flowrate', '-id')
+        self.assertEqual([row['id'] for row in rows], list(expected.values_list('id', flat=True)))
+
+    def test_malformed_cursors_are_not_found(self):
+        cursors = {
+            'name': ['not base64 json', encode_cursor(['name', 'x', 1])],
+            'flowrate': [
+                encode_cursor(['flowrate', 'abc', 1]),
+                encode_cursor(['flowrate', None, 1]),
+                encode_cursor(['flowrate', True, 1]),
+                encode_cursor(['flowrate', 100.5, 'x']),
+            ],
+            'pressure': [encode_cursor(['pressure', 1.0])],
+        }
+        cursors['name'].append(encode_cursor(['equipment_name', 'E1', 'x']))
+        cursors['name'].append(encode_cursor(['equipment_name', 5, 1]))
+
+        for ordering, values in cursors.items():
+            for cursor in values:
+                with self.subTest(ordering=ordering, cursor=cursor):
+                    response = self.client.get(self.url, {'ordering': ordering, 'cursor': cursor})
+                    self.assertEqual(response.status_code, 404)
+
+    def test_cursor_of_another_ordering_is_refused(self):
+        next_url = self.client.get(self.url, {'ordering': 'flowrate', 'page_size': 10}).json()['next']
+        cursor = next_url.split('cursor=')[1].split('&')[0]
+
+        response = self.client.get(self.url, {'ordering': '-flowrate', 'cursor': cursor})
+        self.assertEqual(response.status_code, 404)
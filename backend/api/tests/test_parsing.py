@@ -0,0 +1,108 @@
+import io
+import os
+import tempfile
+
+import pandas as pd
+from django.core.files import File
+from django.test import SimpleTestCase, override_settings
+
+from api.analytics import RunningAnalytics, calculate_analytics
+from api.parallel_parse import QuotedFieldsError, iter_partitions, parse_csv_path_parallel
+from api.parsing import CSV_PARSE_ENGINES, iter_csv_chunks, parse_csv_file
+
+from .helpers import make_frame
+
+
+@override_settings(CSV_PARSE_WORKERS=1)
+class ParallelParseTests(SimpleTestCase):
+    """The byte-range parallel parser must reproduce the serial parse."""
+
+    def setUp(self):
+        df = make_frame(5000).astype({'Flowrate': object, 'Pressure': object})
+        # Rows the validation drops: a missing name and non-numeric values
+        df.loc[10, 'Equipment Name'] = None
+        df.loc[1234, 'Flowrate'] = 'n/a'
+        df.loc[4321, 'Pressure'] = ''
+
+        handle, self.path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'w') as f:
+            df.to_csv(f, index=False)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def parse_serial(self):
+        with open(self.path, 'rb') as f:
+            return parse_csv_file(File(f, name='data.csv'))
+
+    def test_parallel_parse_equals_serial(self):
+        serial = self.parse_serial()
+        parallel = parse_csv_path_parallel(self.path, workers=2, partition_size=8192)
+
+        self.assertEqual(len(serial), 4997)
+        pd.testing.assert_frame_equal(parallel, serial)
+
+    def test_partitions_equal_serial_chunks(self):
+        with open(self.path, 'rb') as f:
+            chunks = pd.concat(list(iter_csv_chunks(File(f, name='data.csv'), chunksize=700)))
+        partitions = list(iter_partitions(self.path, workers=2, partition_size=8192))
+
+        self.assertGreater(len(partitions), 2)
+        pd.testing.assert_frame_equal(
+            pd.concat(partitions).astype({'Type': str}), chunks.astype({'Type': str})
+        )
+
+    def test_partition_analytics_merge_to_serial_analytics(self):
+        running = RunningAnalytics()
+        for partition in iter_partitions(self.path, workers=2, partition_size=8192):
+            running.merge(partition.attrs['analytics'])
+
+        merged = running.result()
+        expected = calculate_analytics(self.parse_serial())
+        self.assertEqual(merged['equipment_types'], expected['equipment_types'])
+        for key in expected:
+            if key != 'equipment_types':
+                self.assertAlmostEqual(merged[key], expected[key], places=9)
+
+    def test_quoted_fields_are_refused(self):
+        with open(self.path, 'a') as f:
+            f.write('"Quoted, name",Pump,1,2,3\n')
+
+        with self.assertRaises(QuotedFieldsError):
+            iter_partitions(self.path, workers=2)
+
+
+class ParseEngineTests(SimpleTestCase):
+    """The C and pyarrow engines keep the same rows of the same file."""
+
+    def setUp(self):
+        df = make_frame(300).astype(object)
+        # Missing-value spellings of pandas, including ones pyarrow lacks
+        for row, value in enumerate(['None', '<NA>', 'NULL', 'n/a', 'NaN', '', '#N/A', 'null']):
+            df.loc[row * 2, 'Equipment Name'] = value
+            df.loc[row * 2 + 1, 'Type'] = value
+        # Numbers pyarrow can read, so that the pyarrow engine parses the file
+        df.loc[200, 'Temperature'] = ''
+        df.loc[201, 'Pressure'] = 'NaN'
+        df.loc[100, 'Equipment Name'] = 'Nonesuch'
+        self.content = df.to_csv(index=False).encode()
+
+    def parse(self, engine):
+        with override_settings(CSV_PARSE_ENGINE=engine):
+            return parse_csv_file(File(io.BytesIO(self.content), name='data.csv'))
+
+    def test_engines_keep_the_same_rows(self):
+        c, arrow = (self.parse(engine) for engine in CSV_PARSE_ENGINES)
+
+        self.assertEqual(len(c), 300 - 18)
+        pd.testing.assert_frame_equal(arrow, c)
+
+    def test_whole_and_chunked_parses_agree(self):
+        chunks = pd.concat(
+            list(iter_csv_chunks(File(io.BytesIO(self.content), name='data.csv'), chunksize=50)),
+            ignore_index=True
+        )
+
+        pd.testing.assert_frame_equal(
+            self.parse('pyarrow').reset_index(drop=True).astype({'Type': str}), chunks.astype({'Type': str})
+        )
@@ -0,0 +1,169 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from api.models import Dataset, UploadSession
+
+from .helpers import DatasetTestCase, make_csv
+
+
+class ResumableUploadTests(DatasetTestCase):
+    """The chunked upload protocol of /api/uploads/."""
+
+    def setUp(self):
+        super().setUp()
+        spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool_dir, ignore_errors=True)
+        self.spool_dir = Path(spool_dir)
+        spool_override = override_settings(UPLOAD_SPOOL_DIR=self.spool_dir)
+        spool_override.enable()
+        self.addCleanup(spool_override.disable)
+
+        self.content = make_csv(300)
+
+    def start(self, content, **fields):
+        response = self.client.post('/api/uploads/', {
+            'name': 'chunked', 'filename': 'data.csv', 'size': len(content), **fields
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.json()['id']
+
+    def send(self, upload_id, content, start, end, total=None):
+        """PUT content[start:end] with its Content-Range header."""
+        total = len(content) if total is None else total
+        return self.client.put(
+            f'/api/uploads/{upload_id}/', content[start:end],
+            content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{end - 1}/{total}'
+        )
+
+    def finalize(self, upload_id, checksum):
+        return self.client.post(f'/api/uploads/{upload_id}/finalize/', {'checksum': checksum}, format='json')
+
+    def test_out_of_order_ranges(self):
+        upload_id = self.start(self.content)
+        size = len(self.content)
+        bounds = [0, size // 3, 2 * size // 3, size]
+
+        response = self.send(upload_id, self.content, bounds[2], bounds[3])
+        self.assertEqual(response.json()['offset'], 0)
+        response = self.send(upload_id, self.content, bounds[0], bounds[1])
+        self.assertEqual(response.json()['offset'], bounds[1])
+        self.assertEqual(response.json()['received'], [[0, bounds[1]], [bounds[2], size]])
+        response = self.send(upload_id, self.content, bounds[1], bounds[2])
+        self.assertEqual(response['Upload-Offset'], str(size))
+
+        response = self.finalize(upload_id, hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Dataset.objects.get(id=response.json()['id']).total_equipment, 300)
+        session = UploadSession.objects.get(id=upload_id)
+        self.assertIsNotNone(session.completed_at)
+        self.assertFalse(os.path.exists(session.spool_path))
+
+    def test_incomplete_upload(self):
+        upload_id = self.start(self.content)
+        self.send(upload_id, self.content, 0, 100)
+
+        response = self.finalize(upload_id, hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 100)
+
+    def test_wrong_checksum(self):
+        upload_id = self.start(self.content)
+        self.send(upload_id, self.content, 0, len(self.content))
+
+        response = self.finalize(upload_id, hashlib.sha256(b'other').hexdigest())
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'Checksum mismatch')
+        self.assertFalse(Dataset.objects.exists())
+
+        # The spool survives for a retry with the right checksum
+        response = self.finalize(upload_id, hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(response.status_code, 201)
+
+    def test_malformed_checksum(self):
+        upload_id = self.start(self.content)
+        self.send(upload_id, self.content, 0, len(self.content))
+
+        for checksum in [12345, ['a' * 64], 'z' * 64, 'abc']:
+            response = self.finalize(upload_id, checksum)
+            self.assertEqual(response.status_code, 400, checksum)
+        self.assertIsNone(UploadSession.objects.get(id=upload_id).completed_at)
+
+    def test_content_range_mismatch(self):
+        upload_id = self.start(self.content)
+        size = len(self.content)
+
+        # Wrong total, beyond the end, malformed and body shorter than the range
+        self.assertEqual(self.send(upload_id, self.content, 0, 100, total=size + 1).status_code, 400)
+        self.assertEqual(self.send(upload_id, self.content + b'x', size - 10, size + 1).status_code, 400)
+        response = self.client.put(
+            f'/api/uploads/{upload_id}/', self.content[:100],
+            content_type='application/octet-stream', HTTP_CONTENT_RANGE='bytes 0-99'
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.put(
+            f'/api/uploads/{upload_id}/', self.content[:50],
+            content_type='application/octet-stream', HTTP_CONTENT_RANGE=f'bytes 0-99/{size}'
+        )
+        self.assertEqual(response.status_code, 400)
+
+        # Rejected chunks are not recorded
+        self.assertEqual(self.client.get(f'/api/uploads/{upload_id}/').json()['received'], [])
+
+    def test_second_finalize(self):
+        checksum = hashlib.sha256(self.content).hexdigest()
+        upload_id = self.start(self.content, checksum=checksum)
+        self.send(upload_id, self.content, 0, len(self.content))
+
+        self.assertEqual(self.client.post(f'/api/uploads/{upload_id}/finalize/').status_code, 201)
+        response = self.client.post(f'/api/uploads/{upload_id}/finalize/')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Dataset.objects.count(), 1)
+
+        # Nor are more chunks accepted
+        self.assertEqual(self.send(upload_id, self.content, 0, 10).status_code, 409)
+
+    @override_settings(UPLOAD_MAX_SIZE=1000)
+    def test_size_limit(self):
+        response = self.client.post('/api/uploads/', {
+            'name': 'chunked', 'filename': 'data.csv', 'size': 1001
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('size', response.json())
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertEqual(list(self.spool_dir.iterdir()), [])
+
+    @override_settings(UPLOAD_SESSION_EXPIRY=3600)
+    def test_stale_sessions_expire(self):
+        stale_id, finished_id, fresh_id = (self.start(self.content) for _ in range(3))
+        UploadSession.objects.filter(id__in=[stale_id, finished_id]).update(
+            created_at=timezone.now() - timedelta(hours=2)
+        )
+        UploadSession.objects.filter(id=finished_id).update(completed_at=timezone.now())
+        stale = UploadSession.objects.get(id=stale_id)
+        self.send(stale_id, self.content, 0, 100)
+
+        call_command('expire_upload_sessions', stdout=io.StringIO())
+        remaining = UploadSession.objects.values_list('id', flat=True)
+        self.assertEqual({str(upload_id) for upload_id in remaining}, {finished_id, fresh_id})
+        self.assertFalse(os.path.exists(stale.spool_path))
+        self.assertEqual(self.client.get(f'/api/uploads/{stale_id}/').status_code, 404)
+
+    @override_settings(UPLOAD_SESSION_EXPIRY=3600)
+    def test_start_sweeps_stale_sessions(self):
+        stale_id = self.start(self.content)
+        UploadSession.objects.filter(id=stale_id).update(created_at=timezone.now() - timedelta(hours=2))
+        stale = UploadSession.objects.get(id=stale_id)
+
+        self.start(self.content)
+        self.assertFalse(UploadSession.objects.filter(id=stale_id).exists())
+        self.assertFalse(os.path.exists(stale.spool_path))
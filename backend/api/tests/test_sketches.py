@@ -0,0 +1,73 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from api.sketches import DatasetSketches, Histogram, Moments, TDigest
+
+from .helpers import make_frame
+
+
+class SketchMergeTests(SimpleTestCase):
+    """Sketches merged from chunks must agree with the statistics of all rows."""
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        # Long-tailed, so tail quantiles are sensitive to centroid sizes
+        self.values = rng.lognormal(mean=3.0, sigma=1.0, size=100_000)
+        self.chunks = np.array_split(self.values, 37)
+
+    def test_merged_moments_match_numpy(self):
+        moments = Moments()
+        for chunk in self.chunks:
+            part = Moments()
+            part.update(chunk)
+            moments.merge(part)
+
+        self.assertEqual(moments.count, len(self.values))
+        self.assertAlmostEqual(moments.mean, self.values.mean(), delta=1e-9 * self.values.mean())
+        self.assertAlmostEqual(moments.variance, self.values.var(ddof=1), delta=1e-9 * self.values.var())
+        self.assertEqual(moments.min, self.values.min())
+        self.assertEqual(moments.max, self.values.max())
+
+    def test_merged_tdigest_quantiles_are_accurate(self):
+        digest = TDigest(compression=200)
+        for chunk in self.chunks:
+            part = TDigest(compression=200)
+            part.update(chunk)
+            digest.merge(part)
+
+        self.assertEqual(digest.total_weight, len(self.values))
+        self.assertLessEqual(len(digest.means), 200)
+
+        ordered = np.sort(self.values)
+        for q in (0.01, 0.25, 0.5, 0.75, 0.95, 0.99, 0.999):
+            estimate = digest.quantile(q, ordered[0], ordered[-1])
+            # Rank error: the fraction of values between estimate and truth
+            rank = np.searchsorted(ordered, estimate) / len(ordered)
+            self.assertLess(abs(rank - q), 0.002, q)
+
+    def test_merged_histogram_counts_every_value(self):
+        histogram = Histogram(width=1.0)
+        for chunk in self.chunks:
+            part = Histogram(width=1.0)
+            part.update(chunk)
+            histogram.merge(part)
+
+        bins = histogram.bins()
+        self.assertEqual(sum(count for _, _, count in bins), len(self.values))
+        self.assertLessEqual(bins[0][0], self.values.min())
+        self.assertGreaterEqual(bins[-1][1], self.values.max())
+
+    def test_dataset_sketches_survive_storage(self):
+        df = make_frame(5000)
+        sketches = DatasetSketches()
+        for start in range(0, len(df), 1000):
+            sketches.update(df.iloc[start:start + 1000])
+
+        stored = DatasetSketches.from_dict(sketches.to_dict())
+
+        self.assertEqual(stored.statistics(), sketches.statistics())
+        stats = stored.statistics()['flowrate']
+        self.assertEqual(stats['count'], len(df))
+        self.assertAlmostEqual(stats['mean'], df['Flowrate'].mean(), places=9)
+        self.assertAlmostEqual(stats['std'], df['Flowrate'].std(), places=9)
+        self.assertAlmostEqual(stats['p50'], df['Flowrate'].median(), delta=1.0)
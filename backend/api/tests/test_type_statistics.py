@@ -0,0 +1,69 @@
+from api.analytics import RunningAnalytics, calculate_type_statistics
+from api.models import Dataset, DatasetSummary
+from api.parsing import NUMERIC_COLUMNS
+
+from .helpers import DatasetTestCase, make_csv, make_frame
+
+
+class TypeStatisticsTests(DatasetTestCase):
+    """Per-type statistics folded chunk by chunk equal those of the whole frame."""
+
+    def assert_same_statistics(self, statistics, expected):
+        self.assertEqual([row['type'] for row in statistics], [row['type'] for row in expected])
+        for row, expected_row in zip(statistics, expected):
+            self.assertEqual(row['count'], expected_row['count'])
+            for col in NUMERIC_COLUMNS:
+                for key, value in expected_row[col.lower()].items():
+                    self.assertAlmostEqual(row[col.lower()][key], value, places=9)
+
+    def test_whole_frame_matches_pandas_groupby(self):
+        df = make_frame(2000)
+
+        statistics = calculate_type_statistics(df)
+
+        groups = df.groupby('Type')
+        counts = groups.size()
+        self.assertEqual(
+            [row['type'] for row in statistics],
+            counts.sort_index().sort_values(ascending=False, kind='stable').index.tolist()
+        )
+        for row in statistics:
+            group = groups.get_group(row['type'])
+            self.assertEqual(row['count'], len(group))
+            for col in NUMERIC_COLUMNS:
+                stats = row[col.lower()]
+                self.assertAlmostEqual(stats['mean'], group[col].mean(), places=9)
+                self.assertAlmostEqual(stats['std'], group[col].std(), places=9)
+                self.assertEqual(stats['min'], group[col].min())
+                self.assertEqual(stats['max'], group[col].max())
+
+    def test_chunks_merge_to_the_whole_frame(self):
+        df = make_frame(2000)
+        running = RunningAnalytics()
+        # Uneven chunks, some with a single row of a type
+        for start, end in zip([0, 1, 7, 300, 1200], [1, 7, 300, 1200, 2000]):
+            running.update(df.iloc[start:end])
+
+        self.assert_same_statistics(running.type_statistics(), calculate_type_statistics(df))
+
+    def test_single_row_type_has_zero_std(self):
+        df = make_frame(50)
+        df.loc[0, 'Type'] = 'Mixer'
+
+        mixer = next(row for row in calculate_type_statistics(df) if row['type'] == 'Mixer')
+
+        self.assertEqual(mixer['count'], 1)
+        self.assertEqual(mixer['flowrate']['std'], 0.0)
+
+    def test_endpoint_serves_stored_and_recomputed_statistics(self):
+        response = self.upload(make_csv(500))
+        dataset = Dataset.objects.get(id=response.json()['id'])
+        url = f'/api/datasets/{dataset.id}/analytics/by-type/'
+        expected = calculate_type_statistics(make_frame(500))
+
+        stored = self.client.get(url).json()['equipment_types']
+        DatasetSummary.objects.filter(dataset=dataset).delete()
+        recomputed = self.client.get(url).json()['equipment_types']
+
+        self.assert_same_statistics(stored, expected)
+        self.assert_same_statistics(recomputed, expected)
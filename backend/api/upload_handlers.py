@@ -0,0 +1,40 @@
+"""
+Upload handlers that hash file content while it streams in.
+
+They replace Django's default memory and temporary-file handlers (see
+FILE_UPLOAD_HANDLERS in settings) and attach the SHA-256 hex digest of each
+uploaded file as `content_hash`, so duplicate uploads can be recognised
+without reading the file a second time.
+"""
+import hashlib
+
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+
+
+class ContentHashMixin:
+
+    def new_file(self, *args, **kwargs):
+        # Set up first: MemoryFileUploadHandler.new_file raises StopFutureHandlers
+        self.sha256 = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        # An inactive memory handler passes the data on to the next handler,
+        # which does the hashing instead
+        if getattr(self, 'activated', True):
+            self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file_obj = super().file_complete(file_size)
+        if file_obj is not None:
+            file_obj.content_hash = self.sha256.hexdigest()
+        return file_obj
+
+
+class HashingMemoryFileUploadHandler(ContentHashMixin, MemoryFileUploadHandler):
+    """MemoryFileUploadHandler that records the SHA-256 of small uploads"""
+
+
+class HashingTemporaryFileUploadHandler(ContentHashMixin, TemporaryFileUploadHandler):
+    """TemporaryFileUploadHandler that records the SHA-256 of large uploads"""
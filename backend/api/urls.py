@@ -1,12 +1,18 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import DatasetViewSet, UploadViewSet, create_superuser
+from .views import (
+    DatasetViewSet, UploadViewSet, IngestJobViewSet,
+    ResumableUploadViewSet, column_cache_stats, create_superuser
+)
 
 router = DefaultRouter()
 router.register(r'datasets', DatasetViewSet, basename='dataset')
 router.register(r'upload', UploadViewSet, basename='upload')
+router.register(r'jobs', IngestJobViewSet, basename='job')
+router.register(r'uploads', ResumableUploadViewSet, basename='resumable-upload')
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('cache/columns/', column_cache_stats, name='column-cache-stats'),
     path('create-superuser/', create_superuser, name='create-superuser'),
 ]
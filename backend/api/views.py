@@ -1,32 +1,104 @@
 from rest_framework import viewsets, status
-from rest_framework.decorators import action
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from django.http import FileResponse
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.reverse import reverse
+from rest_framework.settings import api_settings
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.http import quote_etag
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from functools import reduce
+from operator import or_
+import hashlib
 import os
 
-from .models import Dataset, EquipmentData
+from .models import Dataset, EquipmentData, IngestJob, UploadSession, UploadChunk
 from .serializers import (
     DatasetSerializer, DatasetDetailSerializer, 
     DatasetUploadSerializer, EquipmentDataSerializer,
-    AnalyticsSerializer
+    AnalyticsSerializer, IngestJobSerializer, UploadSessionSerializer,
+    EquipmentAnomalySerializer
+)
+from .parsing import NUMERIC_COLUMNS, parse_csv_file, should_stream_csv
+from .analytics import compare_analytics
+from .ingest import (
+    ingest_dataset_file, save_dataset_to_db, get_content_hash,
+    find_duplicate_dataset, create_duplicate_dataset
+)
+from .summaries import (
+    get_dataset_analytics, get_dataset_sketches, get_dataset_type_statistics,
+    get_datasets_analytics, get_dataset_correlation, get_dataset_scatter, get_dataset_histogram
+)
+from .sketches import DatasetSketches
+from .anomalies import ANOMALY_METHODS, anomaly_flag
+from .histogram import BIN_RULES
+from .jobs import enqueue_ingest
+from .resumable import (
+    parse_content_range, create_spool_file, write_chunk,
+    file_sha256, is_sha256_hex, delete_spool_file, delete_stale_sessions, SpooledUpload
 )
-from .utils import parse_csv_file, save_dataset_to_db, get_dataset_analytics
 from .pdf_generator import generate_pdf_report
+from .conditional import ConditionalGetMixin
+from .pagination import KeysetPagination
+from .renderers import EXPORT_RENDERER_CLASSES
+from .column_cache import column_cache
+from .shared_cache import get_or_compute
+
+
+# Quantiles reported by the statistics endpoints unless ?quantiles= is given
+DEFAULT_QUANTILES = [0.5, 0.95, 0.99]
+
+# Limits of the scatter endpoint's ?max_points= and ?bins=
+SCATTER_MAX_POINTS = 20000
+SCATTER_MAX_BINS = 200
+
+# Limit of the histogram endpoint's ?bins= (and of the bins chosen by ?rule=fd)
+HISTOGRAM_MAX_BINS = 500
+
+# Numeric parameters accepted by the chart endpoints, by query value
+PARAMETER_COLUMNS = {column.lower(): column for column in NUMERIC_COLUMNS}
+
+# Rows fetched per database round trip when streaming an export
+EXPORT_CHUNK_SIZE = 2000
+
+# Sort fields of the equipment endpoint's ?ordering= (each has an index)
+EQUIPMENT_ORDERING = {
+    'name': 'equipment_name',
+    'type': 'equipment_type',
+    'flowrate': 'flowrate',
+    'pressure': 'pressure',
+    'temperature': 'temperature',
+}
 
 
-class DatasetViewSet(viewsets.ModelViewSet):
+class DatasetViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing datasets.
     
+    GET responses carry a strong ETag built from the dataset ID and
+    version (plus Last-Modified for single datasets); matching
+    If-None-Match / If-Modified-Since requests get 304 Not Modified.
+    
     Endpoints:
     - GET /api/datasets/ - List all datasets
     - POST /api/datasets/ - Create new dataset (not used, use upload instead)
     - GET /api/datasets/{id}/ - Retrieve dataset details
     - DELETE /api/datasets/{id}/ - Delete dataset
     - GET /api/datasets/{id}/analytics/ - Get analytics for dataset
+    - GET /api/datasets/{id}/analytics/by-type/ - Statistics per equipment type
+    - GET /api/datasets/{id}/correlation/ - Correlation matrices and line fits
+    - GET /api/datasets/{id}/anomalies/ - Rows flagged as outliers at ingest
+    - GET /api/datasets/{id}/scatter/ - Downsampled or binned scatter data
+    - GET /api/datasets/{id}/histogram/ - Histogram of one parameter
     - GET /api/datasets/{id}/download-report/ - Download PDF report
+    - GET /api/datasets/{id}/equipment/ - Equipment records, filtered, sorted and paged
+    - GET /api/datasets/{id}/statistics/ - Std-dev, quantiles and histograms
+    - GET /api/datasets/statistics/?ids=1,2 - The same for several datasets combined
+    - GET /api/datasets/compare/?ids=1,2 - Side-by-side analytics and deltas
     """
     queryset = Dataset.objects.all()
     permission_classes = [IsAuthenticated]
@@ -40,6 +112,96 @@ class DatasetViewSet(viewsets.ModelViewSet):
         """Return datasets ordered by upload date (newest first)"""
         return Dataset.objects.all().order_by('-uploaded_at')
     
+    def get_validators(self):
+        """
+        Return (ETag, Last-Modified) for the datasets read by this request.
+        
+        Single datasets get "<id>-<version>-<format>"; the list and the
+        multi-dataset endpoints (?ids=) get a hash of the IDs and versions
+        involved, and no Last-Modified since deletions do not advance it.
+        Only the Dataset table is queried.
+        
+        Returns:
+            tuple or None: None if the datasets cannot be determined (the
+            view then answers as usual, e.g. with 404)
+        """
+        renderer_format = self.request.accepted_renderer.format
+        try:
+            if 'pk' in self.kwargs:
+                row = Dataset.objects.filter(pk=self.kwargs['pk']).values_list(
+                    'id', 'version', 'modified_at'
+                ).first()
+                if row is None:
+                    return None
+                dataset_id, version, modified_at = row
+                return quote_etag(f'{dataset_id}-{version}-{renderer_format}'), modified_at
+            
+            datasets = self.get_queryset()
+            if self.action != 'list':
+                ids = [int(value) for value in self.request.query_params.get('ids', '').split(',') if value]
+                if not ids:
+                    return None
+                datasets = datasets.filter(id__in=ids)
+            versions = list(datasets.order_by('id').values_list('id', 'version'))
+        except (TypeError, ValueError):
+            return None
+        
+        digest = hashlib.sha1(repr((self.action, renderer_format, versions)).encode()).hexdigest()
+        return quote_etag(digest[:32]), None
+    
+    def cached_response(self, dataset, name, parts, build):
+        """
+        Respond with build()'s data, rendered once per dataset version.
+        
+        The rendered body is kept in the shared cache, so other worker
+        processes answer the same request without recomputing or
+        re-serializing anything. The browsable API is rendered as usual.
+        
+        Args:
+            dataset: Dataset the data belongs to
+            name: Kind of payload, part of the cache key
+            parts: Tuple of request parameters the data depends on
+            build: Function returning the response data, or None on failure
+            
+        Returns:
+            HttpResponse or Response, or None if build() returned None
+        """
+        renderer = self.request.accepted_renderer
+        if renderer.format == 'api':
+            data = build()
+            return None if data is None else Response(data)
+        
+        media_type = self.request.accepted_media_type
+        
+        def render():
+            data = build()
+            if data is None:
+                return None
+            return renderer.render(data, media_type, self.get_renderer_context())
+        
+        body = get_or_compute(dataset, f'body:{name}', (media_type, *parts), render)
+        if body is None:
+            return None
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        return HttpResponse(body, content_type=content_type)
+    
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Get a dataset with its analytics and a link to its equipment records.
+        
+        GET /api/datasets/{id}/
+        
+        Records are paged through the equipment action.
+        """
+        dataset = self.get_object()
+        # File URLs are absolute, so the body depends on the host
+        return self.cached_response(
+            dataset, 'detail', (request.build_absolute_uri('/'),),
+            lambda: self.get_serializer(dataset).data
+        )
+    
     @action(detail=True, methods=['get'])
     def analytics(self, request, pk=None):
         """
@@ -48,16 +210,329 @@ class DatasetViewSet(viewsets.ModelViewSet):
         GET /api/datasets/{id}/analytics/
         """
         dataset = self.get_object()
-        analytics_data = get_dataset_analytics(dataset.id)
         
-        if analytics_data is None:
+        def build():
+            analytics_data = get_dataset_analytics(dataset.id)
+            if analytics_data is None:
+                return None
+            return AnalyticsSerializer(analytics_data).data
+        
+        response = self.cached_response(dataset, 'analytics', (), build)
+        if response is None:
             return Response(
                 {'error': 'Unable to calculate analytics'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+        return response
+    
+    @action(detail=True, methods=['get'], url_path='analytics/by-type')
+    def analytics_by_type(self, request, pk=None):
+        """
+        Get count and mean, std, min and max of each parameter per equipment type.
+        
+        Computed at ingest with one groupby pass per chunk and stored in
+        the dataset's summary.
+        
+        GET /api/datasets/{id}/analytics/by-type/
+        """
+        dataset = self.get_object()
+        return self.cached_response(dataset, 'analytics-by-type', (), lambda: {
+            'dataset': dataset.id,
+            'equipment_types': get_dataset_type_statistics(dataset),
+        })
+    
+    @action(detail=True, methods=['get'])
+    def correlation(self, request, pk=None):
+        """
+        Get Pearson and Spearman correlation matrices of flowrate, pressure
+        and temperature, and least-squares fits per parameter pair (overall
+        and per equipment type).
+        
+        Computed on the first request and cached with the dataset's summary.
+        
+        GET /api/datasets/{id}/correlation/
+        """
+        dataset = self.get_object()
+        return self.cached_response(dataset, 'correlation', (), lambda: {
+            'dataset': dataset.id,
+            **get_dataset_correlation(dataset),
+        })
+    
+    @action(detail=True, methods=['get'])
+    def anomalies(self, request, pk=None):
+        """
+        Get a page of the rows flagged as outliers at ingest, in stored order.
+        
+        Optional filters: ?method=zscore|iqr|mad and
+        ?parameter=flowrate|pressure|temperature (comma-separated lists).
+        Pages are fetched by keyset like the equipment records: follow
+        `next` for the following page, and choose the size with
+        ?page_size= (up to 1000).
+        
+        GET /api/datasets/{id}/anomalies/?method=mad&parameter=pressure
+        """
+        dataset = self.get_object()
+        
+        methods = request.query_params.get('method')
+        methods = methods.split(',') if methods else ANOMALY_METHODS
+        parameters = request.query_params.get('parameter')
+        parameters = parameters.split(',') if parameters else list(PARAMETER_COLUMNS)
+        
+        unknown = [m for m in methods if m not in ANOMALY_METHODS] + [p for p in parameters if p not in PARAMETER_COLUMNS]
+        if unknown:
+            return Response(
+                {'error': f"Unknown method or parameter: {', '.join(unknown)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        anomalies = dataset.get_anomalies().order_by('row', 'id')
+        if 'method' in request.query_params or 'parameter' in request.query_params:
+            # OR, so that a method or parameter given twice sets its bit once
+            mask = reduce(or_, (anomaly_flag(method, PARAMETER_COLUMNS[parameter]) for method in methods for parameter in parameters))
+            anomalies = anomalies.alias(matched=F('flags').bitand(mask)).filter(matched__gt=0)
+        
+        paginator = KeysetPagination()
+        rows = paginator.paginate_queryset(
+            anomalies, request, view=self, fields=EquipmentAnomalySerializer.Meta.fields
+        )
+        return Response({
+            'dataset': dataset.id,
+            'next': paginator.get_next_link(),
+            'anomalies': EquipmentAnomalySerializer(rows, many=True).data,
+        })
+    
+    def get_int_param(self, name, default, maximum):
+        """
+        Return a positive integer query parameter.
+        
+        Raises:
+            ValueError: If the value is not an integer between 1 and maximum
+        """
+        value = self.request.query_params.get(name)
+        if value is None:
+            return default
+        try:
+            number = int(value)
+        except ValueError:
+            number = 0
+        if not 1 <= number <= maximum:
+            raise ValueError(f"{name} must be an integer between 1 and {maximum}")
+        return number
+    
+    @action(detail=True, methods=['get'])
+    def scatter(self, request, pk=None):
+        """
+        Get scatter chart data of constant size, however many rows the dataset has.
+        
+        mode=sample (default) returns at most max_points points, stratified
+        over the plot area and keeping the extremes of both axes;
+        mode=density returns row counts in a bins x bins grid. Results are
+        cached per parameter pair.
+        
+        GET /api/datasets/{id}/scatter/?x=flowrate&y=pressure&max_points=2000
+        GET /api/datasets/{id}/scatter/?x=flowrate&y=pressure&mode=density&bins=50
+        """
+        dataset = self.get_object()
+        
+        x = request.query_params.get('x', 'flowrate')
+        y = request.query_params.get('y', 'pressure')
+        mode = request.query_params.get('mode', 'sample')
+        try:
+            if x not in PARAMETER_COLUMNS or y not in PARAMETER_COLUMNS:
+                raise ValueError(f"x and y must be one of: {', '.join(PARAMETER_COLUMNS)}")
+            if mode == 'sample':
+                size = self.get_int_param('max_points', 2000, SCATTER_MAX_POINTS)
+            elif mode == 'density':
+                size = self.get_int_param('bins', 50, SCATTER_MAX_BINS)
+            else:
+                raise ValueError("mode must be 'sample' or 'density'")
+        except ValueError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        data = get_dataset_scatter(dataset, PARAMETER_COLUMNS[x], PARAMETER_COLUMNS[y], mode, size)
+        return Response({
+            'dataset': dataset.id,
+            'x': x,
+            'y': y,
+            'mode': mode,
+            **data,
+        })
+    
+    @action(detail=True, methods=['get'])
+    def histogram(self, request, pk=None):
+        """
+        Get the histogram of one parameter, optionally per equipment type.
+        
+        rule=fixed (default) uses `bins` equal-width bins, rule=quantile
+        `bins` equal-count bins and rule=fd the Freedman-Diaconis width.
+        by=type adds counts per equipment type over the same edges.
+        
+        GET /api/datasets/{id}/histogram/?param=temperature&bins=50&rule=fixed&by=type
+        """
+        dataset = self.get_object()
+        
+        param = request.query_params.get('param', 'temperature')
+        rule = request.query_params.get('rule', 'fixed')
+        by = request.query_params.get('by')
+        try:
+            if param not in PARAMETER_COLUMNS:
+                raise ValueError(f"param must be one of: {', '.join(PARAMETER_COLUMNS)}")
+            if rule not in BIN_RULES:
+                raise ValueError(f"rule must be one of: {', '.join(BIN_RULES)}")
+            if by not in (None, 'type'):
+                raise ValueError("by must be 'type'")
+            bins = self.get_int_param('bins', 50, HISTOGRAM_MAX_BINS)
+        except ValueError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        data = get_dataset_histogram(
+            dataset, PARAMETER_COLUMNS[param], bins, rule,
+            by_type=by == 'type', max_bins=HISTOGRAM_MAX_BINS
+        )
+        return Response({
+            'dataset': dataset.id,
+            'param': param,
+            'rule': rule,
+            'bins': len(data['counts']),
+            **data,
+        })
+    
+    def get_datasets_from_ids(self):
+        """
+        Return the datasets listed in the `ids` query parameter, in that order.
+        
+        Raises:
+            ValueError: If the parameter is missing or malformed
+            Http404: If a dataset does not exist
+        """
+        try:
+            ids = [int(value) for value in self.request.query_params.get('ids', '').split(',') if value]
+        except ValueError:
+            raise ValueError("ids must be a comma-separated list of dataset IDs")
+        if not ids:
+            raise ValueError("The ids query parameter is required")
+        
+        datasets = self.get_queryset().in_bulk(ids)
+        missing = [str(dataset_id) for dataset_id in ids if dataset_id not in datasets]
+        if missing:
+            raise Http404(f"Datasets not found: {', '.join(missing)}")
+        return [datasets[dataset_id] for dataset_id in dict.fromkeys(ids)]
+    
+    def get_quantiles(self):
+        """
+        Return the quantiles requested with `?quantiles=0.5,0.9`.
+        
+        Raises:
+            ValueError: If a value is not a number between 0 and 1
+        """
+        value = self.request.query_params.get('quantiles')
+        if not value:
+            return DEFAULT_QUANTILES
+        try:
+            quantiles = [float(q) for q in value.split(',')]
+        except ValueError:
+            quantiles = None
+        if not quantiles or not all(0 <= q <= 1 for q in quantiles):
+            raise ValueError("quantiles must be comma-separated numbers between 0 and 1")
+        return quantiles
+    
+    @action(detail=True, methods=['get'])
+    def statistics(self, request, pk=None):
+        """
+        Get count, mean, std-dev, min/max, quantiles and histograms per parameter.
+        
+        Served from the sketches stored at ingest, without reading rows.
+        
+        GET /api/datasets/{id}/statistics/?quantiles=0.5,0.95,0.99
+        """
+        dataset = self.get_object()
+        
+        try:
+            quantiles = self.get_quantiles()
+        except ValueError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return self.cached_response(dataset, 'statistics', tuple(quantiles), lambda: {
+            'datasets': [dataset.id],
+            'parameters': get_dataset_sketches(dataset).statistics(quantiles),
+        })
+    
+    @action(detail=False, methods=['get'], url_path='statistics')
+    def merged_statistics(self, request):
+        """
+        Get statistics for several datasets combined.
+        
+        The datasets' sketches are merged; no rows are read.
+        
+        GET /api/datasets/statistics/?ids=1,2,3&quantiles=0.5,0.95,0.99
+        """
+        try:
+            datasets = self.get_datasets_from_ids()
+            quantiles = self.get_quantiles()
+        except ValueError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        sketches = DatasetSketches()
+        for dataset in datasets:
+            sketches.merge(get_dataset_sketches(dataset))
+        
+        return Response({
+            'datasets': [dataset.id for dataset in datasets],
+            'parameters': sketches.statistics(quantiles),
+        })
+    
+    @action(detail=False, methods=['get'])
+    def compare(self, request):
+        """
+        Compare the analytics of several datasets in one request.
+        
+        Analytics come from the stored summaries (one query for all
+        datasets), so the cost grows with the number of datasets rather
+        than their rows. Deltas are relative to the first dataset listed.
+        
+        GET /api/datasets/compare/?ids=1,2,3
+        """
+        try:
+            datasets = self.get_datasets_from_ids()
+        except ValueError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        serializer = AnalyticsSerializer(analytics_data)
-        return Response(serializer.data)
+        analytics = get_datasets_analytics(datasets)
+        baseline = analytics[datasets[0].id]
+        
+        results = []
+        for dataset in datasets:
+            dataset_analytics = analytics[dataset.id]
+            results.append({
+                'id': dataset.id,
+                'name': dataset.name,
+                'uploaded_at': dataset.uploaded_at,
+                'analytics': dataset_analytics,
+                'deltas': (
+                    compare_analytics(baseline, dataset_analytics)
+                    if baseline is not None and dataset_analytics is not None else None
+                ),
+            })
+        
+        return Response({
+            'baseline': datasets[0].id,
+            'datasets': results,
+        })
     
     @action(detail=True, methods=['get'], url_path='download-report')
     def download_report(self, request, pk=None):
@@ -91,17 +566,214 @@ class DatasetViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
-    @action(detail=True, methods=['get'])
+    def filter_equipment(self, records):
+        """
+        Apply the equipment endpoint's query parameters to a queryset.
+        
+        - type: equipment types, comma-separated
+        - name: equipment name prefix (case-sensitive)
+        - flowrate_min, flowrate_max, pressure_min, ... (inclusive bounds)
+        - ordering: name (default), type, flowrate, pressure or
+          temperature, with a leading '-' for descending order
+        
+        Each filter and sort order is backed by an EquipmentData index
+        starting with the dataset.
+        
+        Raises:
+            ValueError: If a parameter is malformed
+        """
+        params = self.request.query_params
+        
+        types = params.get('type')
+        if types:
+            records = records.filter(equipment_type__in=types.split(','))
+        
+        name = params.get('name')
+        if name:
+            records = records.filter(equipment_name__startswith=name)
+        
+        for param in PARAMETER_COLUMNS:
+            for bound, lookup in (('min', 'gte'), ('max', 'lte')):
+                value = params.get(f'{param}_{bound}')
+                if value is None:
+                    continue
+                try:
+                    number = float(value)
+                except ValueError:
+                    raise ValueError(f"{param}_{bound} must be a number")
+                records = records.filter(**{f'{param}__{lookup}': number})
+        
+        ordering = params.get('ordering', 'name')
+        descending = ordering.startswith('-')
+        field = EQUIPMENT_ORDERING.get(ordering.lstrip('-'))
+        if field is None:
+            raise ValueError(
+                f"ordering must be one of: {', '.join(EQUIPMENT_ORDERING)} (prefix '-' to reverse)"
+            )
+        if descending:
+            return records.order_by(f'-{field}', '-id')
+        return records.order_by(field, 'id')
+    
+    def stream_equipment(self, dataset, records, renderer):
+        """
+        Stream all records of a queryset in an export format.
+        
+        Rows are fetched EXPORT_CHUNK_SIZE at a time with a database
+        iterator (a server-side cursor on PostgreSQL) and encoded as they
+        are sent, so memory use does not grow with the dataset and the
+        first bytes go out immediately.
+        
+        Args:
+            dataset: Dataset being exported (for the file name)
+            records: Filtered and ordered EquipmentData queryset
+            renderer: One of renderers.EXPORT_RENDERER_CLASSES
+            
+        Returns:
+            StreamingHttpResponse: The export as an attachment
+        """
+        fields = EquipmentDataSerializer.Meta.fields
+        rows = records.values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        response = StreamingHttpResponse(renderer.stream(fields, rows), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="equipment_{dataset.name}.{renderer.format}"'
+        return response
+    
+    @action(
+        detail=True, methods=['get'],
+        renderer_classes=[*api_settings.DEFAULT_RENDERER_CLASSES, *EXPORT_RENDERER_CLASSES]
+    )
     def equipment(self, request, pk=None):
         """
-        Get all equipment records for a dataset.
+        Get a page of a dataset's equipment records, optionally filtered and sorted.
+        
+        See filter_equipment for the query parameters. Pages are fetched
+        by keyset (see pagination.KeysetPagination): follow `next` for the
+        following page, and choose the size with ?page_size= (up to 1000).
+        Rows are read with values() rather than a model serializer.
         
-        GET /api/datasets/{id}/equipment/
+        The export formats instead stream every matching record (see
+        stream_equipment), chosen with ?format= or the Accept header:
+        ndjson (application/x-ndjson), csv (text/csv), arrow
+        (application/vnd.apache.arrow.stream) and msgpack
+        (application/msgpack). The binary formats are column-oriented; see
+        renderers.py for their layout.
+        
+        GET /api/datasets/{id}/equipment/?type=Pump,Valve&temperature_min=100&ordering=-pressure
+        GET /api/datasets/{id}/equipment/?format=csv
         """
         dataset = self.get_object()
-        equipment_records = dataset.equipment_records.all()
-        serializer = EquipmentDataSerializer(equipment_records, many=True)
-        return Response(serializer.data)
+        try:
+            equipment_records = self.filter_equipment(dataset.get_equipment_records())
+        except ValueError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if isinstance(request.accepted_renderer, tuple(EXPORT_RENDERER_CLASSES)):
+            return self.stream_equipment(dataset, equipment_records, request.accepted_renderer)
+        
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(
+            equipment_records, request, view=self, fields=EquipmentDataSerializer.Meta.fields
+        )
+        return paginator.get_paginated_response(page)
+
+
+def ingest_upload(request, name, csv_file):
+    """
+    Turn a validated CSV upload into a Dataset.
+    
+    Shared by the multipart upload endpoint and resumable upload finalize.
+    A file identical to an already ingested one is not parsed or stored
+    again; the new dataset shares the earlier upload's file and rows.
+    
+    Args:
+        request: The current request (for the uploading user)
+        name: Dataset name
+        csv_file: Django File or UploadedFile with the CSV content
+        
+    Returns:
+        Response: 201 with the dataset, 202 with a queued IngestJob, or an
+        error response
+    """
+    try:
+        content_hash = get_content_hash(csv_file)
+        
+        source = find_duplicate_dataset(content_hash)
+        if source is not None:
+            dataset = create_duplicate_dataset(source, name, request.user)
+            return Response(
+                DatasetDetailSerializer(dataset, context={'request': request}).data,
+                status=status.HTTP_201_CREATED
+            )
+        
+        if settings.INGEST_ASYNC:
+            # Store the file and let an ingest worker process it
+            dataset = Dataset.objects.create(
+                name=name,
+                file=csv_file,
+                uploaded_by=request.user,
+                content_hash=content_hash
+            )
+            job = enqueue_ingest(dataset, request.user)
+            
+            response = Response(
+                IngestJobSerializer(job).data,
+                status=status.HTTP_202_ACCEPTED
+            )
+            response['Location'] = reverse('job-detail', args=[job.id], request=request)
+            return response
+        
+        if should_stream_csv(csv_file):
+            # Large upload: store it first, then parse and insert it
+            # chunk by chunk from the stored copy
+            dataset = Dataset.objects.create(
+                name=name,
+                file=csv_file,
+                uploaded_by=request.user,
+                content_hash=content_hash
+            )
+            
+            try:
+                ingest_dataset_file(dataset)
+            except Exception:
+                dataset.delete()
+                raise
+        else:
+            # Parse CSV file
+            df = parse_csv_file(csv_file)
+            
+            # Create dataset object
+            dataset = Dataset.objects.create(
+                name=name,
+                file=csv_file,
+                uploaded_by=request.user,
+                content_hash=content_hash
+            )
+            
+            # Save data to database
+            save_dataset_to_db(dataset, df)
+        
+        # Return dataset with analytics
+        response_serializer = DatasetDetailSerializer(dataset, context={'request': request})
+        return Response(
+            response_serializer.data,
+            status=status.HTTP_201_CREATED
+        )
+        
+    except ValueError as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    except Exception as e:
+        return Response(
+            {'error': f'Unexpected error: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
 
 
 class UploadViewSet(viewsets.ViewSet):
@@ -124,7 +796,8 @@ class UploadViewSet(viewsets.ViewSet):
         - file: CSV file
         
         Returns:
-        - Dataset object with analytics
+        - Dataset object with analytics (201), or the queued IngestJob
+          (202) when settings.INGEST_ASYNC is enabled
         """
         serializer = DatasetUploadSerializer(data=request.data)
         
@@ -137,37 +810,187 @@ class UploadViewSet(viewsets.ViewSet):
         name = serializer.validated_data['name']
         csv_file = serializer.validated_data['file']
         
-        try:
-            # Parse CSV file
-            df = parse_csv_file(csv_file)
-            
-            # Create dataset object
-            dataset = Dataset.objects.create(
-                name=name,
-                file=csv_file,
-                uploaded_by=request.user
+        return ingest_upload(request, name, csv_file)
+
+
+class IngestJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for background ingest jobs.
+    
+    Endpoints:
+    - GET /api/jobs/ - List your ingest jobs
+    - GET /api/jobs/{id}/ - Job state, rows processed and throughput
+    """
+    serializer_class = IngestJobSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        """Return the requesting user's jobs, newest first"""
+        return IngestJob.objects.filter(created_by=self.request.user).order_by('-created_at')
+
+
+class ResumableUploadViewSet(viewsets.ViewSet):
+    """
+    ViewSet for resumable chunked CSV uploads.
+    
+    Endpoints:
+    - POST /api/uploads/ - Start an upload (name, filename, size, checksum)
+    - PUT /api/uploads/{id}/ - Send a chunk (Content-Range: bytes start-end/size)
+    - GET /api/uploads/{id}/ - Received offset and byte ranges, for resuming
+    - POST /api/uploads/{id}/finalize/ - Verify checksum and ingest the file
+    - DELETE /api/uploads/{id}/ - Abort the upload
+    """
+    permission_classes = [IsAuthenticated]
+    lookup_value_regex = '[0-9a-f-]{36}'
+    
+    def get_session(self, pk, for_update=False):
+        sessions = UploadSession.objects.all()
+        if for_update:
+            sessions = sessions.select_for_update()
+        return get_object_or_404(sessions, pk=pk, created_by=self.request.user)
+    
+    def create(self, request):
+        serializer = UploadSessionSerializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST
             )
-            
-            # Save data to database
-            save_dataset_to_db(dataset, df)
-            
-            # Return dataset with analytics
-            response_serializer = DatasetDetailSerializer(dataset)
+        
+        # Free the spool space of abandoned uploads before allocating more
+        delete_stale_sessions()
+        
+        session = serializer.save(created_by=request.user)
+        create_spool_file(session)
+        
+        response = Response(
+            UploadSessionSerializer(session).data,
+            status=status.HTTP_201_CREATED
+        )
+        response['Location'] = reverse('resumable-upload-detail', args=[session.id], request=request)
+        return response
+    
+    def retrieve(self, request, pk=None):
+        session = self.get_session(pk)
+        data = UploadSessionSerializer(session).data
+        
+        response = Response(data)
+        response['Upload-Offset'] = data['offset']
+        return response
+    
+    def update(self, request, pk=None):
+        session = self.get_session(pk)
+        
+        if session.completed_at:
             return Response(
-                response_serializer.data,
-                status=status.HTTP_201_CREATED
+                {'error': 'Upload is already finalized'},
+                status=status.HTTP_409_CONFLICT
             )
-            
+        
+        try:
+            start, end = parse_content_range(request.META.get('HTTP_CONTENT_RANGE'), session.total_size)
+            if request.stream is None:
+                raise ValueError("Request body is empty")
+            write_chunk(session, request.stream, start, end)
         except ValueError as e:
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        except Exception as e:
-            return Response(
-                {'error': f'Unexpected error: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        
+        UploadChunk.objects.create(session=session, start=start, end=end)
+        
+        offset = session.received_offset()
+        response = Response({'offset': offset, 'received': session.received_ranges()})
+        response['Upload-Offset'] = offset
+        return response
+    
+    def destroy(self, request, pk=None):
+        session = self.get_session(pk)
+        delete_spool_file(session)
+        session.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    
+    @action(detail=True, methods=['post'])
+    def finalize(self, request, pk=None):
+        """
+        Verify the assembled file and hand it to the ingest pipeline.
+        
+        POST /api/uploads/{id}/finalize/
+        
+        Request body (optional):
+        - checksum: SHA-256 hex digest, if not given when starting
+        """
+        # The session row stays locked until the ingest is recorded, so a
+        # concurrent finalize waits and then sees completed_at
+        with transaction.atomic():
+            session = self.get_session(pk, for_update=True)
+            
+            if session.completed_at:
+                return Response(
+                    {'error': 'Upload is already finalized'},
+                    status=status.HTTP_409_CONFLICT
+                )
+            
+            offset = session.received_offset()
+            if offset < session.total_size:
+                return Response(
+                    {'error': 'Upload is incomplete', 'offset': offset},
+                    status=status.HTTP_409_CONFLICT
+                )
+            
+            checksum = request.data.get('checksum') or session.checksum
+            if not checksum:
+                return Response(
+                    {'error': 'A SHA-256 checksum is required'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if not is_sha256_hex(checksum):
+                return Response(
+                    {'error': 'Checksum must be a SHA-256 hex digest'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            checksum = checksum.lower()
+            if not os.path.exists(session.spool_path):
+                return Response(
+                    {'error': 'Upload data is no longer available; start a new upload'},
+                    status=status.HTTP_410_GONE
+                )
+            if file_sha256(session.spool_path) != checksum:
+                return Response(
+                    {'error': 'Checksum mismatch'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            with open(session.spool_path, 'rb') as spool:
+                upload = SpooledUpload(spool, name=session.filename)
+                upload.content_hash = checksum
+                response = ingest_upload(request, session.name, upload)
+            
+            if response.status_code in (status.HTTP_201_CREATED, status.HTTP_202_ACCEPTED):
+                if response.status_code == status.HTTP_201_CREATED:
+                    session.dataset_id = response.data['id']
+                else:
+                    session.dataset_id = response.data['dataset']
+                session.completed_at = timezone.now()
+                session.save(update_fields=['dataset', 'completed_at'])
+        
+        if session.completed_at:
+            delete_spool_file(session)
+        return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def column_cache_stats(request):
+    """
+    Report the column cache counters of the process serving the request.
+    
+    Each worker process has its own cache, so repeated calls may be
+    answered by different workers (see the pid).
+    """
+    return Response({'pid': os.getpid(), **column_cache.stats()})
 
 
 from django.contrib.auth.models import User
@@ -5,6 +5,7 @@ Django settings for backend project.
 from pathlib import Path
 import os
 import dj_database_url
+from corsheaders.defaults import default_headers
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -132,6 +133,10 @@ REST_FRAMEWORK = {
 # CORS settings
 CORS_ALLOW_CREDENTIALS = True
 
+# Conditional GET: clients send If-None-Match and read ETag
+CORS_ALLOW_HEADERS = [*default_headers, 'if-none-match']
+CORS_EXPOSE_HEADERS = ['ETag', 'Last-Modified']
+
 if DEBUG:
     CORS_ALLOW_ALL_ORIGINS = True
 else:
@@ -147,6 +152,143 @@ else:
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760
 
+# Default upload handlers, extended to hash each file as it streams in so
+# re-uploads of an identical file can reuse the stored dataset
+FILE_UPLOAD_HANDLERS = [
+    'api.upload_handlers.HashingMemoryFileUploadHandler',
+    'api.upload_handlers.HashingTemporaryFileUploadHandler',
+]
+
+# CSV ingestion
+# Uploads larger than CSV_STREAMING_THRESHOLD bytes are parsed and inserted
+# CSV_CHUNK_SIZE rows at a time, so memory use depends on the chunk size
+# rather than on the file size.
+CSV_STREAMING_THRESHOLD = int(os.environ.get('CSV_STREAMING_THRESHOLD', 52428800))
+CSV_CHUNK_SIZE = int(os.environ.get('CSV_CHUNK_SIZE', 50000))
+
+# Parser for whole-file reads: 'pyarrow' or 'c' (pandas' C parser). Chunked
+# reads of very large or compressed files always use the C parser. See
+# benchmarks/parse_engines.py for the comparison behind the default.
+CSV_PARSE_ENGINE = os.environ.get('CSV_PARSE_ENGINE', 'pyarrow')
+
+# Uncompressed uploads of at least CSV_PARALLEL_THRESHOLD bytes are split at
+# line boundaries into CSV_PARTITION_SIZE-byte ranges and parsed by
+# CSV_PARSE_WORKERS processes; 1 (the default) disables the pool. Every web
+# worker receiving a large upload would start its own pool, so enable it in
+# the ingest workers instead (run_ingest_workers --parse-workers).
+CSV_PARSE_WORKERS = int(os.environ.get('CSV_PARSE_WORKERS', 1))
+CSV_PARALLEL_THRESHOLD = int(os.environ.get('CSV_PARALLEL_THRESHOLD', 20971520))
+CSV_PARTITION_SIZE = int(os.environ.get('CSV_PARTITION_SIZE', 16777216))
+
+# Rows per executemany() call when inserting equipment data on backends
+# without COPY support (SQLite). Throughput is flat above ~1000 rows per
+# batch; larger batches only cost memory.
+BULK_INSERT_BATCH_SIZE = int(os.environ.get('BULK_INSERT_BATCH_SIZE', 10000))
+
+# Columnar storage
+# Each ingested dataset is also written as an Arrow IPC file next to the
+# uploaded CSV (<file>.arrow), which analytics and reports memory-map
+# instead of querying EquipmentData. Numeric columns are stored as
+# COLUMNAR_FLOAT_DTYPE; 'float32' halves their size but rounds values to
+# about 7 significant digits.
+COLUMNAR_STORAGE = os.environ.get('COLUMNAR_STORAGE', 'True') == 'True'
+COLUMNAR_FLOAT_DTYPE = os.environ.get('COLUMNAR_FLOAT_DTYPE', 'float64')
+
+# How analytics are computed from stored rows when a dataset has no stored
+# summary: 'pandas' loads the rows into a DataFrame (from the columnar file
+# if there is one, else from EquipmentData), 'sql' aggregates in the
+# database. SQL is about twice as fast as loading EquipmentData rows into
+# pandas at every size when the rows are not already in the column cache
+# (COLUMN_CACHE_MAX_BYTES); see benchmarks/analytics_backends.py, which
+# clears that cache before each pandas run.
+ANALYTICS_BACKEND = os.environ.get('ANALYTICS_BACKEND', 'sql')
+
+# Statistics sketches built at ingest (see api/sketches.py). Histogram bin
+# widths double automatically while a column spans more than
+# SKETCH_HISTOGRAM_MAX_BINS bins.
+SKETCH_TDIGEST_COMPRESSION = int(os.environ.get('SKETCH_TDIGEST_COMPRESSION', 200))
+SKETCH_HISTOGRAM_MAX_BINS = int(os.environ.get('SKETCH_HISTOGRAM_MAX_BINS', 200))
+SKETCH_HISTOGRAM_WIDTHS = {
+    'Flowrate': 10.0,
+    'Pressure': 0.5,
+    'Temperature': 10.0,
+}
+
+# Outlier flags computed at ingest (see api/anomalies.py), once all rows are
+# written. Detection reads the Type and numeric columns back (memory-mapped
+# from the columnar file when COLUMNAR_STORAGE is on); set
+# ANOMALY_DETECTION=False to skip it.
+ANOMALY_DETECTION = os.environ.get('ANOMALY_DETECTION', 'True') == 'True'
+ANOMALY_ZSCORE_THRESHOLD = float(os.environ.get('ANOMALY_ZSCORE_THRESHOLD', 3.0))
+ANOMALY_IQR_MULTIPLIER = float(os.environ.get('ANOMALY_IQR_MULTIPLIER', 1.5))
+ANOMALY_MAD_THRESHOLD = float(os.environ.get('ANOMALY_MAD_THRESHOLD', 3.5))
+
+# Seconds that computed chart data (e.g. /api/datasets/{id}/scatter/) stays
+# in the cache. Dataset rows never change, so this only bounds cache size.
+ANALYTICS_CACHE_TIMEOUT = int(os.environ.get('ANALYTICS_CACHE_TIMEOUT', 3600))
+
+# Cache shared by all gunicorn workers for computed analytics, chart data
+# and rendered dataset responses. The default file-based cache needs no
+# outside service; CACHE_BACKEND / CACHE_LOCATION select another backend.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', str(BASE_DIR / 'cache')),
+        'TIMEOUT': ANALYTICS_CACHE_TIMEOUT,
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 2000)),
+        },
+    }
+}
+
+# Worker processes used to summarise several datasets without a stored
+# summary at once (e.g. for /api/datasets/compare/). 1 disables the pool.
+ANALYTICS_WORKERS = int(os.environ.get('ANALYTICS_WORKERS', os.cpu_count() or 1))
+
+# Memory budget (bytes, per process) of the LRU cache of dataset column
+# arrays shared by analytics, chart data and reports. 0 disables it.
+COLUMN_CACHE_MAX_BYTES = int(os.environ.get('COLUMN_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+
+# Background ingestion
+# With INGEST_ASYNC enabled, POST /api/upload/ stores the file, queues an
+# IngestJob and returns 202 Accepted. Jobs are executed by
+# `python manage.py run_ingest_workers` (see the Procfile worker entry).
+INGEST_ASYNC = os.environ.get('INGEST_ASYNC', 'False') == 'True'
+INGEST_WORKERS = int(os.environ.get('INGEST_WORKERS', 2))
+INGEST_POLL_INTERVAL = float(os.environ.get('INGEST_POLL_INTERVAL', 1.0))
+# Seconds a running job may go without a worker heartbeat before it is
+# requeued as abandoned. A thread of the running worker renews the heartbeat
+# every INGEST_HEARTBEAT_INTERVAL seconds, which must be well below the lease.
+INGEST_JOB_LEASE = float(os.environ.get('INGEST_JOB_LEASE', 600))
+INGEST_HEARTBEAT_INTERVAL = float(os.environ.get('INGEST_HEARTBEAT_INTERVAL', 30))
+
+# Resumable uploads (/api/uploads/): chunks are spooled here until finalize
+UPLOAD_SPOOL_DIR = BASE_DIR / 'upload_spool'
+UPLOAD_CHUNK_MAX_SIZE = int(os.environ.get('UPLOAD_CHUNK_MAX_SIZE', 67108864))
+# Largest file a resumable upload may declare; its spool file is allocated
+# at this size when the upload starts
+UPLOAD_MAX_SIZE = int(os.environ.get('UPLOAD_MAX_SIZE', 2147483648))
+# Seconds after which an unfinished upload is deleted with its spool file
+# (on the next upload start, or by `python manage.py expire_upload_sessions`)
+UPLOAD_SESSION_EXPIRY = int(os.environ.get('UPLOAD_SESSION_EXPIRY', 86400))
+
 # Reports directory
 REPORTS_DIR = BASE_DIR / 'reports'
 
+
+# Logging (ingest throughput and other api.* messages go to the console)
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api': {
+            'handlers': ['console'],
+            'level': os.environ.get('API_LOG_LEVEL', 'INFO'),
+        },
+    },
+}
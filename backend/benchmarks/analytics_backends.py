@@ -0,0 +1,130 @@
+"""
+Compare the pandas and SQL analytics backends on stored equipment rows.
+
+For each row count, a dataset is inserted into a throwaway test database
+created for the configured DATABASES['default'] (SQLite by default; set
+DATABASE_URL to benchmark PostgreSQL). Both backends then compute
+analytics from its EquipmentData rows:
+
+- pandas: fetch the rows (load_dataset_frame) and run calculate_analytics;
+  the column cache is cleared before each run, so every run reloads them
+- sql: calculate_analytics_sql, one aggregate() and one GROUP BY query
+
+For reference, the 'columnar' column times calculate_analytics on the same
+rows read from a memory-mapped columnar file (see api.columnar), which the
+pandas backend uses instead of EquipmentData when the file exists.
+
+Usage (from the backend directory):
+    python benchmarks/analytics_backends.py
+    DATABASE_URL=postgres://... python benchmarks/analytics_backends.py --rows 1000 100000
+"""
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from api.bulk_insert import insert_equipment_frame  # noqa: E402
+from api.column_cache import column_cache  # noqa: E402
+from api.columnar import ColumnarWriter, load_columnar_frame  # noqa: E402
+from api.analytics import calculate_analytics, calculate_analytics_sql  # noqa: E402
+from api.loading import load_dataset_frame  # noqa: E402
+from api.models import Dataset  # noqa: E402
+from api.parsing import NUMERIC_COLUMNS  # noqa: E402
+
+TYPES = ['Pump', 'Valve', 'Compressor', 'HeatExchanger', 'Reactor', 'Condenser']
+
+
+def make_frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Equipment Name': [f'Equipment-{i}' for i in range(rows)],
+        'Type': np.array(TYPES)[rng.integers(0, len(TYPES), rows)],
+        'Flowrate': np.round(rng.uniform(50, 300, rows), 1),
+        'Pressure': np.round(rng.uniform(1, 20, rows), 2),
+        'Temperature': np.round(rng.uniform(50, 500, rows), 1),
+    })
+
+
+def pandas_backend(dataset):
+    # Measure the row load, not a column cache hit from the previous run
+    column_cache.clear()
+    return calculate_analytics(load_dataset_frame(dataset, ['Type'] + NUMERIC_COLUMNS))
+
+
+def columnar_backend(path):
+    return calculate_analytics(load_columnar_frame(path, ['Type'] + NUMERIC_COLUMNS))
+
+
+def sql_backend(dataset):
+    return calculate_analytics_sql(dataset.get_equipment_records())
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def same_analytics(a, b):
+    return a.keys() == b.keys() and all(
+        a[key] == b[key] if key == 'equipment_types' else math.isclose(a[key], b[key], rel_tol=1e-12)
+        for key in a
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 1000, 10000, 100000, 1000000],
+                        help='Dataset sizes in rows')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement; the best is reported')
+    args = parser.parse_args()
+
+    test_db = connection.creation.create_test_db(verbosity=0)
+    try:
+        user = User.objects.create_user('benchmark')
+        print(f'{connection.vendor}')
+        print(f"{'rows':>10} {'pandas':>10} {'sql':>10} {'columnar':>10}")
+
+        for rows in args.rows:
+            df = make_frame(rows)
+            dataset = Dataset.objects.create(name=f'benchmark-{rows}', uploaded_by=user)
+            insert_equipment_frame(dataset.id, df)
+
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, 'benchmark.arrow')
+                with ColumnarWriter(path) as writer:
+                    writer.write(df)
+
+                pandas_seconds, pandas_result = best_time(lambda: pandas_backend(dataset), args.repeat)
+                sql_seconds, sql_result = best_time(lambda: sql_backend(dataset), args.repeat)
+                columnar_seconds, columnar_result = best_time(lambda: columnar_backend(path), args.repeat)
+
+            if not same_analytics(pandas_result, sql_result) or not same_analytics(pandas_result, columnar_result):
+                raise AssertionError(f'Backends disagree for {rows} rows')
+
+            print(f'{rows:>10} {pandas_seconds:>9.4f}s {sql_seconds:>9.4f}s {columnar_seconds:>9.4f}s')
+            dataset.delete()
+    finally:
+        connection.creation.destroy_test_db(test_db, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Compare the CSV parse engines on synthetic equipment files.
+
+Each engine parses the same in-memory file through api.parsing.read_csv and
+clean_dataframe, i.e. the work parse_csv_file does for one upload. The
+'legacy' row is the previous approach: an untyped pd.read_csv followed by
+pd.to_numeric on every numeric column.
+
+Usage (from the backend directory):
+    python benchmarks/parse_engines.py
+    python benchmarks/parse_engines.py --sizes 1 20 50 --repeat 5
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+import django  # noqa: E402
+django.setup()
+
+from api.parsing import CSV_PARSE_ENGINES, NUMERIC_COLUMNS, REQUIRED_COLUMNS, clean_dataframe, read_csv  # noqa: E402
+
+TYPES = ['Pump', 'Valve', 'Compressor', 'HeatExchanger', 'Reactor', 'Condenser']
+BYTES_PER_ROW = 40  # approximate size of a generated row
+
+
+def make_csv(megabytes, seed=0):
+    """Return CSV bytes of roughly the given size, shaped like sample_data.csv."""
+    rows = int(megabytes * 1024 * 1024 / BYTES_PER_ROW)
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'Equipment Name': [f'Equipment-{i}' for i in range(rows)],
+        'Type': np.array(TYPES)[rng.integers(0, len(TYPES), rows)],
+        'Flowrate': np.round(rng.uniform(50, 300, rows), 1),
+        'Pressure': np.round(rng.uniform(1, 20, rows), 2),
+        'Temperature': np.round(rng.uniform(50, 500, rows), 1),
+    })
+    return df.to_csv(index=False).encode()
+
+
+def parse_legacy(data):
+    df = pd.read_csv(io.BytesIO(data))
+    df = df.dropna(subset=REQUIRED_COLUMNS)
+    for col in NUMERIC_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df.dropna(subset=NUMERIC_COLUMNS)
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=float, nargs='+', default=[1, 20, 50],
+                        help='File sizes in MB (default: 1 20 50)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement; the best is reported')
+    args = parser.parse_args()
+
+    parsers = {'legacy': parse_legacy}
+    for engine in CSV_PARSE_ENGINES:
+        parsers[engine] = lambda data, engine=engine: clean_dataframe(read_csv(io.BytesIO(data), engine=engine))
+
+    print(f"{'size':>8} {'rows':>10} " + ' '.join(f'{name:>16}' for name in parsers))
+    for size in args.sizes:
+        data = make_csv(size)
+        rows = data.count(b'\n') - 1
+        results = []
+        for func in parsers.values():
+            seconds = best_time(lambda: func(data), args.repeat)
+            results.append(f'{seconds:7.3f}s {rows / seconds / 1e6:5.2f}M/s')
+        print(f'{size:>6}MB {rows:>10} ' + ' '.join(f'{result:>16}' for result in results))
+
+
+if __name__ == '__main__':
+    main()
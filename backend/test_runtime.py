@@ -15,7 +15,10 @@ django.setup()
 
 from django.contrib.auth.models import User
 from api.models import Dataset, EquipmentData
-from api.utils import parse_csv_file, calculate_analytics, save_dataset_to_db, get_dataset_analytics
+from api.parsing import parse_csv_file
+from api.analytics import calculate_analytics
+from api.ingest import save_dataset_to_db
+from api.summaries import get_dataset_analytics
 from api.pdf_generator import generate_pdf_report
 import pandas as pd
 from io import StringIO
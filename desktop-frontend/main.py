@@ -1,13 +1,16 @@
+import os
 import sys
 import base64
+import hashlib
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QComboBox, QFileDialog, QTableWidget,
     QTableWidgetItem, QMessageBox, QDialog, QLineEdit, QFormLayout,
     QTabWidget, QTextEdit, QGroupBox, QScrollArea, QInputDialog
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
@@ -17,6 +20,19 @@ import json
 
 API_BASE_URL = 'http://127.0.0.1:8000/api'
 
+# Resumable upload settings
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_PARALLEL_CHUNKS = 4
+UPLOAD_RETRIES = 3
+UPLOAD_SESSIONS_FILE = os.path.join(os.path.expanduser('~'), '.chemviz_uploads.json')
+
+# Points requested for scatter charts; the server samples larger datasets
+SCATTER_MAX_POINTS = 2000
+
+# Equipment rows fetched per page; the table loads the next page when
+# scrolled near its end
+TABLE_PAGE_SIZE = 200
+
 
 class LoginDialog(QDialog):
     """Login dialog for authentication"""
@@ -102,10 +118,18 @@ class LoginDialog(QDialog):
 
 
 class DataLoader(QThread):
-    """Thread for loading data from API"""
+    """
+    Thread for loading data from API.
+    
+    Responses are kept with their ETag and revalidated with If-None-Match,
+    so unchanged data is answered with an empty 304.
+    """
     finished = pyqtSignal(object)
     error = pyqtSignal(str)
     
+    # {url: (etag, data)}, shared by all loaders
+    cache = {}
+    
     def __init__(self, url, headers):
         super().__init__()
         self.url = url
@@ -113,15 +137,159 @@ class DataLoader(QThread):
     
     def run(self):
         try:
-            response = requests.get(self.url, headers=self.headers, timeout=10)
-            if response.status_code == 200:
-                self.finished.emit(response.json())
+            headers = dict(self.headers)
+            cached = DataLoader.cache.get(self.url)
+            if cached:
+                headers['If-None-Match'] = cached[0]
+            
+            response = requests.get(self.url, headers=headers, timeout=10)
+            if response.status_code == 304 and cached:
+                self.finished.emit(cached[1])
+            elif response.status_code == 200:
+                data = response.json()
+                if 'ETag' in response.headers:
+                    DataLoader.cache[self.url] = (response.headers['ETag'], data)
+                self.finished.emit(data)
             else:
                 self.error.emit(f'Error: {response.status_code}')
         except Exception as e:
             self.error.emit(str(e))
 
 
+class ResumableUploader(QThread):
+    """Thread that sends a CSV file through the resumable upload API"""
+    progress = pyqtSignal('qint64', 'qint64')  # bytes sent, total; may exceed 2 GiB
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+    
+    def __init__(self, file_path, name, headers):
+        super().__init__()
+        self.file_path = file_path
+        self.name = name
+        self.headers = headers
+        stat = os.stat(file_path)
+        self.size = stat.st_size
+        self.session_key = f'{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}'
+    
+    def run(self):
+        try:
+            checksum = self.file_checksum()
+            session = self.get_or_create_session(checksum)
+            missing = self.missing_chunks(session['received'])
+            
+            sent = self.size - sum(end - start for start, end in missing)
+            self.progress.emit(sent, self.size)
+            
+            # Send the missing chunks in parallel
+            with ThreadPoolExecutor(max_workers=UPLOAD_PARALLEL_CHUNKS) as pool:
+                futures = [
+                    pool.submit(self.send_chunk, session['id'], start, end)
+                    for start, end in missing
+                ]
+                for future in as_completed(futures):
+                    sent += future.result()
+                    self.progress.emit(sent, self.size)
+            
+            response = requests.post(
+                f"{API_BASE_URL}/uploads/{session['id']}/finalize/",
+                headers=self.headers,
+                json={'checksum': checksum},
+                timeout=600
+            )
+            if response.status_code in (201, 202):
+                self.save_session_id(None)
+            self.finished.emit(response)
+        except Exception as e:
+            self.error.emit(str(e))
+    
+    def file_checksum(self):
+        digest = hashlib.sha256()
+        with open(self.file_path, 'rb') as f:
+            for block in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def get_or_create_session(self, checksum):
+        # Resume an earlier, unfinished upload of the same file if the server still has it
+        session_id = self.load_sessions().get(self.session_key)
+        if session_id:
+            response = requests.get(
+                f'{API_BASE_URL}/uploads/{session_id}/',
+                headers=self.headers,
+                timeout=30
+            )
+            if response.status_code == 200 and not response.json()['completed_at']:
+                return response.json()
+        
+        response = requests.post(
+            f'{API_BASE_URL}/uploads/',
+            headers=self.headers,
+            json={
+                'name': self.name,
+                'filename': os.path.basename(self.file_path),
+                'size': self.size,
+                'checksum': checksum,
+            },
+            timeout=30
+        )
+        if response.status_code != 201:
+            raise RuntimeError(response.json().get('error', f'Upload failed: {response.text}'))
+        
+        session = response.json()
+        self.save_session_id(session['id'])
+        return session
+    
+    def missing_chunks(self, received):
+        chunks = []
+        for start in range(0, self.size, UPLOAD_CHUNK_SIZE):
+            end = min(start + UPLOAD_CHUNK_SIZE, self.size)
+            if not any(r_start <= start and end <= r_end for r_start, r_end in received):
+                chunks.append((start, end))
+        return chunks
+    
+    def send_chunk(self, session_id, start, end):
+        with open(self.file_path, 'rb') as f:
+            f.seek(start)
+            data = f.read(end - start)
+        
+        for attempt in range(UPLOAD_RETRIES):
+            try:
+                response = requests.put(
+                    f'{API_BASE_URL}/uploads/{session_id}/',
+                    headers={
+                        **self.headers,
+                        'Content-Type': 'application/octet-stream',
+                        'Content-Range': f'bytes {start}-{end - 1}/{self.size}',
+                    },
+                    data=data,
+                    timeout=60
+                )
+                if response.status_code == 200:
+                    return end - start
+                if response.status_code < 500:
+                    raise RuntimeError(response.json().get('error', 'Chunk rejected'))
+            except requests.exceptions.RequestException:
+                if attempt == UPLOAD_RETRIES - 1:
+                    raise
+        raise RuntimeError(f'Chunk {start}-{end} failed after {UPLOAD_RETRIES} attempts')
+    
+    def load_sessions(self):
+        try:
+            with open(UPLOAD_SESSIONS_FILE) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def save_session_id(self, session_id):
+        sessions = self.load_sessions()
+        if session_id:
+            sessions[self.session_key] = session_id
+        else:
+            sessions.pop(self.session_key, None)
+        with open(UPLOAD_SESSIONS_FILE, 'w') as f:
+            json.dump(sessions, f)
+
+
 class ChartWidget(QWidget):
     """Widget for displaying matplotlib charts"""
     
@@ -172,11 +340,22 @@ class ChartWidget(QWidget):
         self.figure.tight_layout()
         self.canvas.draw()
     
-    def plot_scatter(self, x_data, y_data, title, xlabel, ylabel):
+    def plot_scatter(self, x_data, y_data, title, xlabel, ylabel, fit=None):
         self.figure.clear()
         ax = self.figure.add_subplot(111)
         
         ax.scatter(x_data, y_data, alpha=0.6, c='#3f51b5', s=50)
+        
+        # Least-squares line computed by the server
+        if fit and fit['slope'] is not None and x_data:
+            x_range = [min(x_data), max(x_data)]
+            ax.plot(
+                x_range, [fit['slope'] * x + fit['intercept'] for x in x_range],
+                color='#e91e63', linewidth=2,
+                label=f"y = {fit['slope']:.3g}x + {fit['intercept']:.3g} (R² = {fit['r_squared']:.3f})"
+            )
+            ax.legend()
+        
         ax.set_title(title, fontsize=14, fontweight='bold')
         ax.set_xlabel(xlabel)
         ax.set_ylabel(ylabel)
@@ -186,6 +365,27 @@ class ChartWidget(QWidget):
         self.canvas.draw()
 
 
+    def plot_correlation_matrix(self, matrix, labels, title):
+        self.figure.clear()
+        ax = self.figure.add_subplot(111)
+        
+        values = [[value if value is not None else float('nan') for value in row] for row in matrix]
+        image = ax.imshow(values, cmap='coolwarm', vmin=-1, vmax=1)
+        ax.set_xticks(range(len(labels)))
+        ax.set_xticklabels(labels)
+        ax.set_yticks(range(len(labels)))
+        ax.set_yticklabels(labels)
+        
+        for i, row in enumerate(matrix):
+            for j, value in enumerate(row):
+                ax.text(j, i, 'n/a' if value is None else f'{value:.2f}', ha='center', va='center')
+        
+        ax.set_title(title, fontsize=14, fontweight='bold')
+        self.figure.colorbar(image, ax=ax)
+        self.figure.tight_layout()
+        self.canvas.draw()
+
+
 class MainWindow(QMainWindow):
     """Main application window"""
     
@@ -197,6 +397,10 @@ class MainWindow(QMainWindow):
         self.datasets = []
         self.current_dataset = None
         self.current_analytics = None
+        self.current_correlation = None
+        self.current_scatter = None
+        self.equipment_next = None
+        self.equipment_loading = False
         
         self.init_ui()
         self.load_datasets()
@@ -327,7 +531,8 @@ class MainWindow(QMainWindow):
         self.chart_type_combo.addItems([
             'Equipment Type Distribution',
             'Type Count Bar Chart',
-            'Pressure vs Flowrate'
+            'Pressure vs Flowrate',
+            'Correlation Matrix'
         ])
         self.chart_type_combo.currentIndexChanged.connect(self.update_chart)
         chart_controls.addWidget(self.chart_type_combo)
@@ -348,6 +553,11 @@ class MainWindow(QMainWindow):
         
         self.data_table = QTableWidget()
         self.data_table.setAlternatingRowColors(True)
+        self.data_table.setColumnCount(5)
+        self.data_table.setHorizontalHeaderLabels([
+            'Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature'
+        ])
+        self.data_table.verticalScrollBar().valueChanged.connect(self.on_table_scrolled)
         
         layout.addWidget(self.data_table)
         widget.setLayout(layout)
@@ -393,6 +603,8 @@ class MainWindow(QMainWindow):
         if index <= 0:
             self.current_dataset = None
             self.current_analytics = None
+            self.current_correlation = None
+            self.current_scatter = None
             self.report_btn.setEnabled(False)
             return
         
@@ -413,11 +625,28 @@ class MainWindow(QMainWindow):
         self.analytics_loader.finished.connect(self.on_analytics_loaded)
         self.analytics_loader.error.connect(self.on_error)
         self.analytics_loader.start()
+        
+        # Load correlation matrices and line fits
+        self.current_correlation = None
+        self.correlation_loader = DataLoader(f'{API_BASE_URL}/datasets/{dataset_id}/correlation/', self.headers)
+        self.correlation_loader.finished.connect(self.on_correlation_loaded)
+        self.correlation_loader.error.connect(self.on_error)
+        self.correlation_loader.start()
+        
+        # Load a downsampled Pressure vs Flowrate scatter (constant size)
+        self.current_scatter = None
+        self.scatter_loader = DataLoader(
+            f'{API_BASE_URL}/datasets/{dataset_id}/scatter/?x=flowrate&y=pressure&max_points={SCATTER_MAX_POINTS}',
+            self.headers
+        )
+        self.scatter_loader.finished.connect(self.on_scatter_loaded)
+        self.scatter_loader.error.connect(self.on_error)
+        self.scatter_loader.start()
     
     def on_dataset_details_loaded(self, data):
         self.current_dataset = data
         self.report_btn.setEnabled(True)
-        self.update_data_table()
+        self.reset_data_table()
         self.statusBar().showMessage('Dataset loaded')
     
     def on_analytics_loaded(self, data):
@@ -425,6 +654,14 @@ class MainWindow(QMainWindow):
         self.update_summary()
         self.update_chart()
     
+    def on_correlation_loaded(self, data):
+        self.current_correlation = data
+        self.update_chart()
+    
+    def on_scatter_loaded(self, data):
+        self.current_scatter = data
+        self.update_chart()
+    
     def update_summary(self):
         if not self.current_analytics:
             self.summary_text.setText('No analytics available')
@@ -494,42 +731,86 @@ EQUIPMENT TYPE DISTRIBUTION
                 'Count'
             )
         elif chart_type == 'Pressure vs Flowrate':
-            if self.current_dataset and 'equipment_records' in self.current_dataset:
-                records = self.current_dataset['equipment_records']
-                flowrates = [r['flowrate'] for r in records]
-                pressures = [r['pressure'] for r in records]
+            if self.current_scatter:
+                points = self.current_scatter['points']
+                flowrates = points['x']
+                pressures = points['y']
+                
+                fit = None
+                title = 'Pressure vs Flowrate Correlation'
+                if self.current_correlation:
+                    correlation = self.current_correlation
+                    fit = next(
+                        (f for f in correlation['fits'] if f['x'] == 'flowrate' and f['y'] == 'pressure'),
+                        None
+                    )
+                    parameters = correlation['parameters']
+                    pearson = correlation['pearson'][parameters.index('flowrate')][parameters.index('pressure')]
+                    if pearson is not None:
+                        title += f' (r = {pearson:.3f})'
+                if len(flowrates) < self.current_scatter['total']:
+                    title += f"\n({len(flowrates)} of {self.current_scatter['total']} points)"
+                
                 self.chart.plot_scatter(
-                    flowrates, pressures,
-                    'Pressure vs Flowrate Correlation',
-                    'Flowrate', 'Pressure'
+                    flowrates, pressures, title,
+                    'Flowrate', 'Pressure', fit=fit
+                )
+        elif chart_type == 'Correlation Matrix':
+            if self.current_correlation:
+                self.chart.plot_correlation_matrix(
+                    self.current_correlation['pearson'],
+                    [name.capitalize() for name in self.current_correlation['parameters']],
+                    'Pearson Correlation'
                 )
+            else:
+                self.chart.clear()
     
-    def update_data_table(self):
-        if not self.current_dataset or 'equipment_records' not in self.current_dataset:
-            self.data_table.setRowCount(0)
-            return
-        
-        records = self.current_dataset['equipment_records']
-        
-        self.data_table.setColumnCount(5)
-        self.data_table.setHorizontalHeaderLabels([
-            'Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature'
-        ])
+    def reset_data_table(self):
+        """Empty the table and load the first page of the current dataset's rows"""
+        self.data_table.setRowCount(0)
+        self.equipment_next = None
+        if self.current_dataset:
+            self.load_equipment_page(f"{self.current_dataset['equipment']}?page_size={TABLE_PAGE_SIZE}")
+    
+    def load_equipment_page(self, url):
+        self.equipment_loading = True
+        dataset_id = self.current_dataset['id']
+        self.equipment_loader = DataLoader(url, self.headers)
+        self.equipment_loader.finished.connect(
+            lambda page: self.on_equipment_page_loaded(dataset_id, page)
+        )
+        self.equipment_loader.error.connect(self.on_error)
+        self.equipment_loader.start()
+    
+    def on_equipment_page_loaded(self, dataset_id, page):
+        self.equipment_loading = False
+        if not self.current_dataset or self.current_dataset['id'] != dataset_id:
+            return  # the selection changed while the page was loading
         
-        self.data_table.setRowCount(len(records))
+        records = page['results']
+        start = self.data_table.rowCount()
+        self.data_table.setRowCount(start + len(records))
         
-        for i, record in enumerate(records):
+        for i, record in enumerate(records, start):
             self.data_table.setItem(i, 0, QTableWidgetItem(record['equipment_name']))
             self.data_table.setItem(i, 1, QTableWidgetItem(record['equipment_type']))
             self.data_table.setItem(i, 2, QTableWidgetItem(f"{record['flowrate']:.2f}"))
             self.data_table.setItem(i, 3, QTableWidgetItem(f"{record['pressure']:.2f}"))
             self.data_table.setItem(i, 4, QTableWidgetItem(f"{record['temperature']:.2f}"))
         
-        self.data_table.resizeColumnsToContents()
+        self.equipment_next = page['next']
+        if start == 0:
+            self.data_table.resizeColumnsToContents()
+    
+    def on_table_scrolled(self, value):
+        scroll_bar = self.data_table.verticalScrollBar()
+        if self.equipment_next and not self.equipment_loading and value >= scroll_bar.maximum() - 10:
+            self.load_equipment_page(self.equipment_next)
     
     def upload_csv(self):
         file_path, _ = QFileDialog.getOpenFileName(
-            self, 'Select CSV File', '', 'CSV Files (*.csv)'
+            self, 'Select CSV File', '',
+            'CSV Files (*.csv *.csv.gz *.csv.bz2 *.csv.xz *.csv.zst)'
         )
         
         if not file_path:
@@ -540,27 +821,47 @@ EQUIPMENT TYPE DISTRIBUTION
         if not ok or not name:
             return
         
-        try:
-            with open(file_path, 'rb') as f:
-                files = {'file': f}
-                data = {'name': name}
-                
-                response = requests.post(
-                    f'{API_BASE_URL}/upload/',
-                    headers=self.headers,
-                    files=files,
-                    data=data,
-                    timeout=30
-                )
-                
-                if response.status_code == 201:
-                    QMessageBox.information(self, 'Success', 'Dataset uploaded successfully!')
-                    self.load_datasets()
-                else:
-                    error_msg = response.json().get('error', 'Upload failed')
-                    QMessageBox.warning(self, 'Error', error_msg)
-        except Exception as e:
-            QMessageBox.critical(self, 'Error', f'Upload failed: {str(e)}')
+        self.statusBar().showMessage('Uploading...')
+        
+        self.uploader = ResumableUploader(file_path, name, self.headers)
+        self.uploader.progress.connect(self.on_upload_progress)
+        self.uploader.finished.connect(self.on_upload_finished)
+        self.uploader.error.connect(lambda msg: QMessageBox.critical(self, 'Error', f'Upload failed: {msg}'))
+        self.uploader.start()
+    
+    def on_upload_progress(self, sent, total):
+        percentage = (sent / total) * 100 if total else 100
+        self.statusBar().showMessage(f'Uploading... {percentage:.0f}%')
+    
+    def on_upload_finished(self, response):
+        if response.status_code == 201:
+            QMessageBox.information(self, 'Success', 'Dataset uploaded successfully!')
+            self.load_datasets()
+        elif response.status_code == 202:
+            # Server queued a background ingest job
+            self.poll_job(response.json()['id'])
+        else:
+            error_msg = response.json().get('error', 'Upload failed')
+            QMessageBox.warning(self, 'Error', error_msg)
+    
+    def poll_job(self, job_id):
+        self.job_loader = DataLoader(f'{API_BASE_URL}/jobs/{job_id}/', self.headers)
+        self.job_loader.finished.connect(self.on_job_status)
+        self.job_loader.error.connect(self.on_error)
+        self.job_loader.start()
+    
+    def on_job_status(self, job):
+        if job['state'] == 'succeeded':
+            QMessageBox.information(self, 'Success', 'Dataset uploaded successfully!')
+            self.load_datasets()
+        elif job['state'] == 'failed':
+            QMessageBox.warning(self, 'Error', job['error'] or 'Upload failed')
+        else:
+            self.statusBar().showMessage(
+                f"Processing upload: {job['rows_processed']} rows "
+                f"({job['rows_per_sec']:.0f} rows/sec)"
+            )
+            QTimer.singleShot(1000, lambda: self.poll_job(job['id']))
     
     def download_report(self):
         if not self.current_dataset:
@@ -1,12 +1,42 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
 import { Chart as ChartJS, ArcElement, CategoryScale, LinearScale, BarElement, PointElement, LineElement, Title, Tooltip, Legend } from 'chart.js';
 import { Pie, Bar, Scatter } from 'react-chartjs-2';
+import { getDatasetScatter } from '../services/api';
+import EquipmentTable from './EquipmentTable';
 import './Analytics.css';
 
 ChartJS.register(ArcElement, CategoryScale, LinearScale, BarElement, PointElement, LineElement, Title, Tooltip, Legend);
 
+// Points requested for the scatter chart; the server samples larger datasets
+const SCATTER_MAX_POINTS = 2000;
+
 function Analytics({ dataset, analytics, onDownloadReport }) {
     const [downloading, setDownloading] = useState(false);
+    const [scatter, setScatter] = useState(null);
+    const datasetId = dataset?.id;
+
+    useEffect(() => {
+        setScatter(null);
+        if (!datasetId) {
+            return undefined;
+        }
+
+        let cancelled = false;
+        getDatasetScatter(datasetId, 'flowrate', 'pressure', SCATTER_MAX_POINTS)
+            .then((data) => {
+                if (!cancelled) {
+                    setScatter(data);
+                }
+            })
+            .catch(() => {
+                if (!cancelled) {
+                    setScatter(null);
+                }
+            });
+        return () => {
+            cancelled = true;
+        };
+    }, [datasetId]);
 
     if (!dataset || !analytics) {
         return (
@@ -78,14 +108,15 @@ function Analytics({ dataset, analytics, onDownloadReport }) {
         ],
     };
 
-    // Scatter plot data (if we have equipment records)
+    // Scatter plot data (a server-side sample for large datasets)
+    const scatterPoints = scatter?.points;
     const scatterData = {
         datasets: [
             {
                 label: 'Pressure vs Flowrate',
-                data: dataset.equipment_records?.map(record => ({
-                    x: record.flowrate,
-                    y: record.pressure,
+                data: scatterPoints?.x.map((x, i) => ({
+                    x,
+                    y: scatterPoints.y[i],
                 })) || [],
                 backgroundColor: 'rgba(75, 192, 192, 0.6)',
                 borderColor: 'rgba(75, 192, 192, 1)',
@@ -186,9 +217,12 @@ function Analytics({ dataset, analytics, onDownloadReport }) {
                     </div>
                 </div>
 
-                {dataset.equipment_records && dataset.equipment_records.length > 0 && (
+                {scatterPoints && scatterPoints.x.length > 0 && (
                     <div className="chart-card full-width">
-                        <h3>Pressure vs Flowrate Correlation</h3>
+                        <h3>
+                            Pressure vs Flowrate Correlation
+                            {scatterPoints.x.length < scatter.total && ` (${scatterPoints.x.length} of ${scatter.total} points)`}
+                        </h3>
                         <div className="chart-wrapper">
                             <Scatter
                                 data={scatterData}
@@ -204,6 +238,8 @@ function Analytics({ dataset, analytics, onDownloadReport }) {
                         </div>
                     </div>
                 )}
+
+                <EquipmentTable dataset={dataset} />
             </div>
         </div>
     );
@@ -0,0 +1,100 @@
+import React, { useState, useEffect, useRef } from 'react';
+import { getDatasetEquipment, getPage } from '../services/api';
+import './EquipmentTable.css';
+
+// Rows fetched per page; the next page loads when the table is scrolled near its end
+const PAGE_SIZE = 100;
+
+function EquipmentTable({ dataset }) {
+    const [records, setRecords] = useState([]);
+    const [next, setNext] = useState(null);
+    const loading = useRef(false);
+    const datasetId = dataset?.id;
+    const currentId = useRef(datasetId);
+    currentId.current = datasetId;
+
+    const appendPage = (id, page) => {
+        if (id !== currentId.current) {
+            return; // the selection changed while the page was loading
+        }
+        setRecords((previous) => [...previous, ...page.results]);
+        setNext(page.next);
+    };
+
+    useEffect(() => {
+        setRecords([]);
+        setNext(null);
+        if (!datasetId) {
+            return undefined;
+        }
+
+        let cancelled = false;
+        loading.current = true;
+        getDatasetEquipment(datasetId, PAGE_SIZE)
+            .then((page) => {
+                if (!cancelled) {
+                    setRecords(page.results);
+                    setNext(page.next);
+                }
+            })
+            .catch(() => {})
+            .finally(() => {
+                loading.current = false;
+            });
+        return () => {
+            cancelled = true;
+        };
+    }, [datasetId]);
+
+    const handleScroll = (event) => {
+        const { scrollTop, scrollHeight, clientHeight } = event.currentTarget;
+        if (!next || loading.current || scrollTop + clientHeight < scrollHeight - 200) {
+            return;
+        }
+
+        const id = datasetId;
+        loading.current = true;
+        getPage(next)
+            .then((page) => appendPage(id, page))
+            .catch(() => {})
+            .finally(() => {
+                loading.current = false;
+            });
+    };
+
+    if (!dataset) {
+        return null;
+    }
+
+    return (
+        <div className="chart-card full-width">
+            <h3>Equipment Records ({records.length} of {dataset.total_equipment})</h3>
+            <div className="equipment-table-wrapper" onScroll={handleScroll}>
+                <table className="equipment-table">
+                    <thead>
+                        <tr>
+                            <th>Equipment Name</th>
+                            <th>Type</th>
+                            <th>Flowrate</th>
+                            <th>Pressure</th>
+                            <th>Temperature</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        {records.map((record) => (
+                            <tr key={record.id}>
+                                <td>{record.equipment_name}</td>
+                                <td>{record.equipment_type}</td>
+                                <td>{record.flowrate.toFixed(2)}</td>
+                                <td>{record.pressure.toFixed(2)}</td>
+                                <td>{record.temperature.toFixed(2)}</td>
+                            </tr>
+                        ))}
+                    </tbody>
+                </table>
+            </div>
+        </div>
+    );
+}
+
+export default EquipmentTable;
@@ -1,6 +1,9 @@
 import React, { useState } from 'react';
 import './Upload.css';
 
+// Plain CSV or CSV compressed with gzip, bzip2, xz or zstd
+const CSV_FILE_PATTERN = /\.csv(\.(gz|bz2|xz|zst))?$/;
+
 function Upload({ onUploadSuccess }) {
     const [name, setName] = useState('');
     const [file, setFile] = useState(null);
@@ -25,7 +28,7 @@ function Upload({ onUploadSuccess }) {
 
         if (e.dataTransfer.files && e.dataTransfer.files[0]) {
             const droppedFile = e.dataTransfer.files[0];
-            if (droppedFile.name.endsWith('.csv')) {
+            if (CSV_FILE_PATTERN.test(droppedFile.name)) {
                 setFile(droppedFile);
                 setError('');
             } else {
@@ -37,7 +40,7 @@ function Upload({ onUploadSuccess }) {
     const handleFileChange = (e) => {
         if (e.target.files && e.target.files[0]) {
             const selectedFile = e.target.files[0];
-            if (selectedFile.name.endsWith('.csv')) {
+            if (CSV_FILE_PATTERN.test(selectedFile.name)) {
                 setFile(selectedFile);
                 setError('');
             } else {
@@ -100,7 +103,7 @@ function Upload({ onUploadSuccess }) {
                     <input
                         type="file"
                         id="file-upload"
-                        accept=".csv"
+                        accept=".csv,.gz,.bz2,.xz,.zst"
                         onChange={handleFileChange}
                         style={{ display: 'none' }}
                     />
@@ -128,7 +131,7 @@ function Upload({ onUploadSuccess }) {
                             <p className="drop-text">
                                 <span className="highlight">Click to upload</span> or drag and drop
                             </p>
-                            <p className="drop-hint">CSV files only</p>
+                            <p className="drop-hint">CSV files only (.csv, .csv.gz, .csv.bz2, .csv.xz, .csv.zst)</p>
                         </label>
                     )}
                 </div>
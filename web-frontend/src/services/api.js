@@ -8,8 +8,13 @@ const api = axios.create({
   headers: {
     'Content-Type': 'application/json',
   },
+  // 304 Not Modified is answered from etagCache below
+  validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
 });
 
+// GET responses by URL with their ETag, revalidated with If-None-Match
+const etagCache = new Map();
+
 // Add auth token to requests
 api.interceptors.request.use(
   (config) => {
@@ -17,6 +22,11 @@ api.interceptors.request.use(
     if (credentials) {
       config.headers.Authorization = `Basic ${credentials}`;
     }
+
+    const cached = config.method === 'get' && etagCache.get(api.getUri(config));
+    if (cached) {
+      config.headers['If-None-Match'] = cached.etag;
+    }
     return config;
   },
   (error) => {
@@ -24,6 +34,20 @@ api.interceptors.request.use(
   }
 );
 
+api.interceptors.response.use((response) => {
+  if (response.config.method !== 'get') {
+    return response;
+  }
+
+  const url = api.getUri(response.config);
+  if (response.status === 304) {
+    response.data = etagCache.get(url).data;
+  } else if (response.headers.etag) {
+    etagCache.set(url, { etag: response.headers.etag, data: response.data });
+  }
+  return response;
+});
+
 // Auth functions
 export const login = async (username, password) => {
   const credentials = btoa(`${username}:${password}`);
@@ -50,6 +74,7 @@ export const login = async (username, password) => {
 };
 
 export const logout = () => {
+  etagCache.clear();
   localStorage.removeItem('credentials');
   localStorage.removeItem('username');
 };
@@ -78,6 +103,27 @@ export const getDatasetAnalytics = async (id) => {
   return response.data;
 };
 
+// Constant-size scatter data: a sample of at most maxPoints points
+export const getDatasetScatter = async (id, x, y, maxPoints) => {
+  const response = await api.get(`/datasets/${id}/scatter/`, {
+    params: { x, y, max_points: maxPoints },
+  });
+  return response.data;
+};
+
+// First page of a dataset's equipment records; follow `next` with getPage
+export const getDatasetEquipment = async (id, pageSize) => {
+  const response = await api.get(`/datasets/${id}/equipment/`, {
+    params: { page_size: pageSize },
+  });
+  return response.data;
+};
+
+export const getPage = async (url) => {
+  const response = await api.get(url);
+  return response.data;
+};
+
 export const uploadDataset = async (name, file) => {
   const formData = new FormData();
   formData.append('name', name);
@@ -89,9 +135,35 @@ export const uploadDataset = async (name, file) => {
     },
   });
 
+  // 202 Accepted: the server queued a background ingest job
+  if (response.status === 202) {
+    return waitForJob(response.data.id);
+  }
+
+  return response.data;
+};
+
+// Ingest job API functions
+export const getJob = async (id) => {
+  const response = await api.get(`/jobs/${id}/`);
   return response.data;
 };
 
+export const waitForJob = async (id, intervalMs = 1000) => {
+  for (;;) {
+    const job = await getJob(id);
+    if (job.state === 'succeeded') {
+      return job;
+    }
+    if (job.state === 'failed') {
+      const error = new Error(job.error || 'Ingest failed');
+      error.response = { data: { error: job.error || 'Ingest failed' } };
+      throw error;
+    }
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+};
+
 export const deleteDataset = async (id) => {
   const response = await api.delete(`/datasets/${id}/`);
   return response.data;